@@ -0,0 +1,246 @@
+"""Adaptive per-turn image budget from measured VLM request throughput.
+
+On a slow uplink the images dominate turn latency. :class:`ImageBudgeter`
+keeps the size and duration of recent VLM requests, fits
+``latency = base + bytes / throughput`` over them, and picks the largest
+image tier (width, JPEG quality, ``detail``) and frame count whose estimated
+upload fits ``target_upload_ms``. Estimates use the centre crop actually sent
+(``crop_ratio`` of the frame width, capped at the tier width). Until enough requests have been measured it
+returns the full-quality tier, i.e. the previous fixed behaviour.
+
+:func:`plan_for_intent` then tailors the plan to what was asked: OCR keeps
+full resolution on a tight crop, colour questions need only a thumbnail.
+"""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import asdict, dataclass, replace
+from typing import Any, Deque, Dict, Optional, Sequence, Tuple
+
+# (max_width, jpeg_quality, detail), best first
+DEFAULT_TIERS: Tuple[Tuple[int, int, str], ...] = (
+    (960, 85, "high"),
+    (768, 80, "high"),
+    (640, 75, "low"),
+    (512, 70, "low"),
+)
+
+# Typical JPEG size of camera crops, bytes per pixel by quality
+_BYTES_PER_PIXEL = {85: 0.24, 80: 0.2, 75: 0.16, 70: 0.14}
+_BASE64_OVERHEAD = 4.0 / 3.0
+_CROP_ASPECT = 0.75  # height / width of a centre crop of a 4:3 or 16:9 frame (upper bound)
+_SMALL_REQUEST_BYTES = 32 * 1024
+
+
+@dataclass
+class ImagePlan:
+    """Image settings chosen for one turn."""
+
+    max_width: int
+    jpeg_quality: int
+    detail: str
+    max_images: int
+    crop_ratio: Optional[float] = None
+    intent: Optional[str] = None
+    budget_bytes: Optional[int] = None
+    est_bytes: Optional[int] = None
+    throughput_bps: Optional[float] = None
+    base_latency_ms: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+def crop_width(source_width: Optional[int], crop_ratio: Optional[float]) -> Optional[int]:
+    """Width in pixels of the centre crop taken from a ``source_width`` frame."""
+    if not source_width:
+        return None
+    if crop_ratio is None or not 0 < crop_ratio < 1:
+        return int(source_width)
+    return int(source_width * crop_ratio)
+
+
+def estimate_image_bytes(max_width: int, jpeg_quality: int, source_width: Optional[int] = None) -> int:
+    """Rough base64 size of one encoded crop at ``max_width``/``jpeg_quality``.
+
+    Crops are only ever downscaled, so a crop ``source_width`` pixels wide
+    (see :func:`crop_width`) is sent at ``min(source_width, max_width)``.
+    """
+    nearest = min(_BYTES_PER_PIXEL, key=lambda q: abs(q - jpeg_quality))
+    width = min(max_width, source_width) if source_width else max_width
+    pixels = width * width * _CROP_ASPECT
+    return int(pixels * _BYTES_PER_PIXEL[nearest] * _BASE64_OVERHEAD)
+
+
+class ImageBudgeter:
+    """Track recent request sizes/latencies and plan image payloads.
+
+    Args:
+        target_upload_ms: Upload time the image payload should fit in
+        window: Number of recent requests kept
+        min_samples: Requests needed before the plan adapts
+        tiers: ``(max_width, jpeg_quality, detail)`` options, best first
+    """
+
+    def __init__(
+        self,
+        target_upload_ms: float = 1200.0,
+        window: int = 12,
+        min_samples: int = 2,
+        tiers: Sequence[Tuple[int, int, str]] = DEFAULT_TIERS,
+    ) -> None:
+        self.target_upload_ms = target_upload_ms
+        self.min_samples = min_samples
+        self.tiers = tuple(tiers)
+        self._samples: Deque[Tuple[int, float]] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, request_bytes: int, elapsed_s: float) -> None:
+        """Add a completed VLM request (serialized size and wall time)."""
+        if request_bytes <= 0 or elapsed_s <= 0:
+            return
+        with self._lock:
+            self._samples.append((int(request_bytes), float(elapsed_s)))
+
+    def estimate(self) -> Optional[Tuple[float, float]]:
+        """Return ``(throughput bytes/s, base latency s)`` or None if unmeasured."""
+        with self._lock:
+            samples = list(self._samples)
+        if len(samples) < self.min_samples:
+            return None
+
+        sizes = [size for size, _ in samples]
+        if max(sizes) >= 2 * min(sizes):
+            # Least-squares fit of latency = base + size / throughput
+            n = len(samples)
+            mean_x = sum(sizes) / n
+            mean_y = sum(elapsed for _, elapsed in samples) / n
+            var_x = sum((size - mean_x) ** 2 for size in sizes)
+            cov = sum((size - mean_x) * (elapsed - mean_y) for size, elapsed in samples)
+            slope = cov / var_x if var_x else 0.0
+            if slope > 0:
+                return 1.0 / slope, max(0.0, mean_y - slope * mean_x)
+
+        # No usable spread: treat the fastest small request as base latency and
+        # attribute the rest of each large request to upload (pessimistic).
+        small = [elapsed for size, elapsed in samples if size <= _SMALL_REQUEST_BYTES]
+        base = min(small) if small else 0.0
+        large = [(size, elapsed - base) for size, elapsed in samples if size > _SMALL_REQUEST_BYTES]
+        if not large:
+            return None
+        total_bytes = sum(size for size, _ in large)
+        total_s = sum(max(0.05, upload) for _, upload in large)
+        return total_bytes / total_s, base
+
+    def plan(self, max_images: int, source_width: Optional[int] = None) -> ImagePlan:
+        """Choose tier and frame count so the images upload within the target.
+
+        Args:
+            max_images: Most frames the turn may send
+            source_width: Width of the crop before resizing (None assumes it
+                is at least as wide as every tier)
+        """
+        best_width, best_quality, best_detail = self.tiers[0]
+        measured = self.estimate() if self.target_upload_ms > 0 else None
+        if measured is None or max_images <= 0:
+            return ImagePlan(best_width, best_quality, best_detail, max_images)
+
+        throughput, base = measured
+        budget = int(throughput * self.target_upload_ms / 1000.0)
+        # Prefer keeping two views of the scene over maximum resolution.
+        wanted = min(max_images, 2)
+        for minimum in (wanted, 1):
+            for width, quality, detail in self.tiers:
+                per_image = estimate_image_bytes(width, quality, source_width)
+                count = min(max_images, budget // per_image)
+                if count >= minimum:
+                    return ImagePlan(
+                        width, quality, detail, int(count),
+                        budget_bytes=budget,
+                        est_bytes=int(count * per_image),
+                        throughput_bps=round(throughput, 1),
+                        base_latency_ms=round(base * 1000.0, 1),
+                    )
+        width, quality, detail = self.tiers[-1]
+        return ImagePlan(
+            width, quality, detail, 1,
+            budget_bytes=budget,
+            est_bytes=estimate_image_bytes(width, quality, source_width),
+            throughput_bps=round(throughput, 1),
+            base_latency_ms=round(base * 1000.0, 1),
+        )
+
+
+@dataclass(frozen=True)
+class IntentImagePolicy:
+    """Per-intent overrides; None keeps the budgeter's choice (or configured crop)."""
+
+    crop_ratio: Optional[float] = None
+    max_width: Optional[int] = None
+    min_width: Optional[int] = None
+    min_quality: Optional[int] = None
+    detail: Optional[str] = None
+    max_images: Optional[int] = None
+
+
+# Keys match the intent classes in app.util.intent
+INTENT_POLICIES: Dict[str, IntentImagePolicy] = {
+    # Text needs pixels: keep capture resolution and high detail, fewer frames.
+    "ocr": IntentImagePolicy(crop_ratio=0.6, min_width=960, min_quality=85, detail="high", max_images=2),
+    # Counting needs the wider view.
+    "count": IntentImagePolicy(crop_ratio=0.7, max_images=2),
+    # Colour survives heavy downscaling.
+    "color": IntentImagePolicy(crop_ratio=0.3, max_width=256, detail="low", max_images=1),
+    # Scene descriptions want the whole view but little detail.
+    "describe": IntentImagePolicy(crop_ratio=0.95, max_width=640, detail="low", max_images=2),
+    "identify": IntentImagePolicy(),
+}
+
+
+def intent_crop_ratio(intent: Optional[str], crop_ratio: float) -> float:
+    """Centre crop used for ``intent``: its policy's crop, else ``crop_ratio``."""
+    policy = INTENT_POLICIES.get(intent or "", IntentImagePolicy())
+    return policy.crop_ratio if policy.crop_ratio is not None else crop_ratio
+
+
+def plan_for_intent(plan: ImagePlan, intent: Optional[str], crop_ratio: float) -> ImagePlan:
+    """Apply the :data:`INTENT_POLICIES` entry for ``intent`` to a budget plan.
+
+    Args:
+        plan: Plan from :meth:`ImageBudgeter.plan` (or the fixed default)
+        intent: Vision intent class, e.g. from ``classify_vision_intent``
+        crop_ratio: Configured centre crop, used when the policy has none
+    """
+    policy = INTENT_POLICIES.get(intent or "", IntentImagePolicy())
+    width = plan.max_width
+    if policy.max_width is not None:
+        width = min(width, policy.max_width)
+    if policy.min_width is not None:
+        width = max(width, policy.min_width)
+    quality = max(plan.jpeg_quality, policy.min_quality or 0)
+    max_images = plan.max_images if policy.max_images is None else min(plan.max_images, policy.max_images)
+    return replace(
+        plan,
+        max_width=width,
+        jpeg_quality=quality,
+        detail=policy.detail or plan.detail,
+        max_images=max_images,
+        crop_ratio=intent_crop_ratio(intent, crop_ratio),
+        intent=intent,
+    )
+
+
+_BUDGETER: Optional[ImageBudgeter] = None
+_BUDGETER_LOCK = threading.Lock()
+
+
+def get_image_budgeter(target_upload_ms: Optional[float] = None) -> ImageBudgeter:
+    """Return the process-wide budgeter (shared by VLMClient and routing)."""
+    global _BUDGETER
+    with _BUDGETER_LOCK:
+        if _BUDGETER is None:
+            _BUDGETER = ImageBudgeter() if target_upload_ms is None else ImageBudgeter(target_upload_ms)
+        elif target_upload_ms is not None:
+            _BUDGETER.target_upload_ms = target_upload_ms
+        return _BUDGETER
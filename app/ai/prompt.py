@@ -6,7 +6,7 @@ import re
 from typing import Dict, List, Optional, Sequence, Tuple
 
 from app.util.config import AppConfig
-from app.video.validation import validate_vision_message_format
+from app.video.validation import encoded_image_info, validate_vision_message_format
 
 
 DEFAULT_SYSTEM_PROMPT = (
@@ -78,7 +78,7 @@ def _build_history_messages(
     return messages
 
 
-def _build_openai_user_message(transcript: str, images_b64: Sequence[str]) -> Dict[str, object]:
+def _build_openai_user_message(transcript: str, images_b64: Sequence[str], detail: str = "high") -> Dict[str, object]:
     """Create OpenAI-formatted user message supporting optional images."""
     cleaned_images = [img for img in images_b64 if img]
     user_text = transcript if transcript else ("Describe the scene succinctly." if cleaned_images else "Hello")
@@ -94,7 +94,7 @@ def _build_openai_user_message(transcript: str, images_b64: Sequence[str]) -> Di
                 "type": "image_url",
                 "image_url": {
                     "url": f"data:{mime_type};base64,{data}",
-                    "detail": "high",
+                    "detail": detail,
                 },
             }
         )
@@ -197,6 +197,7 @@ def build_vlm_payload(
     transcript: str,
     images_b64: List[str],
     history: Optional[List[Dict[str, str]]] = None,
+    image_detail: str = "high",
 ) -> dict:
     system_prompt = build_system_prompt(config)
     transcript_clean = transcript.strip()
@@ -225,7 +226,7 @@ def build_vlm_payload(
             messages.append({"role": "system", "content": system_prompt})
 
         messages.extend(_build_history_messages(history, api_type="openai"))
-        messages.append(_build_openai_user_message(transcript_clean, images_b64))
+        messages.append(_build_openai_user_message(transcript_clean, images_b64, detail=image_detail))
 
         is_valid, error_msg = validate_vision_message_format(messages, api_type="openai")
         if not is_valid:
@@ -306,11 +307,24 @@ def build_together_messages(
 def _prepare_together_images(images_b64: List[str], max_images: int = 6, max_width: int = 960) -> List[str]:
     prepared: List[str] = []
     for raw_b64 in images_b64[:max_images]:
+        if _is_ready_jpeg(raw_b64, max_width=max_width):
+            # Already encoded for upload by the frame pipeline; send the bytes as-is.
+            prepared.append(raw_b64)
+            continue
         processed = _compress_base64_image(raw_b64, max_width=max_width, quality=80)
         prepared.append(processed)
     return prepared
 
 
+def _is_ready_jpeg(image_b64: str, *, max_width: int) -> bool:
+    """True if ``image_b64`` is a JPEG no wider than ``max_width`` (header check only)."""
+    try:
+        info = encoded_image_info(base64.b64decode(image_b64))
+    except (ValueError, TypeError):
+        return False
+    return info is not None and info[0] == "JPEG" and 0 < info[1] <= max_width
+
+
 def _compress_base64_image(image_b64: str, *, max_width: int, quality: int) -> str:
     """Decode, downscale, and JPEG-compress a base64 PNG string to save tokens."""
     try:
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import json
 import os
+import time
 from typing import Any, Dict, List, Optional
 
 import requests
 
+from app.ai.budget import get_image_budgeter
 from app.ai.prompt import build_together_messages, build_vlm_payload
 from app.util.config import AppConfig
 
@@ -44,13 +46,33 @@ class VLMClient:
         self._together_client = Together(api_key=api_key)
         self._together_model = self.config.vlm_model or "openai/gpt-oss-20b"
 
-    def infer(self, transcript: str, images_b64: List[str], history: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
+    def infer(
+        self,
+        transcript: str,
+        images_b64: List[str],
+        history: Optional[List[Dict[str, str]]] = None,
+        image_detail: str = "high",
+    ) -> Dict[str, Any]:
+        started = time.perf_counter()
         if self.provider == "together":
-            return self._infer_together(transcript, images_b64, history)
-        return self._infer_http(transcript, images_b64, history)
-
-    def _infer_http(self, transcript: str, images_b64: List[str], history: Optional[List[Dict[str, str]]]) -> Dict[str, Any]:
-        payload = build_vlm_payload(self.config, transcript, images_b64, history=history)
+            result = self._infer_together(transcript, images_b64, history)
+        else:
+            result = self._infer_http(transcript, images_b64, history, image_detail)
+        elapsed = time.perf_counter() - started
+        # Feed the image budgeter with what this request actually cost.
+        get_image_budgeter().record(result.get("request_bytes", 0), elapsed)
+        result["request_ms"] = round(elapsed * 1000.0, 1)
+        return result
+
+    def _infer_http(
+        self,
+        transcript: str,
+        images_b64: List[str],
+        history: Optional[List[Dict[str, str]]],
+        image_detail: str = "high",
+    ) -> Dict[str, Any]:
+        payload = build_vlm_payload(self.config, transcript, images_b64, history=history, image_detail=image_detail)
+        body = json.dumps(payload)
         headers = {"Content-Type": "application/json"}
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
@@ -58,10 +80,15 @@ class VLMClient:
             headers.setdefault("HTTP-Referer", "https://glasses.local")
             headers.setdefault("X-Title", "Glasses Assistant")
 
-        response = requests.post(self.endpoint, json=payload, headers=headers, timeout=60)
+        response = requests.post(self.endpoint, data=body, headers=headers, timeout=60)
         response.raise_for_status()
         data = response.json()
-        return {"payload": payload, "response": data, "text": extract_text_from_response(data)}
+        return {
+            "payload": payload,
+            "response": data,
+            "text": extract_text_from_response(data),
+            "request_bytes": len(body),
+        }
 
     def _infer_together(self, transcript: str, images_b64: List[str], history: Optional[List[Dict[str, str]]]) -> Dict[str, Any]:
         messages = build_together_messages(self.config, transcript, images_b64, history=history)
@@ -70,7 +97,7 @@ class VLMClient:
         response_dict = response.model_dump() if hasattr(response, "model_dump") else _object_to_dict(response)
         text = extract_text_from_response(response_dict)
         payload = {"model": self._together_model, "messages": messages}
-        return {"payload": payload, "response": response_dict, "text": text}
+        return {"payload": payload, "response": response_dict, "text": text, "request_bytes": len(json.dumps(messages))}
 
 
 def extract_text_from_response(data: Dict[str, Any]) -> str:
@@ -33,6 +33,7 @@ class AutomaticGainControl:
         self.current_gain = 1.0
         self.running_rms = 0.0
         self.frame_count = 0
+        self.last_applied_gain = 1.0  # Gain actually applied to the last frame
 
     def process(self, audio_frame: bytes) -> bytes:
         """Apply automatic gain control to audio frame.
@@ -61,6 +62,7 @@ class AutomaticGainControl:
 
         # Skip gain adjustment for very quiet frames (likely silence)
         if self.running_rms < 10.0:
+            self.last_applied_gain = 1.0
             return audio_frame
 
         # Calculate desired gain
@@ -81,6 +83,7 @@ class AutomaticGainControl:
             self.current_gain = self.release_rate * desired_gain + (1 - self.release_rate) * self.current_gain
 
         # Apply gain
+        self.last_applied_gain = self.current_gain
         gained_audio = audio_data * self.current_gain
 
         # Clip to prevent overflow
@@ -104,6 +107,7 @@ class AutomaticGainControl:
         self.current_gain = 1.0
         self.running_rms = 0.0
         self.frame_count = 0
+        self.last_applied_gain = 1.0
 
 
 class AdaptiveVAD:
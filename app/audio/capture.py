@@ -110,6 +110,7 @@ class SegmentCaptureResult:
     final_event: Optional[Dict[str, Any]]
     average_confidence: Optional[float] = None
     low_confidence_words: List[Dict[str, Any]] = field(default_factory=list)
+    words: List[Dict[str, Any]] = field(default_factory=list)  # word/start/end, seconds from audio start
 
 
 def run_segment(
@@ -120,6 +121,7 @@ def run_segment(
     on_chunk: Optional[Callable[[], None]] = None,
     pre_roll_buffer: Optional[Sequence[bytes]] = None,
     no_speech_timeout_ms: Optional[int] = None,
+    on_partial: Optional[Callable[[str], None]] = None,
 ) -> SegmentCaptureResult:
     """Capture a full speech segment with optional pre-roll and robust stop conditions.
 
@@ -133,6 +135,10 @@ def run_segment(
 
     These fixes address the issue where the assistant was capturing only partial speech segments,
     often cutting off early or missing the end of the user's sentence.
+
+    ``on_partial`` is called from the capture loop with the running transcript
+    after every chunk (e.g. to start the camera once vision intent shows up);
+    it must return quickly.
     """
 
     def _phrase_match(text: str, phrases: Sequence[str], threshold: float = 0.72) -> bool:
@@ -323,7 +329,10 @@ def run_segment(
         # FIX: Use adaptive VAD that auto-calibrates to environment
         speech = adaptive_vad.is_speech(pcm)
 
-        combined_lower = stt.combined_text.lower()
+        combined_text = stt.combined_text
+        if on_partial:
+            on_partial(combined_text)
+        combined_lower = combined_text.lower()
         if _phrase_match(combined_lower, bye_variants, threshold=0.58):
             stt.consume_stopword("bye")
             stt.consume_stopword("glasses")
@@ -432,4 +441,5 @@ def run_segment(
         final_event=stt.final_event,
         average_confidence=average_confidence,
         low_confidence_words=low_confidence_words,
+        words=stt.words,
     )
@@ -0,0 +1,93 @@
+"""Re-block a PCM capture stream into the frame size a consumer needs.
+
+Porcupine wants exactly ``frame_length`` (512) samples, which rarely matches
+the microphone chunk size. :class:`PorcupineWakeListener` writes each capture
+chunk into a :class:`FrameReblocker` and pulls Porcupine-sized frames from it.
+It is a single-writer, single-reader adapter for that listener; VAD and STT
+read microphone chunks directly and do not go through it.
+
+The ring is stored twice back to back (a "mirrored" buffer), so any window of
+up to ``capacity`` bytes is contiguous and frames are handed out as
+``memoryview`` slices without copying. A slice stays valid until the writer
+has appended another ``capacity - frame_bytes`` bytes; call ``bytes(frame)``
+if the reader needs to keep it longer.
+"""
+from __future__ import annotations
+
+from typing import Iterator, Optional
+
+
+class FrameReblocker:
+    """Single-writer ring yielding fixed ``frame_bytes``-sized frames.
+
+    Args:
+        capacity_bytes: Ring size in bytes; must hold at least two frames
+        frame_bytes: Size of each frame handed to the reader
+    """
+
+    def __init__(self, capacity_bytes: int, frame_bytes: int) -> None:
+        if capacity_bytes <= 0:
+            raise ValueError("capacity_bytes must be positive")
+        if frame_bytes <= 0 or frame_bytes * 2 > capacity_bytes:
+            raise ValueError(
+                f"Frame of {frame_bytes} bytes does not fit twice in a {capacity_bytes}-byte ring"
+            )
+        self.capacity = capacity_bytes
+        self.frame_bytes = frame_bytes
+        self._buffer = bytearray(capacity_bytes * 2)
+        self._view = memoryview(self._buffer)
+        self.write_pos = 0  # total bytes ever written
+        self._read_pos = 0
+        self.dropped_bytes = 0
+
+    @property
+    def pending_bytes(self) -> int:
+        """Bytes written but not yet read (capped at the ring capacity)."""
+        return min(self.write_pos - self._read_pos, self.capacity)
+
+    def write(self, data: bytes) -> None:
+        """Append captured PCM; oldest audio is overwritten once the ring is full."""
+        size = len(data)
+        if size == 0:
+            return
+        src = memoryview(data)
+        if size > self.capacity:
+            src = src[size - self.capacity :]
+            self.write_pos += size - self.capacity
+            size = self.capacity
+
+        cap = self.capacity
+        start = self.write_pos % cap
+        first = min(size, cap - start)
+        self._view[start : start + first] = src[:first]
+        self._view[cap + start : cap + start + first] = src[:first]
+        rest = size - first
+        if rest:
+            self._view[:rest] = src[first:]
+            self._view[cap : cap + rest] = src[first:]
+        self.write_pos += size
+
+    def read(self) -> Optional[memoryview]:
+        """Return the next frame, or None if a full frame is not buffered yet."""
+        lag = self.write_pos - self._read_pos
+        if lag > self.capacity:
+            # The writer lapped the reader; skip the overwritten audio.
+            self.dropped_bytes += lag - self.capacity
+            self._read_pos = self.write_pos - self.capacity
+            lag = self.capacity
+        if lag < self.frame_bytes:
+            return None
+        start = self._read_pos % self.capacity
+        self._read_pos += self.frame_bytes
+        return self._view[start : start + self.frame_bytes]
+
+    def __iter__(self) -> Iterator[memoryview]:
+        while True:
+            frame = self.read()
+            if frame is None:
+                return
+            yield frame
+
+    def reset(self) -> None:
+        """Discard buffered audio and continue from the current write position."""
+        self._read_pos = self.write_pos
@@ -0,0 +1,107 @@
+"""Fixed-size PCM frame ring in ``multiprocessing.shared_memory``.
+
+A single writer (the capture side) appends equally sized frames; any number of
+readers in other processes follow along by sequence number. Frames are
+addressed by a monotonically increasing sequence so detections can be
+reported as offsets into the ring instead of copied audio.
+
+The ring has one more slot than ``capacity``. ``write()`` fills slot
+``seq % slots`` before it publishes ``seq + 1``, so the slot being written
+never holds a frame that readers can see.
+"""
+from __future__ import annotations
+
+import struct
+from multiprocessing import shared_memory
+from typing import List, Optional
+
+# Header: uint64 write sequence (number of frames ever written).
+_HEADER = struct.Struct("<Q")
+
+
+class SharedFrameRing:
+    """Single-writer / multi-reader ring of fixed-size audio frames.
+
+    Args:
+        frame_bytes: Size of every frame in bytes
+        capacity: Number of frames retained before the oldest is overwritten
+        name: Attach to an existing ring with this name instead of creating one
+    """
+
+    def __init__(self, frame_bytes: int, capacity: int, name: Optional[str] = None) -> None:
+        if frame_bytes <= 0 or capacity <= 0:
+            raise ValueError("frame_bytes and capacity must be positive")
+        self.frame_bytes = frame_bytes
+        self.capacity = capacity
+        self._slots = capacity + 1  # one spare slot for the frame being written
+        size = _HEADER.size + frame_bytes * self._slots
+        self._owner = name is None
+        if self._owner:
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            _HEADER.pack_into(self._shm.buf, 0, 0)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            if self._shm.size < size:
+                self._shm.close()
+                raise ValueError(f"Shared ring '{name}' is smaller than {size} bytes")
+        self._data = self._shm.buf[_HEADER.size : size]
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def write_seq(self) -> int:
+        """Sequence number the next frame will be written to."""
+        return _HEADER.unpack_from(self._shm.buf, 0)[0]
+
+    def oldest_seq(self) -> int:
+        """Oldest sequence number still held in the ring (and not being overwritten)."""
+        return max(0, self.write_seq - self.capacity)
+
+    def write(self, frame: bytes) -> int:
+        """Append ``frame`` and return its sequence number."""
+        if len(frame) != self.frame_bytes:
+            raise ValueError(f"Expected {self.frame_bytes}-byte frame, got {len(frame)}")
+        seq = self.write_seq
+        offset = (seq % self._slots) * self.frame_bytes
+        self._data[offset : offset + self.frame_bytes] = frame
+        # Publish only after the payload is in place.
+        _HEADER.pack_into(self._shm.buf, 0, seq + 1)
+        return seq
+
+    def read(self, seq: int) -> Optional[bytes]:
+        """Return a copy of frame ``seq`` or None if it is not (or no longer) available."""
+        if seq < self.oldest_seq() or seq >= self.write_seq:
+            return None
+        offset = (seq % self._slots) * self.frame_bytes
+        frame = bytes(self._data[offset : offset + self.frame_bytes])
+        # The writer may have lapped us while copying; discard torn frames.
+        if seq < self.oldest_seq():
+            return None
+        return frame
+
+    def frames(self, start_seq: int, end_seq: int) -> List[bytes]:
+        """Return available frames in ``[start_seq, end_seq)`` in order."""
+        collected: List[bytes] = []
+        for seq in range(max(start_seq, self.oldest_seq()), end_seq):
+            frame = self.read(seq)
+            if frame is not None:
+                collected.append(frame)
+        return collected
+
+    def close(self) -> None:
+        """Detach from the shared segment; the creator also unlinks it."""
+        self._data.release()
+        self._shm.close()
+        if self._owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self) -> "SharedFrameRing":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -3,7 +3,7 @@ from __future__ import annotations
 import json
 import os
 import time
-from collections import Counter
+from collections import Counter, deque
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional, Sequence
 
@@ -116,6 +116,7 @@ class StreamingTranscriber:
         self._final_logged: bool = False
         self._last_result: Optional[Dict[str, Any]] = None
         self._low_confidence_words: List[Dict[str, Any]] = []
+        self._words: List[Dict[str, Any]] = []
         self._last_alternatives: List[str] = []
 
     # --------------------------------------------------------------------- lifecycle
@@ -136,6 +137,7 @@ class StreamingTranscriber:
         self._final_logged = False
         self._last_result = None
         self._low_confidence_words = []
+        self._words = []
         self._last_alternatives = []
 
     def start(self) -> None:
@@ -157,8 +159,10 @@ class StreamingTranscriber:
             previous_partial = self._partial
 
             # Analyze confidence if word-level results available
-            if "result" in result:
-                self._analyze_confidence(result["result"])
+            word_results = self._word_results(result)
+            if word_results:
+                self._analyze_confidence(word_results)
+                self._record_words(word_results)
 
             text, alternatives = self._resolve_transcription(result, previous_partial)
             avg_confidence = self.get_average_confidence()
@@ -197,8 +201,10 @@ class StreamingTranscriber:
         text, alternatives = self._resolve_transcription(result, previous_partial)
 
         # Analyze confidence if word-level results available
-        if "result" in result:
-            self._analyze_confidence(result["result"])
+        word_results = self._word_results(result)
+        if word_results:
+            self._analyze_confidence(word_results)
+            self._record_words(word_results)
 
         if text:
             self._final_chunks.append(text)
@@ -268,10 +274,10 @@ class StreamingTranscriber:
             if candidate != primary and candidate not in alternatives:
                 alternatives.append(candidate)
 
-        if not primary and "result" in result:
+        if not primary:
             words = [
                 str(word.get("word", "")).strip()
-                for word in result["result"]
+                for word in self._word_results(result)
                 if word.get("word")
             ]
             candidate = " ".join(w for w in words if w)
@@ -286,6 +292,21 @@ class StreamingTranscriber:
 
         return primary, alternatives
 
+    @staticmethod
+    def _word_results(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Word entries of a Vosk result.
+
+        With ``SetMaxAlternatives`` Vosk returns n-best output
+        (``{"alternatives": [{"text", "confidence", "result": [...]}, ...]}``)
+        instead of a top-level ``result``; use the best alternative's words then.
+        """
+        if "result" in result:
+            return result["result"]
+        alternatives = result.get("alternatives") or []
+        if alternatives:
+            return alternatives[0].get("result", [])
+        return []
+
     def _apply_noise_gate(self, frame: bytes) -> bytes:
         """Suppress samples below the configured threshold before recognition."""
         if not frame or self.noise_gate_threshold <= 0 or np is None:
@@ -372,6 +393,23 @@ class StreamingTranscriber:
         if self._low_confidence_words:
             self._low_confidence_words.sort(key=lambda item: item.get("confidence", 1.0))
 
+    def _record_words(self, word_results: List[Dict[str, Any]]) -> None:
+        """Keep word timings (seconds from the start of the fed audio)."""
+        for word_data in word_results:
+            word = str(word_data.get("word", "")).strip()
+            if not word or word_data.get("start") is None:
+                continue
+            self._words.append({
+                "word": word,
+                "start": float(word_data["start"]),
+                "end": float(word_data.get("end", word_data["start"])),
+            })
+
+    @property
+    def words(self) -> List[Dict[str, Any]]:
+        """All recognized words with ``start``/``end`` times, in spoken order."""
+        return list(self._words)
+
     def get_average_confidence(self) -> Optional[float]:
         """Calculate average confidence from last result.
 
@@ -388,10 +426,10 @@ class StreamingTranscriber:
             >>> print(f"Confidence: {avg_conf:.2%}")
             Confidence: 87.5%
         """
-        if not self._last_result or "result" not in self._last_result:
+        if not self._last_result:
             return None
 
-        confidences = [w.get("conf", 0.0) for w in self._last_result["result"] if "conf" in w]
+        confidences = [w.get("conf", 0.0) for w in self._word_results(self._last_result) if "conf" in w]
         if not confidences:
             return None
         return sum(confidences) / len(confidences)
@@ -480,3 +518,92 @@ class StreamingTranscriber:
     def last_alternatives(self) -> List[str]:
         """Return alternative hypotheses from the most recent final result."""
         return list(self._last_alternatives)
+
+
+class WakeGrammarRecognizer:
+    """Lightweight Vosk recognizer dedicated to wake-word spotting.
+
+    The recognizer is built once with a fixed grammar (the wake variants plus
+    ``[unk]``) and never reconfigured: word timings and alternatives are left
+    disabled so Kaldi only decodes against the tiny wake vocabulary. It exposes
+    the subset of the :class:`StreamingTranscriber` interface used by the wake
+    listener (``reset``/``start``/``feed``/``combined_text``).
+
+    Args:
+        model: Pre-loaded Vosk Model shared with the segment transcriber
+        sample_rate: Audio sample rate in Hz
+        phrases: Wake phrases allowed by the grammar (``[unk]`` is appended)
+        history_chunks: Number of finalized chunks kept for matching
+    """
+
+    UNKNOWN_TOKEN = "[unk]"
+
+    def __init__(
+        self,
+        model: Model,
+        sample_rate: int,
+        phrases: Sequence[str],
+        history_chunks: int = 3,
+    ) -> None:
+        try:  # Reduce verbose Kaldi logging
+            SetLogLevel(-1)
+        except Exception:  # pragma: no cover - defensive
+            pass
+
+        grammar: List[str] = []
+        for phrase in phrases:
+            normalized = " ".join(str(phrase).replace("-", " ").split()).lower()
+            if normalized and normalized not in grammar:
+                grammar.append(normalized)
+        if not grammar:
+            raise ValueError("Wake grammar requires at least one phrase")
+        grammar.append(self.UNKNOWN_TOKEN)
+
+        self.model = model
+        self.sample_rate = sample_rate
+        self.grammar: tuple[str, ...] = tuple(grammar)
+        self.recognizer = KaldiRecognizer(self.model, sample_rate, json.dumps(list(self.grammar)))
+
+        self._final_chunks: deque[str] = deque(maxlen=max(1, history_chunks))
+        self._partial: str = ""
+
+    # --------------------------------------------------------------------- lifecycle
+    def reset(self) -> None:
+        """Clear decoder state without rebuilding the grammar graph."""
+        self.recognizer.Reset()
+        self._final_chunks.clear()
+        self._partial = ""
+
+    def start(self) -> None:
+        self.reset()
+
+    def feed(self, frame: bytes, is_speech: Optional[bool] = None) -> TranscriptionResult:
+        return self.accept_audio(frame)
+
+    def accept_audio(self, frame: bytes) -> TranscriptionResult:
+        if self.recognizer.AcceptWaveform(frame):
+            text = self._strip_unknown(json.loads(self.recognizer.Result()).get("text", ""))
+            if text:
+                self._final_chunks.append(text)
+            self._partial = ""
+            return TranscriptionResult(text=self.transcript, is_final=True)
+
+        self._partial = self._strip_unknown(json.loads(self.recognizer.PartialResult()).get("partial", ""))
+        return TranscriptionResult(text=self._partial, is_final=False)
+
+    # ------------------------------------------------------------------- properties
+    @property
+    def transcript(self) -> str:
+        return " ".join(self._final_chunks)
+
+    @property
+    def partial(self) -> str:
+        return self._partial
+
+    @property
+    def combined_text(self) -> str:
+        return f"{self.transcript} {self._partial}".strip()
+
+    @classmethod
+    def _strip_unknown(cls, text: str) -> str:
+        return " ".join(token for token in text.split() if token != cls.UNKNOWN_TOKEN)
@@ -4,17 +4,20 @@ import collections
 import threading
 import time
 from difflib import SequenceMatcher
-from typing import Callable, Deque, List, Optional, Sequence, Union
+from typing import TYPE_CHECKING, Callable, Deque, List, Optional, Sequence, Union
 
 import webrtcvad
 
 from app.util.log import get_event_logger
 
 from .mic import MicrophoneStream
-from .stt import StreamingTranscriber
+from .stt import WakeGrammarRecognizer
 from .agc import AutomaticGainControl, AdaptiveVAD
 from .fuzzy_match import FuzzyWakeWordMatcher
 
+if TYPE_CHECKING:  # pragma: no cover
+    from .wake_verify import WakeVerifier
+
 
 class WakeWordListener(threading.Thread):
     """Continuously listen for wake variants with VAD-gated detection and pre-roll buffering.
@@ -39,7 +42,7 @@ class WakeWordListener(threading.Thread):
         self,
         wake_variants: List[str],
         on_detect: Union[Callable[[Sequence[bytes]], None], Callable[[], None]],
-        transcriber: StreamingTranscriber,
+        transcriber: WakeGrammarRecognizer,
         sample_rate: int = 16000,
         chunk_samples: int = 320,
         debounce_ms: int = 700,
@@ -48,6 +51,8 @@ class WakeWordListener(threading.Thread):
         sensitivity: float = 0.65,
         vad_level: int = 1,
         match_window_ms: int = 1200,
+        verifier: Optional["WakeVerifier"] = None,
+        fuzzy_threshold: int = 75,
     ) -> None:
         super().__init__(daemon=True)
         self._wake_variants_raw = [variant for variant in wake_variants if variant]
@@ -55,7 +60,6 @@ class WakeWordListener(threading.Thread):
         self._variant_tokens = [variant.split() for variant in self._wake_variants]
         self._max_variant_tokens = max((len(tokens) for tokens in self._variant_tokens), default=1)
         self._on_detect = on_detect
-        self._transcriber = transcriber
         self._sample_rate = sample_rate
         self._chunk_samples = chunk_samples
         self._debounce_ms = debounce_ms
@@ -65,8 +69,13 @@ class WakeWordListener(threading.Thread):
         self._last_trigger_time: float = 0.0
         self._last_speech_time: float = 0.0
 
+        self._verifier = verifier
+
+        # The rolling buffer doubles as the verification window; capture trims it
+        # back to its own pre-roll length.
         frame_ms = max(1, int((chunk_samples / sample_rate) * 1000))
-        buffer_size = max(1, int(pre_roll_ms / frame_ms))
+        buffer_ms = max(pre_roll_ms, verifier.window_ms) if verifier is not None else pre_roll_ms
+        buffer_size = max(1, int(buffer_ms / frame_ms))
         self._rolling_buffer: collections.deque[bytes] = collections.deque(maxlen=buffer_size)
 
         self._sensitivity = max(0.0, min(1.0, sensitivity))
@@ -101,15 +110,13 @@ class WakeWordListener(threading.Thread):
         # Uses rapidfuzz with multiple strategies to handle STT misrecognitions
         self._fuzzy_matcher = FuzzyWakeWordMatcher(
             wake_words=self._wake_variants_raw,
-            threshold=75  # 75% similarity required for match
+            threshold=fuzzy_threshold  # 75% similarity required for match by default
         )
 
-        # FIX Problem 7: Restrict Vosk vocabulary to wake word variants for faster detection
-        try:
-            self._wake_grammar = [phrase for phrase in self._wake_variants if phrase] + ["[unk]"]
-            self._transcriber.set_grammar(self._wake_grammar)
-        except AttributeError:
-            self._wake_grammar = None
+        # Wake spotting runs on a dedicated grammar recognizer (wake variants + [unk])
+        # built once by the caller and never reconfigured, so the segment transcriber
+        # keeps its full vocabulary and the wake->capture handoff rebuilds no grammar.
+        self._transcriber = transcriber
 
     def stop(self) -> None:
         self._stop_event.set()
@@ -118,10 +125,6 @@ class WakeWordListener(threading.Thread):
                 self._active_mic.stop()
             except Exception:
                 pass
-        try:
-            self._transcriber.set_grammar(None)
-        except AttributeError:
-            pass
 
     def run(self) -> None:
         """Run wake word detection loop with VAD and buffered pre-roll.
@@ -139,20 +142,7 @@ class WakeWordListener(threading.Thread):
                     input_device_name=self._mic_device_name,
                 ) as mic:
                     self._active_mic = mic
-                    # FIX: Completely reset transcriber to clear any old text from previous sessions
-                    # Without this, the wake listener shows leftover transcripts like "what am i holding"
-                    self._transcriber.reset()
-                    self._transcriber.start()
-                    try:
-                        if getattr(self, "_wake_grammar", None):
-                            self._transcriber.set_grammar(self._wake_grammar)
-                    except AttributeError:
-                        pass
-                    self._rolling_buffer.clear()
-                    self._match_hits.clear()
-                    self._last_speech_time = 0.0
-                    self._last_status_time = time.monotonic()
-                    self._last_logged_text = ""
+                    self.reset_stream_state()
 
                     # FIX: Process audio frames continuously, building partial transcripts
                     while not self._stop_event.is_set():
@@ -160,81 +150,12 @@ class WakeWordListener(threading.Thread):
                         if not raw_frame:
                             continue
 
-                        # FIX: Apply AGC to auto-boost quiet microphones
-                        gained_frame = self._agc.process(raw_frame)
-
-                        # FIX: Maintain pre-roll buffer for seamless handoff to capture
-                        # Store the gained frame (not raw) so capture gets boosted audio
-                        self._rolling_buffer.append(gained_frame)
-
-                        now = time.monotonic()
-
-                        # FIX: DIAGNOSTIC - Print AGC stats every 10 seconds
-                        if (now - self._last_agc_log_time) >= 10.0:
-                            agc_stats = self._agc.get_stats()
-                            vad_level = self._adaptive_vad.get_vad_level()
-                            print(
-                                f"[AGC] Gain: {agc_stats['current_gain']:.2f}x "
-                                f"({agc_stats['current_gain_db']:+.1f}dB) | "
-                                f"RMS: {agc_stats['running_rms']:.0f} → {agc_stats['target_rms']:.0f} | "
-                                f"VAD Level: {vad_level}"
-                            )
-                            self._last_agc_log_time = now
-
-                        # FIX: DIAGNOSTIC - Print status every 3 seconds, but only log meaningful text
-                        # Filter out background noise artifacts (single repeated words like "the")
-                        if (now - self._last_status_time) >= 3.0:
-                            partial_text = self._transcriber.combined_text.strip()
-                            # Only log if text is substantial (more than 3 chars and not just repeated junk)
-                            if partial_text and len(partial_text) > 3 and partial_text != self._last_logged_text:
-                                words = partial_text.split()
-                                # Filter out if it's just repeated "the" or other noise artifacts
-                                if len(words) > 1 or (len(words) == 1 and len(words[0]) > 4):
-                                    print(f"[WAKE] Heard: '{partial_text[:50]}'")
-                                    self._last_logged_text = partial_text
-                            else:
-                                # Only log status if not spamming
-                                if (now - self._last_status_time) >= 10.0:
-                                    print("[WAKE] Listening...")
-                            self._last_status_time = now
-
-                        # FIX: Use adaptive VAD that auto-calibrates to environment
-                        speech_detected = self._adaptive_vad.is_speech(gained_frame)
-
-                        # FIX: ADDITIONAL RMS CHECK - Even if VAD detects "speech", check if it's loud enough
-                        # This prevents Vosk from hallucinating "the" on AGC-boosted silence
-                        # Only feed to STT if RMS is above threshold (real speech after AGC should be loud)
-                        if speech_detected:
-                            import numpy as np
-                            audio_data = np.frombuffer(gained_frame, dtype=np.int16).astype(np.float32)
-                            frame_rms = np.sqrt(np.mean(audio_data**2))
-
-                            # Minimum RMS threshold for real speech after AGC (30% of target)
-                            # Speech should reach ~6000 RMS, so require at least 1800 RMS to feed STT
-                            min_speech_rms = 1800
-
-                            if frame_rms >= min_speech_rms:
-                                self._last_speech_time = now
-                                # FIX: Only feed STT when VAD confirms speech AND RMS is high enough
-                                # This double-check prevents Vosk from hallucinating on boosted silence
-                                self._transcriber.feed(gained_frame)
-
-                                # FIX: Check wake word using partial transcription results
-                                if self._check_wake_word(now):
-                                    if self._should_trigger(now):
-                                        # FIX: DIAGNOSTIC - Log wake word detection with timing
-                                        from app.util.log import logger as audio_logger
-                                        audio_logger.info(
-                                            f"✓ Wake word detected! Transcript: '{self._transcriber.combined_text}' "
-                                            f"Pre-roll buffer: {len(self._rolling_buffer)} frames"
-                                        )
-                                        logger.log_wake_detected()
-                                        # FIX: Pass pre-roll buffer to prevent missing first syllables
-                                        buffer_copy = list(self._rolling_buffer)
-                                        self._emit_detect(buffer_copy)
-                                        return
-                        elif self._last_speech_time and (now - self._last_speech_time) * 1000 > self._speech_reset_ms:
-                            self._match_hits.clear()
+                        buffer_copy = self.detect_frame(raw_frame)
+                        if buffer_copy is not None:
+                            logger.log_wake_detected()
+                            # FIX: Pass pre-roll buffer to prevent missing first syllables
+                            self._emit_detect(buffer_copy)
+                            return
                 self._active_mic = None
         except Exception as exc:  # pragma: no cover
             print(f"[WakeWordListener] error: {exc}")
@@ -242,6 +163,126 @@ class WakeWordListener(threading.Thread):
 
             traceback.print_exc()
 
+    def reset_stream_state(self) -> None:
+        """Clear recognizer, pre-roll and match state before a new audio stream."""
+        # FIX: Completely reset transcriber to clear any old text from previous sessions
+        # Without this, the wake listener shows leftover transcripts like "what am i holding"
+        self._transcriber.reset()
+        self._rolling_buffer.clear()
+        self._match_hits.clear()
+        self._last_speech_time = 0.0
+        self._last_status_time = time.monotonic()
+        self._last_logged_text = ""
+
+    def process_frame(self, raw_frame: bytes, now: Optional[float] = None) -> bool:
+        """Run one raw PCM frame through AGC, VAD and the recognizer.
+
+        Returns True when the frame completes a (debounced) wake detection. The
+        gained frame is always appended to the rolling pre-roll buffer.
+        """
+        # FIX: Apply AGC to auto-boost quiet microphones
+        gained_frame = self._agc.process(raw_frame)
+
+        # FIX: Maintain pre-roll buffer for seamless handoff to capture
+        # Store the gained frame (not raw) so capture gets boosted audio
+        self._rolling_buffer.append(gained_frame)
+
+        if now is None:
+            now = time.monotonic()
+
+        # FIX: DIAGNOSTIC - Print AGC stats every 10 seconds
+        if (now - self._last_agc_log_time) >= 10.0:
+            agc_stats = self._agc.get_stats()
+            vad_level = self._adaptive_vad.get_vad_level()
+            print(
+                f"[AGC] Gain: {agc_stats['current_gain']:.2f}x "
+                f"({agc_stats['current_gain_db']:+.1f}dB) | "
+                f"RMS: {agc_stats['running_rms']:.0f} → {agc_stats['target_rms']:.0f} | "
+                f"VAD Level: {vad_level}"
+            )
+            self._last_agc_log_time = now
+
+        # FIX: DIAGNOSTIC - Print status every 3 seconds, but only log meaningful text
+        # Filter out background noise artifacts (single repeated words like "the")
+        if (now - self._last_status_time) >= 3.0:
+            partial_text = self._transcriber.combined_text.strip()
+            # Only log if text is substantial (more than 3 chars and not just repeated junk)
+            if partial_text and len(partial_text) > 3 and partial_text != self._last_logged_text:
+                words = partial_text.split()
+                # Filter out if it's just repeated "the" or other noise artifacts
+                if len(words) > 1 or (len(words) == 1 and len(words[0]) > 4):
+                    print(f"[WAKE] Heard: '{partial_text[:50]}'")
+                    self._last_logged_text = partial_text
+            else:
+                # Only log status if not spamming
+                if (now - self._last_status_time) >= 10.0:
+                    print("[WAKE] Listening...")
+            self._last_status_time = now
+
+        # FIX: Use adaptive VAD that auto-calibrates to environment
+        speech_detected = self._adaptive_vad.is_speech(gained_frame)
+
+        # FIX: ADDITIONAL RMS CHECK - Even if VAD detects "speech", check if it's loud enough
+        # This prevents Vosk from hallucinating "the" on AGC-boosted silence
+        # Only feed to STT if RMS is above threshold (real speech after AGC should be loud)
+        if speech_detected:
+            import numpy as np
+            audio_data = np.frombuffer(gained_frame, dtype=np.int16).astype(np.float32)
+            frame_rms = np.sqrt(np.mean(audio_data**2))
+
+            # Minimum RMS threshold for real speech after AGC (30% of target)
+            # Speech should reach ~6000 RMS, so require at least 1800 RMS to feed STT
+            min_speech_rms = 1800
+
+            if frame_rms >= min_speech_rms:
+                self._last_speech_time = now
+                # FIX: Only feed STT when VAD confirms speech AND RMS is high enough
+                # This double-check prevents Vosk from hallucinating on boosted silence
+                self._transcriber.feed(gained_frame)
+
+                # FIX: Check wake word using partial transcription results
+                if self._check_wake_word(now) and self._should_trigger(now):
+                    # FIX: DIAGNOSTIC - Log wake word detection with timing
+                    from app.util.log import logger as audio_logger
+                    audio_logger.info(
+                        f"✓ Wake word detected! Transcript: '{self._transcriber.combined_text}' "
+                        f"Pre-roll buffer: {len(self._rolling_buffer)} frames"
+                    )
+                    return True
+        elif self._last_speech_time and (now - self._last_speech_time) * 1000 > self._speech_reset_ms:
+            self._match_hits.clear()
+        return False
+
+    def detect_frame(self, raw_frame: bytes, now: Optional[float] = None) -> Optional[List[bytes]]:
+        """Process one frame and return the pre-roll buffer on a confirmed wake.
+
+        Stage one is :meth:`process_frame`; when a verifier is configured the
+        buffered audio must also pass it (stage two), otherwise the recognizer
+        state is reset and listening continues.
+        """
+        if not self.process_frame(raw_frame, now):
+            return None
+        buffer_copy = list(self._rolling_buffer)
+        if self._verifier is not None and not self._verifier.verify(buffer_copy):
+            self.reset_stream_state()
+            return None
+        return buffer_copy
+
+    @property
+    def pre_roll_frames(self) -> int:
+        """Number of frames currently held in the rolling pre-roll buffer."""
+        return len(self._rolling_buffer)
+
+    @property
+    def agc_gain(self) -> float:
+        """Current AGC gain applied to frames in the pre-roll buffer."""
+        return float(self._agc.current_gain)
+
+    @property
+    def frame_gain(self) -> float:
+        """AGC gain applied to the most recently processed frame."""
+        return float(self._agc.last_applied_gain)
+
     def _check_wake_word(self, now: float) -> bool:
         """Check for wake word using both token matching and fuzzy matching.
 
@@ -352,10 +393,6 @@ class WakeWordListener(threading.Thread):
         return False
 
     def _emit_detect(self, buffer_copy: Sequence[bytes]) -> None:
-        try:
-            self._transcriber.set_grammar(None)
-        except AttributeError:
-            pass
         try:
             self._on_detect(buffer_copy)  # type: ignore
         except TypeError:
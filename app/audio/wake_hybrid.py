@@ -5,12 +5,15 @@ Tries Porcupine (acoustic model) first, falls back to Vosk (STT-based) if unavai
 from __future__ import annotations
 
 import os
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Callable, Optional
 
-from app.audio.stt import StreamingTranscriber
+from app.audio.stt import WakeGrammarRecognizer
 from app.audio.wake import WakeWordListener
 from app.util.log import logger
 
+if TYPE_CHECKING:  # pragma: no cover
+    from app.audio.wake_verify import WakeVerifier
+
 try:
     from app.audio.wake_porcupine import PORCUPINE_AVAILABLE, PorcupineWakeListener
 except ImportError:
@@ -35,7 +38,7 @@ class HybridWakeWordManager:
         wake_word: str,
         wake_variants: list[str],
         on_detect: Callable[[list[bytes]], None],
-        transcriber: StreamingTranscriber,
+        transcriber: WakeGrammarRecognizer,
         sample_rate: int = 16000,
         chunk_samples: int = 320,
         debounce_ms: int = 700,
@@ -43,6 +46,11 @@ class HybridWakeWordManager:
         pre_roll_ms: int = 300,
         wake_vad_level: int = 1,
         wake_match_window_ms: int = 1200,
+        wake_sensitivity: float = 0.65,
+        wake_fuzzy_threshold: int = 75,
+        wake_process: bool = False,
+        vosk_model_path: Optional[str] = None,
+        verifier: Optional["WakeVerifier"] = None,
         # Porcupine-specific settings
         porcupine_access_key: Optional[str] = None,
         porcupine_keyword_path: Optional[str] = None,
@@ -56,12 +64,17 @@ class HybridWakeWordManager:
             wake_word: Primary wake word phrase (e.g. "hey glasses")
             wake_variants: Variant phrases for Vosk fallback
             on_detect: Callback when wake word detected
-            transcriber: Vosk transcriber for STT-based detection
+            transcriber: Vosk wake grammar recognizer for STT-based detection
             sample_rate: Audio sample rate (16000 Hz)
             chunk_samples: Samples per chunk
             debounce_ms: Minimum time between triggers
             mic_device_name: Specific microphone device
             pre_roll_ms: Pre-roll buffer duration
+            wake_sensitivity: Vosk sensitivity (maps to required match hits)
+            wake_fuzzy_threshold: Fuzzy score (0-100) accepted by the Vosk listener
+            wake_process: Run Vosk detection in a separate worker process
+            vosk_model_path: Model directory loaded by the wake worker process
+            verifier: Second-stage check applied to every first-stage trigger
             porcupine_access_key: Picovoice API key (from env or config)
             porcupine_keyword_path: Path to custom .ppn keyword file
             porcupine_sensitivity: Detection sensitivity 0.0-1.0
@@ -78,6 +91,11 @@ class HybridWakeWordManager:
         self.pre_roll_ms = pre_roll_ms
         self.wake_vad_level = int(max(0, min(3, wake_vad_level)))
         self.wake_match_window_ms = max(400, wake_match_window_ms)
+        self.wake_sensitivity = wake_sensitivity
+        self.wake_fuzzy_threshold = wake_fuzzy_threshold
+        self.wake_process = wake_process
+        self.vosk_model_path = vosk_model_path or os.getenv("VOSK_MODEL_PATH")
+        self.verifier = verifier
 
         self.porcupine_access_key = porcupine_access_key or os.getenv("PORCUPINE_ACCESS_KEY")
         self.porcupine_keyword_path = porcupine_keyword_path
@@ -113,6 +131,16 @@ class HybridWakeWordManager:
                 logger.info("→ Porcupine not available, using Vosk STT-based detection")
 
         # Fallback to Vosk STT
+        if self.wake_process:
+            try:
+                listener = self._create_process_listener()
+                self._detection_method = "vosk-process"
+                logger.info(f"✅ Using Vosk STT wake word detection in worker process (variants={len(self.wake_variants)})")
+                return listener
+            except Exception as e:
+                logger.warning(f"⚠️  Wake worker process unavailable: {e}")
+                logger.info("→ Falling back to in-process Vosk detection...")
+
         listener = self._create_vosk_listener()
         self._detection_method = "vosk"
         logger.info(f"✅ Using Vosk STT wake word detection (variants={len(self.wake_variants)})")
@@ -139,9 +167,8 @@ class HybridWakeWordManager:
 
     def _create_porcupine_listener(self):
         """Create Porcupine-based wake word listener."""
-        # Porcupine requires chunk_samples = frame_length = 512
-        porcupine_frame_length = 512
-
+        # The listener reads capture-sized frames and re-blocks them to
+        # Porcupine's 512-sample frame_length, so pre-roll matches capture.
         if self.porcupine_keyword_path:
             # Custom keyword model
             logger.info(f"Using custom Porcupine keyword: {self.porcupine_keyword_path}")
@@ -151,10 +178,11 @@ class HybridWakeWordManager:
                 on_detect=self.on_detect,
                 sensitivity=self.porcupine_sensitivity,
                 sample_rate=self.sample_rate,
-                chunk_samples=porcupine_frame_length,
+                chunk_samples=self.chunk_samples,
                 debounce_ms=self.debounce_ms,
                 mic_device_name=self.mic_device_name,
                 pre_roll_ms=self.pre_roll_ms,
+                verifier=self.verifier,
             )
         else:
             # Try to map wake word to built-in keywords
@@ -167,10 +195,11 @@ class HybridWakeWordManager:
                     on_detect=self.on_detect,
                     sensitivity=self.porcupine_sensitivity,
                     sample_rate=self.sample_rate,
-                    chunk_samples=porcupine_frame_length,
+                    chunk_samples=self.chunk_samples,
                     debounce_ms=self.debounce_ms,
                     mic_device_name=self.mic_device_name,
                     pre_roll_ms=self.pre_roll_ms,
+                    verifier=self.verifier,
                 )
             else:
                 raise ValueError(
@@ -191,8 +220,38 @@ class HybridWakeWordManager:
             debounce_ms=self.debounce_ms,
             mic_device_name=self.mic_device_name,
             pre_roll_ms=self.pre_roll_ms,
+            sensitivity=self.wake_sensitivity,
             vad_level=self.wake_vad_level,
             match_window_ms=self.wake_match_window_ms,
+            verifier=self.verifier,
+            fuzzy_threshold=self.wake_fuzzy_threshold,
+        )
+
+    def _create_process_listener(self):
+        """Create a Vosk listener whose detection runs in a separate process."""
+        from app.audio.wake_process import ProcessWakeWordListener, get_wake_process_host
+
+        host = get_wake_process_host(
+            model_path=self.vosk_model_path,
+            wake_variants=self.wake_variants,
+            sample_rate=self.sample_rate,
+            chunk_samples=self.chunk_samples,
+            # The worker's rolling buffer must also cover the verification window.
+            pre_roll_ms=max(self.pre_roll_ms, self.verifier.window_ms) if self.verifier else self.pre_roll_ms,
+            sensitivity=self.wake_sensitivity,
+            vad_level=self.wake_vad_level,
+            match_window_ms=self.wake_match_window_ms,
+            fuzzy_threshold=self.wake_fuzzy_threshold,
+            debounce_ms=self.debounce_ms,
+        )
+        # Spawns the worker (and loads its model) once; later calls are no-ops.
+        host.start()
+        return ProcessWakeWordListener(
+            host=host,
+            on_detect=self.on_detect,
+            mic_device_name=self.mic_device_name,
+            verifier=self.verifier,
+            fallback=self._create_vosk_listener,
         )
 
     def _map_to_builtin_keyword(self) -> Optional[str]:
@@ -227,7 +286,7 @@ class HybridWakeWordManager:
 
     @property
     def detection_method(self) -> Optional[str]:
-        """Get active detection method: 'porcupine' or 'vosk'."""
+        """Get active detection method: 'porcupine', 'vosk' or 'vosk-process'."""
         return self._detection_method
 
     def get_info(self) -> dict:
@@ -235,27 +294,30 @@ class HybridWakeWordManager:
         return {
             "method": self._detection_method,
             "wake_word": self.wake_word,
-            "variants": self.wake_variants if self._detection_method == "vosk" else [],
+            "variants": self.wake_variants if self._detection_method in {"vosk", "vosk-process"} else [],
             "sensitivity": self.porcupine_sensitivity if self._detection_method == "porcupine" else None,
-            "wake_vad_level": self.wake_vad_level if self._detection_method == "vosk" else None,
-            "match_window_ms": self.wake_match_window_ms if self._detection_method == "vosk" else None,
+            "wake_vad_level": self.wake_vad_level if self._detection_method in {"vosk", "vosk-process"} else None,
+            "match_window_ms": self.wake_match_window_ms if self._detection_method in {"vosk", "vosk-process"} else None,
             "porcupine_available": PORCUPINE_AVAILABLE,
             "porcupine_configured": self._can_use_porcupine(),
+            "verification": self.verifier.stats.as_dict() if self.verifier else None,
         }
 
 
 def create_wake_listener(
     config,
-    transcriber: StreamingTranscriber,
+    transcriber: WakeGrammarRecognizer,
     on_detect: Callable[[list[bytes]], None],
+    verifier: Optional["WakeVerifier"] = None,
 ) -> WakeWordListener:
     """
     Convenience function to create the best wake word listener for the config.
 
     Args:
         config: AppConfig with wake word settings
-        transcriber: Vosk transcriber instance
+        transcriber: Vosk wake grammar recognizer instance
         on_detect: Wake detection callback
+        verifier: Optional second-stage verifier (see create_wake_verifier)
 
     Returns:
         Wake word listener instance (Porcupine or Vosk)
@@ -272,6 +334,11 @@ def create_wake_listener(
         pre_roll_ms=config.pre_roll_ms,
         wake_vad_level=getattr(config, "wake_vad_level", 1),
         wake_match_window_ms=getattr(config, "wake_match_window_ms", 1200),
+        wake_sensitivity=getattr(config, "wake_sensitivity", 0.65),
+        wake_fuzzy_threshold=getattr(config, "wake_fuzzy_threshold", 75),
+        wake_process=getattr(config, "wake_process", False),
+        vosk_model_path=getattr(config, "vosk_model_path", None),
+        verifier=verifier,
         porcupine_access_key=getattr(config, "porcupine_access_key", None),
         porcupine_keyword_path=getattr(config, "porcupine_keyword_path", None),
         porcupine_sensitivity=getattr(config, "porcupine_sensitivity", 0.65),
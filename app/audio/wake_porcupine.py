@@ -5,13 +5,18 @@ Primary wake word detector with high accuracy and low CPU usage.
 from __future__ import annotations
 
 import collections
+import struct
 import threading
 import time
-from typing import Callable, Optional
+from typing import TYPE_CHECKING, Callable, Optional
 
 from app.util.log import get_event_logger
 
 from .mic import MicrophoneStream
+from .reblock import FrameReblocker
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .wake_verify import WakeVerifier
 
 try:
     import pvporcupine
@@ -40,10 +45,11 @@ class PorcupineWakeListener(threading.Thread):
         on_detect: Callable[[list[bytes]], None] = None,
         sensitivity: float = 0.65,
         sample_rate: int = 16000,
-        chunk_samples: int = 512,  # Porcupine frame length
+        chunk_samples: int = 512,  # Capture frame size; re-blocked to Porcupine's frame_length
         debounce_ms: int = 700,
         mic_device_name: Optional[str] = None,
         pre_roll_ms: int = 300,
+        verifier: Optional["WakeVerifier"] = None,
     ) -> None:
         """
         Initialize Porcupine wake word listener.
@@ -55,10 +61,12 @@ class PorcupineWakeListener(threading.Thread):
             on_detect: Callback function called when wake word detected
             sensitivity: Detection sensitivity 0.0-1.0 (higher = more triggers)
             sample_rate: Audio sample rate (must be 16000 for Porcupine)
-            chunk_samples: Samples per frame (must match Porcupine frame_length)
+            chunk_samples: Samples per capture frame; re-blocked to Porcupine's frame_length so
+                the pre-roll handed to capture uses the same frame size as the rest of the app
             debounce_ms: Minimum time between triggers
             mic_device_name: Specific microphone device
             pre_roll_ms: Pre-roll buffer duration in milliseconds
+            verifier: Optional second-stage check run on the buffer before on_detect
         """
         if not PORCUPINE_AVAILABLE:
             raise RuntimeError(
@@ -84,16 +92,26 @@ class PorcupineWakeListener(threading.Thread):
         self._stop_event = threading.Event()
         self._active_mic: Optional[MicrophoneStream] = None
         self._porcupine = None
+        self._verifier = verifier
 
-        # Initialize Porcupine
-        self._init_porcupine(chunk_samples)
+        self._chunk_samples = chunk_samples
 
-        # Pre-roll buffer setup
-        frame_ms = int((self._porcupine.frame_length / sample_rate) * 1000)
-        buffer_size = max(1, int(pre_roll_ms / frame_ms))
+        # Initialize Porcupine
+        self._init_porcupine()
+
+        # Capture frames are re-blocked into Porcupine-sized frames
+        self._reblocker = FrameReblocker(
+            max(chunk_samples, self._porcupine.frame_length) * 2 * 4,
+            self._porcupine.frame_length * 2,
+        )
+
+        # Pre-roll buffer setup (capture-sized frames)
+        frame_ms = max(1, int((chunk_samples / sample_rate) * 1000))
+        buffer_ms = max(pre_roll_ms, verifier.window_ms) if verifier is not None else pre_roll_ms
+        buffer_size = max(1, int(buffer_ms / frame_ms))
         self._rolling_buffer: collections.deque = collections.deque(maxlen=buffer_size)
 
-    def _init_porcupine(self, chunk_samples: int) -> None:
+    def _init_porcupine(self) -> None:
         """Initialize Porcupine engine."""
         try:
             # Build sensitivity list
@@ -122,13 +140,6 @@ class PorcupineWakeListener(threading.Thread):
                     f"got {self._sample_rate} Hz"
                 )
 
-            # Validate frame length
-            if chunk_samples != self._porcupine.frame_length:
-                raise ValueError(
-                    f"Chunk samples must be {self._porcupine.frame_length} for Porcupine, "
-                    f"got {chunk_samples}. Adjust chunk_samples in config."
-                )
-
         except Exception as exc:
             if self._porcupine:
                 self._porcupine.delete()
@@ -151,30 +162,21 @@ class PorcupineWakeListener(threading.Thread):
             while not self._stop_event.is_set():
                 with MicrophoneStream(
                     rate=self._sample_rate,
-                    chunk_samples=self._porcupine.frame_length,
+                    chunk_samples=self._chunk_samples,
                     input_device_name=self._mic_device_name,
                 ) as mic:
                     self._active_mic = mic
-                    self._rolling_buffer.clear()
+                    self.reset_stream_state()
 
                     while not self._stop_event.is_set():
-                        # Read audio frame (must be exact frame_length)
-                        frame = mic.read(self._porcupine.frame_length)
-
-                        # Maintain rolling buffer for pre-roll
-                        self._rolling_buffer.append(frame)
-
-                        # Process with Porcupine
-                        keyword_index = self._porcupine.process(frame)
+                        frame = mic.read(self._chunk_samples)
 
-                        # Check if wake word detected
-                        if keyword_index >= 0:
-                            if self._should_trigger():
-                                logger.log_wake_detected()
-                                # Pass rolling buffer (contains wake word + pre-roll)
-                                buffer_copy = list(self._rolling_buffer)
-                                self._on_detect(buffer_copy)
-                                return
+                        buffer_copy = self.detect_frame(frame)
+                        if buffer_copy is not None:
+                            logger.log_wake_detected()
+                            # Pass rolling buffer (contains wake word + pre-roll)
+                            self._on_detect(buffer_copy)
+                            return
 
                 self._active_mic = None
 
@@ -188,9 +190,35 @@ class PorcupineWakeListener(threading.Thread):
             if self._porcupine:
                 self._porcupine.delete()
 
-    def _should_trigger(self) -> bool:
+    def reset_stream_state(self) -> None:
+        """Clear the pre-roll buffer before a new audio stream."""
+        self._rolling_buffer.clear()
+        self._reblocker.reset()
+
+    def detect_frame(self, frame: bytes, now: Optional[float] = None) -> Optional[list[bytes]]:
+        """Process one capture frame; return the pre-roll buffer on a confirmed wake."""
+        # Maintain rolling buffer for pre-roll
+        self._rolling_buffer.append(frame)
+
+        # Feed Porcupine every complete frame_length block buffered so far
+        self._reblocker.write(frame)
+        unpack = f"{self._porcupine.frame_length}h"
+        detected = False
+        for block in self._reblocker:
+            if self._porcupine.process(struct.unpack_from(unpack, block)) >= 0:
+                detected = True
+        if not detected or not self._should_trigger(now):
+            return None
+
+        buffer_copy = list(self._rolling_buffer)
+        if self._verifier is not None and not self._verifier.verify(buffer_copy):
+            return None
+        return buffer_copy
+
+    def _should_trigger(self, now: Optional[float] = None) -> bool:
         """Check if enough time has passed since last trigger (debouncing)."""
-        now = time.time()
+        if now is None:
+            now = time.time()
         if (now - self._last_trigger_time) * 1000 >= self._debounce_ms:
             self._last_trigger_time = now
             return True
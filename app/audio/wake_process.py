@@ -0,0 +1,426 @@
+"""Out-of-process Vosk wake word detection.
+
+The capture side (a thread in the UI process) only reads the microphone and
+appends raw frames to a :class:`SharedFrameRing`. A spawned worker process
+attaches to the ring and runs the full wake pipeline (AGC + VAD + Kaldi +
+fuzzy match) through :meth:`WakeWordListener.process_frame`, so none of it
+competes for the UI process GIL. Detections are reported as a ring sequence
+number plus pre-roll length; the capture side slices the pre-roll out of the
+ring itself instead of receiving copied audio.
+"""
+from __future__ import annotations
+
+import atexit
+import collections
+import multiprocessing
+import queue
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence
+
+from app.util.log import get_event_logger, logger
+
+from .mic import MicrophoneStream
+from .shm_ring import SharedFrameRing
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .wake_verify import WakeVerifier
+
+
+def _wake_worker_main(
+    ring_name: str,
+    frame_bytes: int,
+    capacity: int,
+    settings: Dict[str, Any],
+    armed,
+    shutdown,
+    events,
+) -> None:
+    """Entry point of the wake worker process."""
+    try:
+        from vosk import Model
+
+        from .stt import WakeGrammarRecognizer
+        from .wake import WakeWordListener
+
+        ring = SharedFrameRing(frame_bytes, capacity, name=ring_name)
+        recognizer = WakeGrammarRecognizer(
+            Model(settings["model_path"]),
+            settings["sample_rate"],
+            settings["wake_variants"],
+        )
+        listener = WakeWordListener(
+            wake_variants=settings["wake_variants"],
+            on_detect=lambda *_: None,
+            transcriber=recognizer,
+            sample_rate=settings["sample_rate"],
+            chunk_samples=settings["chunk_samples"],
+            debounce_ms=settings["debounce_ms"],
+            pre_roll_ms=settings["pre_roll_ms"],
+            sensitivity=settings["sensitivity"],
+            vad_level=settings["vad_level"],
+            match_window_ms=settings["match_window_ms"],
+            fuzzy_threshold=settings["fuzzy_threshold"],
+        )
+    except Exception as exc:  # pragma: no cover - reported to the parent
+        events.put(("error", {"error": str(exc)}))
+        return
+
+    events.put(("ready", {}))
+    idle_sleep_s = settings["chunk_samples"] / float(settings["sample_rate"]) / 2
+    next_seq: Optional[int] = None
+    dropped = 0
+    # AGC gain applied to each processed frame, so the capture side can
+    # reproduce the gained pre-roll frame by frame.
+    gains: collections.deque = collections.deque(maxlen=capacity)
+
+    try:
+        while not shutdown.is_set():
+            if not armed.wait(timeout=0.1):
+                next_seq = None
+                continue
+            if next_seq is None:
+                listener.reset_stream_state()
+                next_seq = ring.write_seq
+                dropped = 0
+                gains.clear()
+
+            if next_seq >= ring.write_seq:
+                time.sleep(idle_sleep_s)
+                continue
+
+            oldest = ring.oldest_seq()
+            if next_seq < oldest:
+                # Fell a full ring behind; skip ahead rather than process stale audio.
+                dropped += oldest - next_seq
+                next_seq = oldest
+
+            frame = ring.read(next_seq)
+            detected = frame is not None and listener.process_frame(frame)
+            if frame is not None:
+                gains.append(listener.frame_gain)
+            if detected:
+                armed.clear()
+                pre_roll_frames = listener.pre_roll_frames
+                events.put(
+                    (
+                        "detected",
+                        {
+                            "seq": next_seq,
+                            "pre_roll_frames": pre_roll_frames,
+                            "gains": list(gains)[-pre_roll_frames:],
+                            "gain": listener.agc_gain,
+                            "dropped_frames": dropped,
+                        },
+                    )
+                )
+                next_seq = None
+                continue
+            next_seq += 1
+    finally:
+        ring.close()
+
+
+class WakeProcessHost:
+    """Own the shared frame ring and the long-lived wake worker process.
+
+    The worker loads the Vosk model once and stays alive across sessions; it is
+    armed while a :class:`ProcessWakeWordListener` is feeding the ring and
+    disarmed (idle) otherwise.
+    """
+
+    def __init__(
+        self,
+        *,
+        model_path: str,
+        wake_variants: Sequence[str],
+        sample_rate: int = 16000,
+        chunk_samples: int = 320,
+        pre_roll_ms: int = 300,
+        sensitivity: float = 0.65,
+        vad_level: int = 1,
+        match_window_ms: int = 1200,
+        fuzzy_threshold: int = 75,
+        debounce_ms: int = 700,
+        ring_seconds: float = 2.0,
+    ) -> None:
+        if not model_path:
+            raise RuntimeError("Process wake detection requires VOSK_MODEL_PATH / vosk_model_path")
+        self.settings: Dict[str, Any] = {
+            "model_path": model_path,
+            "wake_variants": list(wake_variants),
+            "sample_rate": sample_rate,
+            "chunk_samples": chunk_samples,
+            "pre_roll_ms": pre_roll_ms,
+            "sensitivity": sensitivity,
+            "vad_level": vad_level,
+            "match_window_ms": match_window_ms,
+            "fuzzy_threshold": fuzzy_threshold,
+            "debounce_ms": debounce_ms,
+        }
+        self.frame_bytes = chunk_samples * 2  # 16-bit mono PCM
+        frame_ms = max(1, int((chunk_samples / sample_rate) * 1000))
+        pre_roll_frames = max(1, int(pre_roll_ms / frame_ms))
+        self.capacity = max(pre_roll_frames * 4, int(ring_seconds * 1000 / frame_ms))
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._armed = self._ctx.Event()
+        self._shutdown = self._ctx.Event()
+        self._events = self._ctx.Queue()
+        self._process: Optional[multiprocessing.process.BaseProcess] = None
+        self.ring: Optional[SharedFrameRing] = None
+        self._lock = threading.Lock()
+
+    def start(self, timeout: float = 30.0) -> None:
+        """Create the ring and spawn the worker if it is not already running."""
+        with self._lock:
+            if self._process is not None and self._process.is_alive():
+                return
+            if self.ring is None:
+                self.ring = SharedFrameRing(self.frame_bytes, self.capacity)
+            self._shutdown.clear()
+            self._armed.clear()
+            self._process = self._ctx.Process(
+                target=_wake_worker_main,
+                args=(
+                    self.ring.name,
+                    self.frame_bytes,
+                    self.capacity,
+                    self.settings,
+                    self._armed,
+                    self._shutdown,
+                    self._events,
+                ),
+                name="glasses-wake",
+                daemon=True,
+            )
+            self._process.start()
+
+            try:
+                kind, payload = self._events.get(timeout=timeout)
+            except queue.Empty:
+                self._stop_process()
+                raise RuntimeError("Wake worker process did not become ready in time")
+            if kind != "ready":
+                self._stop_process()
+                raise RuntimeError(f"Wake worker process failed: {payload.get('error')}")
+            logger.info(f"Wake worker process ready (pid={self._process.pid}, ring={self.capacity} frames)")
+
+    def arm(self) -> None:
+        """Drop stale events and let the worker start consuming new frames."""
+        while True:
+            try:
+                self._events.get_nowait()
+            except queue.Empty:
+                break
+        self._armed.set()
+
+    def disarm(self) -> None:
+        self._armed.clear()
+
+    def poll(self) -> Optional[Dict[str, Any]]:
+        """Return the next detection payload, if any, without blocking."""
+        try:
+            kind, payload = self._events.get_nowait()
+        except queue.Empty:
+            return None
+        if kind == "error":
+            raise RuntimeError(f"Wake worker process failed: {payload.get('error')}")
+        return payload if kind == "detected" else None
+
+    def is_alive(self) -> bool:
+        return self._process is not None and self._process.is_alive()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._stop_process()
+            if self.ring is not None:
+                self.ring.close()
+                self.ring = None
+
+    def _stop_process(self) -> None:
+        self._shutdown.set()
+        self._armed.clear()
+        if self._process is not None:
+            self._process.join(timeout=2.0)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+
+
+_HOST: Optional[WakeProcessHost] = None
+
+
+def get_wake_process_host(**settings: Any) -> WakeProcessHost:
+    """Return the shared wake worker host, recreating it if settings changed."""
+    global _HOST
+    candidate = WakeProcessHost(**settings)
+    if _HOST is None or _HOST.settings != candidate.settings:
+        if _HOST is not None:
+            _HOST.shutdown()
+        _HOST = candidate
+    return _HOST
+
+
+@atexit.register
+def _shutdown_host() -> None:
+    if _HOST is not None:
+        _HOST.shutdown()
+
+
+class ProcessWakeWordListener(threading.Thread):
+    """Wake listener whose detection runs in the :class:`WakeProcessHost` worker.
+
+    This thread only moves microphone frames into the shared ring and waits for
+    a detection event, so it is a drop-in replacement for
+    :class:`~app.audio.wake.WakeWordListener` (``start``/``stop``/``join``).
+
+    The worker's liveness is checked while listening: a worker that dies is
+    restarted up to ``max_restarts`` times, after which (or when the worker
+    reports an error) detection continues in this thread on the listener
+    built by ``fallback``, if one was given.
+    """
+
+    LIVENESS_INTERVAL_S = 0.5
+
+    def __init__(
+        self,
+        host: WakeProcessHost,
+        on_detect: Callable[[List[bytes]], None],
+        mic_device_name: Optional[str] = None,
+        verifier: Optional["WakeVerifier"] = None,
+        fallback: Optional[Callable[[], threading.Thread]] = None,
+        max_restarts: int = 2,
+    ) -> None:
+        super().__init__(daemon=True)
+        self._host = host
+        self._verifier = verifier
+        self._on_detect = on_detect
+        self._mic_device_name = mic_device_name
+        self._fallback = fallback
+        self._max_restarts = max(0, max_restarts)
+        self._restarts = 0
+        self._sample_rate = host.settings["sample_rate"]
+        self._chunk_samples = host.settings["chunk_samples"]
+        self._stop_event = threading.Event()
+        self._active_mic: Optional[MicrophoneStream] = None
+        self._fallback_listener: Optional[threading.Thread] = None
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._host.disarm()
+        if self._fallback_listener is not None:
+            self._fallback_listener.stop()
+        if self._active_mic:
+            try:
+                self._active_mic.stop()
+            except Exception:
+                pass
+
+    def run(self) -> None:
+        try:
+            self._listen()
+        except Exception as exc:
+            logger.error(f"[WAKE] Worker process detection failed: {exc}")
+            self._host.disarm()
+            # Detection must not stay dead: keep listening in-process instead.
+            self._run_fallback()
+        finally:
+            self._host.disarm()
+
+    def _listen(self) -> None:
+        self._host.start()
+        ring = self._host.ring
+        assert ring is not None
+        while not self._stop_event.is_set():
+            with MicrophoneStream(
+                rate=self._sample_rate,
+                chunk_samples=self._chunk_samples,
+                input_device_name=self._mic_device_name,
+            ) as mic:
+                self._active_mic = mic
+                self._host.arm()
+                next_liveness_check = time.monotonic() + self.LIVENESS_INTERVAL_S
+                while not self._stop_event.is_set():
+                    frame = mic.read(self._chunk_samples)
+                    if len(frame) != ring.frame_bytes:
+                        continue
+                    ring.write(frame)
+
+                    detection = self._host.poll()
+                    if detection is None:
+                        now = time.monotonic()
+                        if now >= next_liveness_check:
+                            next_liveness_check = now + self.LIVENESS_INTERVAL_S
+                            if not self._host.is_alive():
+                                self._restart_worker()
+                        continue
+                    pre_roll = self._collect_pre_roll(ring, detection)
+                    if self._verifier is not None and not self._verifier.verify(pre_roll):
+                        # The worker disarmed itself on detection; resume listening.
+                        self._host.arm()
+                        continue
+                    get_event_logger().log_wake_detected()
+                    logger.info(
+                        f"✓ Wake word detected by worker process at frame {detection['seq']} "
+                        f"(pre-roll {len(pre_roll)} frames, dropped {detection['dropped_frames']})"
+                    )
+                    self._on_detect(pre_roll)
+                    return
+            self._active_mic = None
+
+    def _restart_worker(self) -> None:
+        """Respawn a worker that died while armed, or give up after ``max_restarts``."""
+        if self._restarts >= self._max_restarts:
+            raise RuntimeError(f"Wake worker process died {self._restarts + 1} times")
+        self._restarts += 1
+        logger.error(
+            f"[WAKE] Wake worker process died; restarting ({self._restarts}/{self._max_restarts})"
+        )
+        get_event_logger().log_metrics("wake_worker_restart", {"restarts": self._restarts})
+        self._host.start()
+        self._host.arm()
+
+    def _run_fallback(self) -> None:
+        """Continue wake detection in this thread on the in-process listener."""
+        if self._fallback is None or self._stop_event.is_set():
+            return
+        self._fallback_listener = self._fallback()
+        logger.warning("[WAKE] Falling back to in-process wake detection")
+        if self._stop_event.is_set():
+            return
+        self._fallback_listener.run()
+
+    @staticmethod
+    def _collect_pre_roll(ring: SharedFrameRing, detection: Dict[str, Any]) -> List[bytes]:
+        """Slice pre-roll (plus audio captured since detection) out of the ring.
+
+        Frames in the ring are raw; each pre-roll frame gets the AGC gain the
+        worker applied to it, so capture receives the same boosted audio as the
+        in-process listener hands over. Frames written after the detection were
+        never processed and take the worker's current gain.
+        """
+        end = ring.write_seq
+        start = max(detection["seq"] - detection["pre_roll_frames"] + 1, ring.oldest_seq())
+        frames = ring.frames(start, end)
+        current_gain = float(detection.get("gain") or 1.0)
+        # gains[-1] belongs to the detection frame; earlier entries precede it.
+        gains: List[float] = list(detection.get("gains") or [])
+        first_gain_seq = detection["seq"] - len(gains) + 1
+        frame_gains = [
+            gains[seq - first_gain_seq] if first_gain_seq <= seq <= detection["seq"] else current_gain
+            for seq in range(start, start + len(frames))
+        ]
+        if all(gain == 1.0 for gain in frame_gains):
+            return frames
+
+        import numpy as np
+
+        gained: List[bytes] = []
+        for frame, gain in zip(frames, frame_gains):
+            if gain == 1.0:
+                gained.append(frame)
+                continue
+            audio = np.frombuffer(frame, dtype=np.int16).astype(np.float32) * gain
+            gained.append(np.clip(audio, -32768, 32767).astype(np.int16).tobytes())
+        return gained
@@ -0,0 +1,155 @@
+"""Second-stage wake word verification.
+
+Stage one (the grammar recognizer or Porcupine) is tuned for recall and runs on
+every frame. When it fires, :class:`WakeVerifier` re-decodes the buffered audio
+with the full-vocabulary model and applies stricter fuzzy scoring before the
+session (camera, MP4 writer, diagnostics) is allowed to start. Verification is
+bounded by a latency budget; if decoding overruns it the trigger is accepted
+(stage one already fired) and the overrun is counted.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional, Sequence
+
+from vosk import KaldiRecognizer, Model
+
+from app.util.log import get_event_logger, logger
+
+from .fuzzy_match import FuzzyWakeWordMatcher
+
+
+@dataclass
+class WakeVerificationStats:
+    """Cumulative counters for stage-two verification."""
+
+    triggers: int = 0
+    confirmed: int = 0
+    rejected: int = 0
+    budget_exceeded: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def false_trigger_rate(self) -> float:
+        return self.rejected / self.triggers if self.triggers else 0.0
+
+    @property
+    def average_ms(self) -> float:
+        return self.total_ms / self.triggers if self.triggers else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["false_trigger_rate"] = round(self.false_trigger_rate, 3)
+        data["average_ms"] = round(self.average_ms, 1)
+        return data
+
+
+class WakeVerifier:
+    """Confirm a first-stage wake trigger on the buffered audio.
+
+    Args:
+        model: Full Vosk model (shared with the segment transcriber)
+        sample_rate: Audio sample rate in Hz
+        phrases: Accepted wake phrases
+        threshold: Fuzzy score (0-100) required to confirm; stricter than stage one
+        budget_ms: Maximum decoding time before the trigger is accepted unverified
+        window_ms: Trailing audio (ms) decoded from the buffer
+        chunk_ms: Decode granularity used to check the budget
+    """
+
+    def __init__(
+        self,
+        model: Model,
+        sample_rate: int,
+        phrases: Sequence[str],
+        threshold: int = 85,
+        budget_ms: int = 250,
+        window_ms: int = 1500,
+        chunk_ms: int = 200,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.budget_ms = max(1, budget_ms)
+        self.window_ms = max(200, window_ms)
+        self._chunk_bytes = max(2, int(sample_rate * chunk_ms / 1000) * 2)
+        self._recognizer = KaldiRecognizer(model, sample_rate)
+        normalized = [" ".join(p.replace("-", " ").split()).lower() for p in phrases if p]
+        self._matcher = FuzzyWakeWordMatcher(wake_words=list(dict.fromkeys(normalized)), threshold=threshold)
+        self._lock = threading.Lock()
+        self.stats = WakeVerificationStats()
+
+    def verify(self, frames: Sequence[bytes]) -> bool:
+        """Return True if the buffered audio contains a wake phrase."""
+        with self._lock:
+            start = time.perf_counter()
+            audio = b"".join(frames)
+            window_bytes = int(self.sample_rate * self.window_ms / 1000) * 2
+            if len(audio) > window_bytes:
+                audio = audio[-window_bytes:]
+
+            self._recognizer.Reset()
+            texts = []
+            over_budget = False
+            for offset in range(0, len(audio), self._chunk_bytes):
+                if self._recognizer.AcceptWaveform(audio[offset : offset + self._chunk_bytes]):
+                    texts.append(json.loads(self._recognizer.Result()).get("text", ""))
+                if (time.perf_counter() - start) * 1000 > self.budget_ms:
+                    over_budget = True
+                    break
+            texts.append(json.loads(self._recognizer.FinalResult()).get("text", ""))
+            text = " ".join(t for t in texts if t).strip()
+
+            if over_budget:
+                confirmed, matched, score = True, None, 0
+            else:
+                confirmed, matched, score = self._matcher.match(text) if text else (False, None, 0)
+
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._record(confirmed, over_budget, elapsed_ms)
+
+        logger.info(
+            f"[WAKE VERIFY] {'confirmed' if confirmed else 'rejected'} '{text}' "
+            f"(match={matched}, score={score}, {elapsed_ms:.0f}ms"
+            f"{', budget exceeded' if over_budget else ''})"
+        )
+        get_event_logger().log_wake_verification(
+            confirmed=confirmed,
+            text=text,
+            score=score,
+            elapsed_ms=elapsed_ms,
+            budget_exceeded=over_budget,
+            stats=self.stats.as_dict(),
+        )
+        return confirmed
+
+    def _record(self, confirmed: bool, over_budget: bool, elapsed_ms: float) -> None:
+        self.stats.triggers += 1
+        if confirmed:
+            self.stats.confirmed += 1
+        else:
+            self.stats.rejected += 1
+        if over_budget:
+            self.stats.budget_exceeded += 1
+        self.stats.total_ms += elapsed_ms
+        self.stats.max_ms = max(self.stats.max_ms, elapsed_ms)
+
+
+def create_wake_verifier(config, model: Optional[Model]) -> Optional[WakeVerifier]:
+    """Build the stage-two verifier for ``config`` or None when disabled."""
+    if model is None or not getattr(config, "wake_verify", True):
+        return None
+    phrases = list(getattr(config, "wake_variants", []) or [])
+    if config.wake_word:
+        phrases.append(config.wake_word)
+    return WakeVerifier(
+        model=model,
+        sample_rate=config.sample_rate_hz,
+        phrases=phrases,
+        threshold=getattr(config, "wake_verify_threshold", 85),
+        budget_ms=getattr(config, "wake_verify_budget_ms", 250),
+        window_ms=getattr(config, "wake_verify_window_ms", 1500),
+    )
@@ -12,7 +12,7 @@ if __package__ is None:  # allow running `python app/main.py`
     sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 from app.ai.vlm_client import VLMClient
-from app.audio.stt import StreamingTranscriber
+from app.audio.stt import StreamingTranscriber, WakeGrammarRecognizer
 from app.audio.tts import SpeechSynthesizer
 from app.segment import SegmentRecorder
 from app.ui import GlassesWindow
@@ -25,18 +25,18 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def build_transcribers(config: AppConfig) -> tuple[StreamingTranscriber, StreamingTranscriber]:
+def build_transcribers(config: AppConfig) -> tuple[WakeGrammarRecognizer, StreamingTranscriber]:
     model_path = config.vosk_model_path or os.getenv("VOSK_MODEL_PATH")
     if not model_path:
         raise RuntimeError("Set VOSK_MODEL_PATH or provide 'vosk_model_path' in the config.")
 
     model = Model(model_path)
-    wake_transcriber = StreamingTranscriber(
-        sample_rate=config.sample_rate_hz,
+    # Wake spotting gets its own fixed-grammar recognizer; only the segment
+    # transcriber pays for word timings and alternatives.
+    wake_transcriber = WakeGrammarRecognizer(
         model=model,
-        enable_words=True,
-        max_alternatives=config.vosk_max_alternatives,
-        noise_gate_threshold=config.noise_gate_threshold,
+        sample_rate=config.sample_rate_hz,
+        phrases=config.wake_variants,
     )
     segment_transcriber = StreamingTranscriber(
         sample_rate=config.sample_rate_hz,
@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import time
 from typing import Any, Dict, List, Optional
 
 import numpy as np
 
+from app.ai.budget import ImagePlan, crop_width, get_image_budgeter, intent_crop_ratio, plan_for_intent
 from app.ai.vlm_client import VLMClient
 from app.util.config import AppConfig
-from app.util.intent import wants_vision
+from app.util.intent import INTENT_OCR, classify_vision_intent, trigger_word_times
+from app.util.log import get_event_logger
 from app.util.text import strip_scene_preface
+from app.video.frame_cache import get_frame_cache
+from app.video.keyframes import select_frames_near, select_keyframes
+from app.video.text_regions import crop_text_regions
 from app.video.utils import process_frames_for_vision
 
 
@@ -17,6 +23,9 @@ def route_and_respond(
     transcript: str,
     segment_frames: List[np.ndarray],
     history: Optional[List[Dict[str, str]]] = None,
+    pre_wake_frames: Optional[List[np.ndarray]] = None,
+    frame_timestamps: Optional[List[float]] = None,
+    words: Optional[List[Dict[str, Any]]] = None,
 ) -> Dict[str, Any]:
     """
     Route request based on intent and call VLM with/without images.
@@ -35,6 +44,11 @@ def route_and_respond(
         transcript: User's transcribed query
         segment_frames: Raw video frames from segment recording
         history: Optional conversation history in chronological order
+        pre_wake_frames: Optional frames from the video pre-roll ring, captured
+            before the turn started; they share the frame_max_images budget
+        frame_timestamps: Capture time of each segment frame (seconds from audio start)
+        words: Recognizer word timings; with ``frame_timestamps`` the frames
+            nearest the spoken trigger words ("this", "read", ...) are sent instead
 
     Returns:
         Dict containing:
@@ -43,22 +57,78 @@ def route_and_respond(
         - text: Extracted response text
         - vision_used: Boolean indicating if images were sent
     """
-    # Step 1: Determine intent
-    needs_vision = wants_vision(transcript)
+    # Step 1: Determine intent (and which kind of vision request it is)
+    intent = classify_vision_intent(transcript)
+    needs_vision = intent is not None
 
     # Step 2: Process frames if vision is needed
     images_b64: List[str] = []
-    if needs_vision and segment_frames:
-        images_b64 = process_frames_for_vision(
-            frames=segment_frames,
-            max_count=config.frame_max_images,
-            crop_ratio=getattr(config, 'center_crop_ratio', 0.38),
-            max_width=config.video_width_px,
-            jpeg_quality=85,
-        )
+    pre_wake_count = 0
+    aligned_count = 0
+    image_stats: Dict[str, float] = {}
+    plan: Optional[ImagePlan] = None
+    if needs_vision and (segment_frames or pre_wake_frames):
+        crop_ratio = getattr(config, 'center_crop_ratio', 0.38)
+        plan = plan_for_intent(_image_plan(config, intent_crop_ratio(intent, crop_ratio)), intent, crop_ratio)
+        deadline_ms = getattr(config, 'frame_prep_deadline_ms', 0)
+        cache_mb = getattr(config, 'frame_cache_mb', 0.0)
+        cache = get_frame_cache(int(cache_mb * 1024 * 1024), getattr(config, 'frame_cache_match_bits', 4)) if cache_mb > 0 else None
+        prep_options: Dict[str, Any] = {
+            'crop_ratio': plan.crop_ratio,
+            'max_width': min(config.video_width_px, plan.max_width),
+            'jpeg_quality': plan.jpeg_quality,
+            'stats': image_stats,
+            'workers': getattr(config, 'frame_encode_workers', 1),
+            # One deadline for the whole turn, shared by pre-wake and segment frames
+            'deadline': time.monotonic() + deadline_ms / 1000.0 if deadline_ms > 0 else None,
+            'cache': cache,
+        }
+        pre_wake = list(pre_wake_frames or [])[: max(0, plan.max_images - 1)]
+        if pre_wake:
+            images_b64 = process_frames_for_vision(frames=pre_wake, max_count=len(pre_wake), **prep_options)
+            pre_wake_count = len(images_b64)
+        budget = plan.max_images - len(images_b64)
+        selector = getattr(config, 'frame_selector', 'uniform')
+        aligned = _aligned_frames(config, segment_frames, frame_timestamps, words, budget)
+        if aligned:
+            segment_frames, selector = aligned, 'uniform'
+            aligned_count = len(aligned)
+        text_crops = _text_crops(config, intent, segment_frames, bool(aligned), budget, image_stats)
+        if text_crops:
+            # Tight crops of the stored frame (capture width, possibly JPEG-stored),
+            # sent without the centre-crop downscale to max_width
+            images_b64 += process_frames_for_vision(
+                frames=text_crops,
+                max_count=budget,
+                **{**prep_options, 'crop_ratio': None, 'max_width': getattr(config, 'ocr_crop_max_width', 1280)},
+            )
+        else:
+            images_b64 += process_frames_for_vision(
+                frames=segment_frames,
+                max_count=budget,
+                selector=selector,
+                **prep_options,
+            )
 
     # Step 3: Call VLM with or without images
-    response = vlm_client.infer(transcript, images_b64, history=history)
+    if image_stats:
+        image_stats = {key: round(value, 1) for key, value in image_stats.items()}
+        image_stats["image_count"] = len(images_b64)
+        get_event_logger().log_metrics("vision.image_encode", image_stats)
+    if images_b64 and plan is not None:
+        response = vlm_client.infer(transcript, images_b64, history=history, image_detail=plan.detail)
+        get_event_logger().log_metrics(
+            "vision.image_budget",
+            {
+                **plan.as_dict(),
+                "image_count": len(images_b64),
+                "image_bytes": int(image_stats.get("jpeg_bytes", 0)),
+                "request_bytes": response.get("request_bytes"),
+                "request_ms": response.get("request_ms"),
+            },
+        )
+    else:
+        response = vlm_client.infer(transcript, images_b64, history=history)
 
     # Step 4: Clean up response text if no vision was used
     text = response.get("text", "")
@@ -69,5 +139,56 @@ def route_and_respond(
     # Step 5: Add metadata
     response["vision_used"] = needs_vision and len(images_b64) > 0
     response["image_count"] = len(images_b64)
+    response["pre_wake_image_count"] = pre_wake_count
+    response["aligned_image_count"] = aligned_count
+    response["image_stats"] = image_stats
+    response["image_plan"] = plan.as_dict() if plan is not None else None
+    response["vision_intent"] = intent
 
     return response
+
+
+def _image_plan(config: AppConfig, crop_ratio: float) -> ImagePlan:
+    """Image width/quality/detail/count for this turn, adapted to the measured uplink."""
+    target_ms = getattr(config, 'image_budget_target_ms', 0.0)
+    if target_ms > 0:
+        source_width = crop_width(config.video_width_px, crop_ratio)
+        return get_image_budgeter(target_ms).plan(config.frame_max_images, source_width)
+    return ImagePlan(config.video_width_px, 85, "high", config.frame_max_images)
+
+
+def _text_crops(
+    config: AppConfig,
+    intent: Optional[str],
+    frames: List[np.ndarray],
+    aligned: bool,
+    budget: int,
+    image_stats: Dict[str, float],
+) -> List[np.ndarray]:
+    """Text-region crops for OCR requests, or [] to use the normal frame path."""
+    if intent != INTENT_OCR or not getattr(config, 'ocr_text_crops', False) or not frames or budget <= 0:
+        return []
+    started = time.perf_counter()
+    # Word-aligned frames are already the right moment; otherwise read the sharpest frame.
+    sources = frames if aligned else [frames[i] for i in select_keyframes(frames, 1)]
+    crops = crop_text_regions(sources, max_regions=budget)
+    image_stats['text_detect_ms'] = (time.perf_counter() - started) * 1000.0
+    image_stats['text_regions'] = len(crops)
+    return crops
+
+
+def _aligned_frames(
+    config: AppConfig,
+    frames: List[np.ndarray],
+    timestamps: Optional[List[float]],
+    words: Optional[List[Dict[str, Any]]],
+    budget: int,
+) -> List[np.ndarray]:
+    """Frames captured when the trigger words were spoken, or [] to fall back."""
+    if not getattr(config, 'frame_align_to_words', False) or not words or not frames:
+        return []
+    if not timestamps or len(timestamps) != len(frames):
+        return []
+    instants = trigger_word_times(words)
+    limit = min(budget, getattr(config, 'frame_align_max_images', 2))
+    return [frames[i] for i in select_frames_near(timestamps, instants, limit)]
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
+import time
 import wave
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
 import threading
 
@@ -13,19 +14,31 @@ from app.audio.stt import StreamingTranscriber
 from app.audio.validation import validate_audio_format
 from app.util.config import AppConfig
 from app.util.fileio import create_temp_segment_dir
+from app.util.intent import StreamingVisionIntent, wants_vision
 from app.util.log import get_event_logger, logger as audio_logger
-from app.video.capture import VideoCapture
-from app.video.writer import VideoSegmentWriter, sample_video_frames
+from app.video.camera import CameraManager, camera_manager_for_config
+from app.video.frames import CandidateFrameBuffer, FrameStore
+from app.video.grabber import FrameGrabber, GrabbedFrame
+from app.video.preroll import VideoPreRollRing
+from app.video.writer import AsyncVideoWriter
+
+
+def _archive_frame(writer: AsyncVideoWriter, grabbed: GrabbedFrame) -> None:
+    """Queue a grabbed frame for archival, passing camera JPEG bytes through untouched."""
+    if grabbed.jpeg is not None:
+        writer.write_jpeg(grabbed.jpeg)
+    else:
+        writer.write(grabbed.frame)
 
 
 @dataclass
 class SegmentResult:
     transcript: str
     clean_transcript: str
-    video_path: Path
+    video_path: Optional[Path]
     audio_path: Path
     audio_bytes: bytes
-    frames: List  # List of np.ndarray frames
+    frames: Sequence  # np.ndarray frames (a FrameStore holding them JPEG-compressed)
     stop_reason: str
     duration_ms: int
     audio_ms: int
@@ -33,6 +46,156 @@ class SegmentResult:
     final_event: Optional[Dict[str, Any]]
     average_confidence: Optional[float] = None
     low_confidence_words: List[Dict[str, Any]] = field(default_factory=list)
+    loop_stats: Dict[str, Any] = field(default_factory=dict)
+    frame_timestamps: List[float] = field(default_factory=list)  # seconds from audio start
+    pre_wake_frames: Sequence = field(default_factory=list)  # ring frames from before the camera side started
+    pre_wake_timestamps: List[float] = field(default_factory=list)  # seconds from audio start (negative = before the turn)
+    words: List[Dict[str, Any]] = field(default_factory=list)  # recognizer word timings, seconds from audio start
+
+
+class _SegmentVideo:
+    """Camera side of one segment: in-memory candidate frames and optional MP4.
+
+    :meth:`start` runs before the audio loop (eager) or :meth:`start_async`
+    from the loop once vision intent appears (lazy). Video pre-roll is taken
+    from the recorder's low-rate ring at start time, so frames from just
+    before the camera side started are still available.
+    """
+
+    def __init__(self, recorder: "SegmentRecorder", camera: CameraManager, video_path: Path) -> None:
+        config = recorder.config
+        self.recorder = recorder
+        self.config = config
+        self.camera = camera
+        self.video_path: Optional[Path] = None
+        self._target_path = video_path
+        # Vision frames are sampled in memory while recording so routing
+        # never has to reopen and decode the MP4.
+        self.candidates = CandidateFrameBuffer(
+            sample_fps=config.frame_sample_fps,
+            max_candidates=config.frame_candidate_pool,
+            max_width=config.video_width_px,
+            jpeg_quality=config.frame_store_jpeg_quality or None,
+            max_bytes=config.frame_store_max_kb * 1024,
+            dedupe_bits=config.frame_store_dedupe_bits,
+        )
+        self.preroll: List[GrabbedFrame] = []
+        self.writer: Optional[AsyncVideoWriter] = None
+        self.grabber: Optional[FrameGrabber] = None
+        self._archive: Optional[Callable[[GrabbedFrame], None]] = None
+        self._frames_before = 0
+        self._failures_before = 0
+        self._starting = False
+        self._stopped = False
+        self._lock = threading.Lock()
+
+    @property
+    def started(self) -> bool:
+        return self.grabber is not None
+
+    def start(self, wait_warm: bool = True) -> None:
+        """Acquire the camera and attach the candidate sampler (and MP4 writer)."""
+        with self._lock:
+            if self._starting or self._stopped:
+                return
+            self._starting = True
+        self.preroll = self.recorder._pre_wake_frames(before=time.monotonic())
+        grabber = self.camera.acquire()
+        try:
+            if wait_warm:
+                self.camera.wait_until_warm()
+            first = grabber.latest()
+            if first is None:
+                raise RuntimeError("Failed to read initial frame from camera source")
+            with self._lock:
+                if self._stopped:  # the segment ended while the camera warmed up
+                    self.camera.release()
+                    return
+                self.candidates.offer(first)
+                if self.config.save_segment_video:
+                    frame_height, frame_width = first.frame.shape[:2]
+                    archive_fps = self._archive_fps()
+                    self.writer = AsyncVideoWriter(
+                        self._target_path,
+                        fps=archive_fps or self.camera.fps(),
+                        frame_size=(frame_width, frame_height),
+                        queue_size=self.config.video_encoder_queue,
+                        drop_policy=self.config.video_drop_policy,
+                        backend=self.config.video_encoder,
+                        mjpeg_passthrough=self.camera.passthrough,
+                    )
+                    self.video_path = self.writer.path
+                    _archive_frame(self.writer, first)
+                    writer = self.writer
+                    self._archive = lambda grabbed: _archive_frame(writer, grabbed)
+                # Candidates only need frame_sample_fps; with decimation the grabber skips decoding the rest.
+                grabber.add_listener(self.candidates.offer, fps=self.config.frame_sample_fps)
+                if self._archive is not None:
+                    grabber.add_listener(self._archive, fps=archive_fps)
+                self._frames_before = grabber.frame_count
+                self._failures_before = grabber.failure_count
+                self.grabber = grabber
+        except BaseException:
+            self.camera.release()
+            raise
+
+    def _archive_fps(self) -> Optional[float]:
+        """Rate the MP4 archive listens at (None = every frame).
+
+        MJPEG passthrough stores camera JPEGs without decoding, so it keeps
+        every frame. Decoded frames are archived at ``segment_video_fps``;
+        a full-rate listener would make the grabber decode every frame.
+        """
+        fps = self.config.segment_video_fps
+        if self.camera.passthrough or fps <= 0:
+            return None
+        return min(fps, self.camera.fps())
+
+    def start_async(self) -> None:
+        """Start on a helper thread so the audio loop never waits for the camera."""
+
+        def _run() -> None:
+            try:
+                self.start()
+            except Exception as exc:
+                audio_logger.warning("Camera start failed: %s", exc)
+
+        threading.Thread(target=_run, name="segment-video-start", daemon=True).start()
+
+    def stop(self) -> Dict[str, Any]:
+        """Detach from the grabber and release the camera; return frame counts and grabber stats."""
+        with self._lock:
+            self._stopped = True
+            grabber = self.grabber
+        if grabber is None:
+            return {}
+        grabber.remove_listener(self.candidates.offer)
+        if self._archive is not None:
+            grabber.remove_listener(self._archive)
+        stats = {
+            "frames": grabber.frame_count - self._frames_before,
+            "failures": grabber.failure_count - self._failures_before,
+            "camera": grabber.stats(),
+        }
+        self.camera.release()
+        return stats
+
+    def capture_late(self, timeout: float = 2.0) -> None:
+        """Add one fresh frame (and pre-roll) when intent was only clear at the end."""
+        self.preroll = self.recorder._pre_wake_frames(before=time.monotonic())
+        try:
+            grabbed = self.camera.capture(timeout=timeout)
+        except Exception as exc:
+            audio_logger.warning("Late camera capture failed: %s", exc)
+            return
+        if grabbed is not None:
+            self.candidates.offer(grabbed)
+
+    def close_writer(self) -> Optional[Dict[str, Any]]:
+        if self.writer is None:
+            return None
+        writer, self.writer = self.writer, None
+        return writer.close()
 
 
 class SegmentRecorder:
@@ -44,6 +207,37 @@ class SegmentRecorder:
         self.sample_rate = config.sample_rate_hz
         self.frame_ms = int((config.chunk_samples / config.sample_rate_hz) * 1000)
         self._stop_event = threading.Event()
+        self._video_preroll: Optional[VideoPreRollRing] = None
+
+    def start_video_preroll(self) -> None:
+        """Keep a low-rate ring of recent frames (while waiting for the wake word)."""
+        if self.config.video_preroll_s <= 0:
+            return
+        if self._video_preroll is None:
+            self._video_preroll = VideoPreRollRing(
+                seconds=self.config.video_preroll_s,
+                fps=self.config.video_preroll_fps,
+                max_width=self.config.video_preroll_width_px,
+            )
+        try:
+            self._video_preroll.attach(camera_manager_for_config(self.config))
+        except Exception as exc:
+            audio_logger.warning("Video pre-roll unavailable: %s", exc)
+
+    def stop_video_preroll(self) -> None:
+        if self._video_preroll is not None:
+            self._video_preroll.detach()
+
+    def _pre_wake_frames(self, before: float) -> List[GrabbedFrame]:
+        """Up to ``video_preroll_max_images`` ring frames captured before ``before``, newest kept."""
+        if self._video_preroll is None or self.config.video_preroll_max_images <= 0:
+            return []
+        frames = self._video_preroll.snapshot(before=before)
+        count = self.config.video_preroll_max_images
+        if len(frames) <= count:
+            return frames
+        step = len(frames) / count
+        return [frames[len(frames) - 1 - int(i * step)] for i in reversed(range(count))]
 
     def record_segment(
         self,
@@ -53,46 +247,81 @@ class SegmentRecorder:
     ) -> SegmentResult:
         """Record a full audio+video segment with guaranteed full capture.
 
+        With ``camera_lazy_start`` the camera side only starts once a
+        stabilized partial transcript wants vision; chat turns then record no
+        video at all.
+
         Args:
             pre_roll_buffer: Optional list of PCM frames from wake word detection
             no_speech_timeout_ms: Optional timeout if no speech is detected
         """
         temp_dir = create_temp_segment_dir()
-        video_path = Path(temp_dir) / "segment.mp4"
         audio_path = Path(temp_dir) / "audio.wav"
 
         self._stop_event.clear()
+        lazy = self.config.camera_lazy_start
+        video = _SegmentVideo(self, camera_manager_for_config(self.config), Path(temp_dir) / "segment.mp4")
+        intent = StreamingVisionIntent(stable_ms=self.config.vision_intent_stable_ms) if lazy else None
+
+        def _on_partial(text: str) -> None:
+            if intent is not None and intent.update(text):
+                audio_logger.info("[CAMERA] vision intent in partial transcript %r; starting camera", text)
+                video.start_async()
 
-        # Open microphone and video capture
+        # Open microphone and use the shared, already-warm camera
         with MicrophoneStream(
             rate=self.sample_rate,
             chunk_samples=self.config.chunk_samples,
             input_device_name=self.config.mic_device_name,
             resample_on_mismatch=self.config.resample_on_mismatch,
-        ) as mic, VideoCapture(source=self.config.camera_source, width=self.config.video_width_px) as camera:
-            ret, frame = camera.read()
-            if not ret:
-                raise RuntimeError("Failed to read initial frame from camera source")
-            frame_height, frame_width = frame.shape[:2]
-
-            fps = camera.fps()
-            with VideoSegmentWriter(video_path, fps=fps, frame_size=(frame_width, frame_height)) as writer:
-                writer.write(frame)
+        ) as mic:
+            if not lazy:
+                video.start()
+            audio_chunks = 0
 
-                def _capture_frame() -> None:
-                    ok, next_frame = camera.read()
-                    if ok:
-                        writer.write(next_frame)
+            def _count_chunk() -> None:
+                nonlocal audio_chunks
+                audio_chunks += 1
 
+            # Camera reads run on the (persistent) grabber thread and encoding
+            # on the encoder thread; the audio loop only counts chunks so it
+            # never blocks on video.
+            loop_start = time.monotonic()
+            try:
                 capture_result: SegmentCaptureResult = run_segment(
                     mic=mic,
                     stt=self.transcriber,
                     config=self.config,
                     stop_event=self._stop_event,
-                    on_chunk=_capture_frame,
+                    on_chunk=_count_chunk,
                     pre_roll_buffer=pre_roll_buffer,
                     no_speech_timeout_ms=no_speech_timeout_ms,
+                    on_partial=_on_partial if lazy else None,
                 )
+            except BaseException:
+                video.stop()
+                video.close_writer()
+                raise
+            finally:
+                loop_elapsed = time.monotonic() - loop_start
+            video_stats = video.stop()
+
+        if lazy and not video.started and wants_vision(capture_result.clean_transcript or capture_result.transcript):
+            # Intent only became clear in the final transcript: one fresh frame.
+            video.capture_late()
+
+        loop_stats = self._loop_stats(
+            audio_chunks, loop_elapsed, video_stats.get("frames", 0), video_stats.get("failures", 0)
+        )
+        loop_stats["camera_started"] = video.started
+        if video_stats:
+            # Frame age at consumption (and reconnects/stream lag for network cameras)
+            loop_stats["camera"] = video_stats["camera"]
+            get_event_logger().log_metrics("camera.frame_age", video_stats["camera"])
+        encoder_stats = video.close_writer()
+        if encoder_stats is not None:
+            # Flushing the encoder queue happens after the mic is closed, off the capture path.
+            loop_stats["encoder"] = encoder_stats
 
         # Write audio to WAV file
         self._write_wav_from_bytes(audio_path, capture_result.audio_bytes)
@@ -103,21 +332,34 @@ class SegmentRecorder:
             capture_result.duration_ms,
         )
 
-        # Sample raw frames - let routing logic decide whether to encode them
-        frames = sample_video_frames(
-            video_path,
-            sample_fps=self.config.frame_sample_fps,
-            max_images=self.config.frame_max_images,
-            max_width=self.config.video_width_px,
-        )
+        # Audio time zero is the start of the (trimmed) pre-roll handed to run_segment
+        ring_frames = max(1, int(self.config.pre_roll_ms / self.frame_ms)) if self.frame_ms else 0
+        pre_roll_s = min(len(pre_roll_buffer or []), ring_frames) * self.frame_ms / 1000.0
+        audio_start = loop_start - pre_roll_s
+        candidates = video.candidates
+        # Keyframe selection and word alignment at routing time need the whole
+        # candidate pool; uniform selection only needs frame_max_images of them.
+        if self.config.frame_selector == "keyframes" or self.config.frame_align_to_words:
+            selected = candidates.candidates()
+        else:
+            selected = candidates.select(self.config.frame_max_images)
+        frames = FrameStore(selected)
+        frame_timestamps = [max(0.0, grabbed.timestamp - audio_start) for grabbed in selected]
+        pre_wake = video.preroll
+        pre_wake_frames = FrameStore(pre_wake)
+        loop_stats["frame_store"] = self._frame_store_stats(candidates, frames, pre_wake_frames)
+        pre_wake_timestamps = [grabbed.timestamp - audio_start for grabbed in pre_wake]
 
         return SegmentResult(
             transcript=capture_result.transcript,
             clean_transcript=capture_result.clean_transcript,
-            video_path=video_path,
+            video_path=video.video_path,
             audio_path=audio_path,
             audio_bytes=capture_result.audio_bytes,
             frames=frames,
+            frame_timestamps=frame_timestamps,
+            pre_wake_frames=pre_wake_frames,
+            pre_wake_timestamps=pre_wake_timestamps,
             stop_reason=capture_result.stop_reason,
             duration_ms=capture_result.duration_ms,
             audio_ms=capture_result.audio_ms,
@@ -125,8 +367,52 @@ class SegmentRecorder:
             final_event=capture_result.final_event,
             average_confidence=capture_result.average_confidence,
             low_confidence_words=capture_result.low_confidence_words,
+            words=capture_result.words,
+            loop_stats=loop_stats,
         )
 
+    def _loop_stats(
+        self, audio_chunks: int, elapsed_s: float, video_frames: int, video_failures: int
+    ) -> Dict[str, Any]:
+        """Compare achieved audio chunk rate and camera frame rate for this segment."""
+        expected_rate = 1000.0 / self.frame_ms if self.frame_ms else 0.0
+        audio_rate = audio_chunks / elapsed_s if elapsed_s > 0 else 0.0
+        video_fps = video_frames / elapsed_s if elapsed_s > 0 else 0.0
+        stats = {
+            "audio_chunks": audio_chunks,
+            "audio_rate_hz": round(audio_rate, 2),
+            "audio_expected_hz": round(expected_rate, 2),
+            "audio_realtime_ratio": round(audio_rate / expected_rate, 3) if expected_rate else 0.0,
+            "video_frames": video_frames,
+            "video_fps": round(video_fps, 2),
+            "video_read_failures": video_failures,
+        }
+        audio_logger.info(
+            "Loop rates: audio=%.1f chunks/s (expected %.1f), video=%.1f fps (%d frames, %d read failures)",
+            audio_rate,
+            expected_rate,
+            stats["video_fps"],
+            stats["video_frames"],
+            stats["video_read_failures"],
+        )
+        get_event_logger().log_metrics("segment.loop_rates", stats)
+        return stats
+
+    def _frame_store_stats(
+        self, candidates: CandidateFrameBuffer, frames: FrameStore, pre_wake_frames: FrameStore
+    ) -> Dict[str, Any]:
+        """Report frame memory for this turn: pool high-water mark and what the result keeps."""
+        stats = {
+            "candidates": len(candidates),
+            "duplicates_skipped": candidates.duplicates_skipped,
+            "duplicates_replaced": candidates.duplicates_replaced,
+            "high_water_bytes": candidates.high_water_bytes,
+            "kept_frames": len(frames) + len(pre_wake_frames),
+            "kept_bytes": frames.nbytes + pre_wake_frames.nbytes,
+        }
+        get_event_logger().log_metrics("segment.frame_store", stats)
+        return stats
+
     def _write_wav(self, path: Path, frames: List[bytes]) -> None:
         """Write WAV file from list of audio frames."""
         with wave.open(str(path), "wb") as wav_file:
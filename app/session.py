@@ -311,6 +311,9 @@ class SessionManager:
             vlm_client=self.vlm_client,
             transcript=user_text,
             segment_frames=segment_result.frames,
+            pre_wake_frames=segment_result.pre_wake_frames,
+            frame_timestamps=segment_result.frame_timestamps,
+            words=segment_result.words,
             history=self._history,
         )
 
@@ -71,6 +71,7 @@ class SessionArtifactWriter:
         if audio_path.exists():
             shutil.copy2(audio_path, paths.mic_raw)
         if video_path and video_path.exists():
+            paths.video = paths.video.with_suffix(video_path.suffix)
             shutil.copy2(video_path, paths.video)
 
         events_for_log = list(partial_events)
@@ -131,6 +131,9 @@ class SessionController:
                         vlm_client=self.vlm_client,
                         transcript=user_text,
                         segment_frames=segment_result.frames,
+                        pre_wake_frames=segment_result.pre_wake_frames,
+                        frame_timestamps=segment_result.frame_timestamps,
+                        words=segment_result.words,
                         history=context_history,
                     )
                     assistant_text = response_data.get("text", "").strip() or "I'm not sure yet, but I'll learn."
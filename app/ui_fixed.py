@@ -6,10 +6,11 @@ from typing import Optional
 from PyQt6 import QtCore, QtGui, QtWidgets
 
 from app.ai.vlm_client import VLMClient
-from app.audio.stt import StreamingTranscriber
+from app.audio.stt import WakeGrammarRecognizer
 from app.audio.tts import SpeechSynthesizer
 from app.audio.wake import WakeWordListener
 from app.audio.wake_hybrid import create_wake_listener
+from app.audio.wake_verify import create_wake_verifier
 from app.segment import SegmentRecorder
 from app.session import SessionCallbacks, SessionManager, SessionState
 from app.util.config import AppConfig
@@ -68,7 +69,7 @@ class GlassesWindow(QtWidgets.QMainWindow):
         segment_recorder: SegmentRecorder,
         vlm_client: VLMClient,
         tts: SpeechSynthesizer,
-        wake_transcriber: StreamingTranscriber,
+        wake_transcriber: WakeGrammarRecognizer,
     ) -> None:
         super().__init__()
         self.config = config
@@ -76,6 +77,8 @@ class GlassesWindow(QtWidgets.QMainWindow):
         self.vlm_client = vlm_client
         self.tts = tts
         self._wake_transcriber = wake_transcriber
+        # Built once so verification counters accumulate across sessions
+        self._wake_verifier = create_wake_verifier(config, getattr(wake_transcriber, "model", None))
 
         self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="glasses")
         self._wake_listener: Optional[WakeWordListener] = None
@@ -170,11 +173,15 @@ class GlassesWindow(QtWidgets.QMainWindow):
                 config=self.config,
                 transcriber=self._wake_transcriber,
                 on_detect=_on_detect,
+                verifier=self._wake_verifier,
             )
             self._wake_listener = listener
             listener.start()
         except Exception as exc:
             self.error_signal.emit(f"Failed to start wake word listener: {exc}")
+            return
+        # Keep recent frames so vision turns can see what happened before the wake word
+        self.session_manager.segment_recorder.start_video_preroll()
 
     def _stop_wake_listener(self) -> None:
         if not self._wake_listener:
@@ -289,5 +296,6 @@ class GlassesWindow(QtWidgets.QMainWindow):
         if self._wake_listener:
             self._wake_listener.stop()
             self._wake_listener.join(timeout=1.0)
+        self.session_manager.segment_recorder.stop_video_preroll()
         self._executor.shutdown(wait=False, cancel_futures=True)
         super().closeEvent(event)
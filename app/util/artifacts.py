@@ -5,7 +5,7 @@ Structure:
 ~/GlassesSessions/<session_id>/
     turn_0/
         mic_raw.wav       # Raw audio fed to STT
-        segment.mp4       # Video recording
+        segment.mp4       # Video recording (.avi for MJPEG passthrough)
         stt_partial.log   # STT partial results with timestamps
         stt_final.txt     # Final STT transcription
         model_input.json  # Input to VLM
@@ -49,7 +49,7 @@ class TurnArtifacts:
     def save_video(self, video_path: Path):
         """Copy video segment to turn directory."""
         if video_path and video_path.exists():
-            dest = self.turn_dir / "segment.mp4"
+            dest = self.turn_dir / ("segment" + video_path.suffix)
             shutil.copy2(video_path, dest)
             self._add_timeline(f"Saved video: {video_path.name}")
 
@@ -28,6 +28,12 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "wake_sensitivity": 0.65,
     "wake_vad_level": 1,
     "wake_match_window_ms": 1200,
+    "wake_fuzzy_threshold": 75,
+    "wake_process": False,  # Run Vosk wake detection in a separate worker process
+    "wake_verify": True,  # Re-check stage-one wake triggers with the full model
+    "wake_verify_threshold": 85,
+    "wake_verify_budget_ms": 250,
+    "wake_verify_window_ms": 1500,
     "tts_voice": None,
     "tts_rate": 175,
     # Porcupine wake word detection (optional, falls back to Vosk)
@@ -45,6 +51,40 @@ DEFAULT_CONFIG: Dict[str, Any] = {
     "vosk_max_alternatives": 5,
     "resample_on_mismatch": True,
     "enable_agc": True,  # Enable Automatic Gain Control for quiet microphones
+    # Video capture / vision frame pipeline
+    "save_segment_video": True,  # Archive each turn as segment.mp4 (vision frames are sampled in memory)
+    "frame_candidate_pool": 12,  # Max in-memory candidate frames kept per turn
+    "video_encoder": "auto",  # auto | ffmpeg | opencv
+    "video_encoder_queue": 60,  # Frames buffered for the background encoder
+    "video_drop_policy": "drop_oldest",  # drop_oldest | drop_newest | block
+    "segment_video_fps": 5.0,  # Archived video rate; each archived frame is decoded (0 = every frame; MJPEG passthrough keeps all undecoded)
+    "camera_mjpeg": False,  # Request MJPEG from the camera and archive it without re-encoding
+    "camera_warmup_ms": 1000,  # Auto-exposure settle time after the camera powers up
+    "camera_warmup_frames": 10,
+    "camera_idle_timeout_s": 30.0,  # Keep the camera open this long between turns (0 = close after each use)
+    "video_preroll_s": 0.0,  # Seconds of pre-wake frames kept while listening (0 disables; holds the camera open)
+    "video_preroll_fps": 2.0,
+    "video_preroll_width_px": 480,
+    "video_preroll_max_images": 2,  # Pre-wake frames included in a vision request
+    "frame_selector": "keyframes",  # keyframes (sharp, deduplicated) | uniform
+    "frame_align_to_words": True,  # Pick frames where "this"/"read"/... was spoken
+    "frame_align_max_images": 2,  # Images sent when frames are word-aligned
+    "frame_encode_workers": 3,  # Threads cropping/resizing/encoding vision frames
+    "frame_prep_deadline_ms": 400,  # Drop frames not encoded by then (0 = wait for all)
+    "frame_cache_mb": 8.0,  # Encoded-frame cache across turns (0 = off)
+    "frame_cache_match_bits": 4,  # dHash distance treated as the same crop
+    "image_budget_target_ms": 1200.0,  # Target image upload time per turn (0 = fixed 960px/q85/high)
+    "ocr_text_crops": True,  # Send text regions cropped from the stored frame (not re-downscaled) for OCR requests
+    "ocr_crop_max_width": 1280,  # Cap on a text-region crop width
+    "frame_store_jpeg_quality": 90,  # Hold per-turn frames as JPEG at this quality (0 keeps raw arrays)
+    "frame_store_max_kb": 2048,  # Byte cap on per-turn frames; the pool is thinned above it (0 = count cap only)
+    "frame_store_dedupe_bits": 3,  # Skip frames this close (dHash bits) to the previous one (0 keeps all)
+    "camera_low_latency": True,  # Network (RTSP/HTTP) cameras: no stream buffering, newest-frame dispatch, auto-reconnect
+    "camera_reconnect_max_backoff_s": 8.0,  # Longest wait between network camera reconnect attempts
+    "camera_decimate": True,  # grab() every camera frame but decode only those a listener needs
+    "camera_min_decode_fps": 2.0,  # Decode rate kept up for the latest frame while decimating
+    "camera_lazy_start": True,  # Start the segment camera only once partial transcripts want vision (chat turns record no video)
+    "vision_intent_stable_ms": 300,  # How long a partial-transcript vision match must hold before the camera starts
 }
 
 
@@ -75,6 +115,12 @@ class AppConfig:
     pre_roll_ms: int = DEFAULT_CONFIG["pre_roll_ms"]
     wake_vad_level: int = DEFAULT_CONFIG["wake_vad_level"]
     wake_match_window_ms: int = DEFAULT_CONFIG["wake_match_window_ms"]
+    wake_fuzzy_threshold: int = DEFAULT_CONFIG["wake_fuzzy_threshold"]
+    wake_process: bool = DEFAULT_CONFIG["wake_process"]
+    wake_verify: bool = DEFAULT_CONFIG["wake_verify"]
+    wake_verify_threshold: int = DEFAULT_CONFIG["wake_verify_threshold"]
+    wake_verify_budget_ms: int = DEFAULT_CONFIG["wake_verify_budget_ms"]
+    wake_verify_window_ms: int = DEFAULT_CONFIG["wake_verify_window_ms"]
     noise_gate_threshold: int = DEFAULT_CONFIG["noise_gate_threshold"]
     apply_noise_gate: bool = DEFAULT_CONFIG["apply_noise_gate"]
     apply_speech_filter: bool = DEFAULT_CONFIG["apply_speech_filter"]
@@ -96,6 +142,40 @@ class AppConfig:
     tail_padding_ms: int = DEFAULT_CONFIG["tail_padding_ms"]
     # AGC (Automatic Gain Control) for quiet microphones
     enable_agc: bool = DEFAULT_CONFIG["enable_agc"]
+    # Video capture / vision frame pipeline
+    save_segment_video: bool = DEFAULT_CONFIG["save_segment_video"]
+    frame_candidate_pool: int = DEFAULT_CONFIG["frame_candidate_pool"]
+    video_encoder: str = DEFAULT_CONFIG["video_encoder"]
+    video_encoder_queue: int = DEFAULT_CONFIG["video_encoder_queue"]
+    video_drop_policy: str = DEFAULT_CONFIG["video_drop_policy"]
+    camera_mjpeg: bool = DEFAULT_CONFIG["camera_mjpeg"]
+    camera_warmup_ms: int = DEFAULT_CONFIG["camera_warmup_ms"]
+    camera_warmup_frames: int = DEFAULT_CONFIG["camera_warmup_frames"]
+    camera_idle_timeout_s: float = DEFAULT_CONFIG["camera_idle_timeout_s"]
+    video_preroll_s: float = DEFAULT_CONFIG["video_preroll_s"]
+    video_preroll_fps: float = DEFAULT_CONFIG["video_preroll_fps"]
+    video_preroll_width_px: int = DEFAULT_CONFIG["video_preroll_width_px"]
+    video_preroll_max_images: int = DEFAULT_CONFIG["video_preroll_max_images"]
+    frame_selector: str = DEFAULT_CONFIG["frame_selector"]
+    frame_align_to_words: bool = DEFAULT_CONFIG["frame_align_to_words"]
+    frame_align_max_images: int = DEFAULT_CONFIG["frame_align_max_images"]
+    frame_encode_workers: int = DEFAULT_CONFIG["frame_encode_workers"]
+    frame_prep_deadline_ms: int = DEFAULT_CONFIG["frame_prep_deadline_ms"]
+    frame_cache_mb: float = DEFAULT_CONFIG["frame_cache_mb"]
+    frame_cache_match_bits: int = DEFAULT_CONFIG["frame_cache_match_bits"]
+    image_budget_target_ms: float = DEFAULT_CONFIG["image_budget_target_ms"]
+    ocr_text_crops: bool = DEFAULT_CONFIG["ocr_text_crops"]
+    ocr_crop_max_width: int = DEFAULT_CONFIG["ocr_crop_max_width"]
+    frame_store_jpeg_quality: int = DEFAULT_CONFIG["frame_store_jpeg_quality"]
+    frame_store_max_kb: int = DEFAULT_CONFIG["frame_store_max_kb"]
+    frame_store_dedupe_bits: int = DEFAULT_CONFIG["frame_store_dedupe_bits"]
+    camera_low_latency: bool = DEFAULT_CONFIG["camera_low_latency"]
+    camera_reconnect_max_backoff_s: float = DEFAULT_CONFIG["camera_reconnect_max_backoff_s"]
+    camera_decimate: bool = DEFAULT_CONFIG["camera_decimate"]
+    camera_min_decode_fps: float = DEFAULT_CONFIG["camera_min_decode_fps"]
+    camera_lazy_start: bool = DEFAULT_CONFIG["camera_lazy_start"]
+    vision_intent_stable_ms: int = DEFAULT_CONFIG["vision_intent_stable_ms"]
+    segment_video_fps: float = DEFAULT_CONFIG["segment_video_fps"]
 
     def to_dict(self) -> Dict[str, Any]:
         """Return a JSON serializable dict representation."""
@@ -170,6 +250,12 @@ def load_config(config_path: Optional[Path] = None) -> AppConfig:
         ("GLASSES_WAKE_SENSITIVITY", "wake_sensitivity"),
         ("GLASSES_WAKE_VAD_LEVEL", "wake_vad_level"),
         ("GLASSES_WAKE_MATCH_MS", "wake_match_window_ms"),
+        ("GLASSES_WAKE_FUZZY_THRESHOLD", "wake_fuzzy_threshold"),
+        ("GLASSES_WAKE_PROCESS", "wake_process"),
+        ("GLASSES_WAKE_VERIFY", "wake_verify"),
+        ("GLASSES_WAKE_VERIFY_THRESHOLD", "wake_verify_threshold"),
+        ("GLASSES_WAKE_VERIFY_BUDGET_MS", "wake_verify_budget_ms"),
+        ("GLASSES_WAKE_VERIFY_WINDOW_MS", "wake_verify_window_ms"),
         ("GLASSES_TTS_VOICE", "tts_voice"),
         ("GLASSES_TTS_RATE", "tts_rate"),
         ("GLASSES_PREFER_PORCUPINE", "prefer_porcupine"),
@@ -178,6 +264,39 @@ def load_config(config_path: Optional[Path] = None) -> AppConfig:
         ("GLASSES_PORCUPINE_KEYWORD_PATH", "porcupine_keyword_path"),
         ("GLASSES_MIN_SPEECH_FRAMES", "min_speech_frames"),
         ("GLASSES_TAIL_PADDING_MS", "tail_padding_ms"),
+        ("GLASSES_SAVE_SEGMENT_VIDEO", "save_segment_video"),
+        ("GLASSES_FRAME_CANDIDATE_POOL", "frame_candidate_pool"),
+        ("GLASSES_VIDEO_ENCODER", "video_encoder"),
+        ("GLASSES_VIDEO_ENCODER_QUEUE", "video_encoder_queue"),
+        ("GLASSES_VIDEO_DROP_POLICY", "video_drop_policy"),
+        ("GLASSES_CAMERA_MJPEG", "camera_mjpeg"),
+        ("GLASSES_CAMERA_WARMUP_MS", "camera_warmup_ms"),
+        ("GLASSES_CAMERA_WARMUP_FRAMES", "camera_warmup_frames"),
+        ("GLASSES_CAMERA_IDLE_TIMEOUT_S", "camera_idle_timeout_s"),
+        ("GLASSES_VIDEO_PREROLL_S", "video_preroll_s"),
+        ("GLASSES_VIDEO_PREROLL_FPS", "video_preroll_fps"),
+        ("GLASSES_VIDEO_PREROLL_WIDTH_PX", "video_preroll_width_px"),
+        ("GLASSES_VIDEO_PREROLL_MAX_IMAGES", "video_preroll_max_images"),
+        ("GLASSES_FRAME_SELECTOR", "frame_selector"),
+        ("GLASSES_FRAME_ALIGN_TO_WORDS", "frame_align_to_words"),
+        ("GLASSES_FRAME_ALIGN_MAX_IMAGES", "frame_align_max_images"),
+        ("GLASSES_FRAME_ENCODE_WORKERS", "frame_encode_workers"),
+        ("GLASSES_FRAME_PREP_DEADLINE_MS", "frame_prep_deadline_ms"),
+        ("GLASSES_FRAME_CACHE_MB", "frame_cache_mb"),
+        ("GLASSES_FRAME_CACHE_MATCH_BITS", "frame_cache_match_bits"),
+        ("GLASSES_IMAGE_BUDGET_TARGET_MS", "image_budget_target_ms"),
+        ("GLASSES_OCR_TEXT_CROPS", "ocr_text_crops"),
+        ("GLASSES_OCR_CROP_MAX_WIDTH", "ocr_crop_max_width"),
+        ("GLASSES_FRAME_STORE_JPEG_QUALITY", "frame_store_jpeg_quality"),
+        ("GLASSES_FRAME_STORE_MAX_KB", "frame_store_max_kb"),
+        ("GLASSES_FRAME_STORE_DEDUPE_BITS", "frame_store_dedupe_bits"),
+        ("GLASSES_CAMERA_LOW_LATENCY", "camera_low_latency"),
+        ("GLASSES_CAMERA_RECONNECT_MAX_BACKOFF_S", "camera_reconnect_max_backoff_s"),
+        ("GLASSES_CAMERA_DECIMATE", "camera_decimate"),
+        ("GLASSES_CAMERA_MIN_DECODE_FPS", "camera_min_decode_fps"),
+        ("GLASSES_CAMERA_LAZY_START", "camera_lazy_start"),
+        ("GLASSES_VISION_INTENT_STABLE_MS", "vision_intent_stable_ms"),
+        ("GLASSES_SEGMENT_VIDEO_FPS", "segment_video_fps"),
     ]:
         value = os.getenv(env_key)
         if value is not None:
@@ -199,11 +318,57 @@ def load_config(config_path: Optional[Path] = None) -> AppConfig:
                 "vosk_max_alternatives",
                 "wake_vad_level",
                 "wake_match_window_ms",
+                "wake_fuzzy_threshold",
+                "wake_verify_threshold",
+                "wake_verify_budget_ms",
+                "wake_verify_window_ms",
+                "frame_candidate_pool",
+                "video_encoder_queue",
+                "camera_warmup_ms",
+                "camera_warmup_frames",
+                "video_preroll_width_px",
+                "video_preroll_max_images",
+                "frame_align_max_images",
+                "frame_encode_workers",
+                "frame_prep_deadline_ms",
+                "frame_cache_match_bits",
+                "ocr_crop_max_width",
+                "frame_store_jpeg_quality",
+                "frame_store_max_kb",
+                "frame_store_dedupe_bits",
+                "vision_intent_stable_ms",
             }:
                 config_data[config_key] = int(value)
-            elif config_key in {"frame_sample_fps", "center_crop_ratio", "wake_sensitivity", "porcupine_sensitivity"}:
+            elif config_key in {
+                "frame_sample_fps",
+                "center_crop_ratio",
+                "wake_sensitivity",
+                "porcupine_sensitivity",
+                "camera_idle_timeout_s",
+                "video_preroll_s",
+                "video_preroll_fps",
+                "frame_cache_mb",
+                "image_budget_target_ms",
+                "camera_reconnect_max_backoff_s",
+                "camera_min_decode_fps",
+                "segment_video_fps",
+            }:
                 config_data[config_key] = float(value)
-            elif config_key in {"prefer_porcupine", "apply_noise_gate", "apply_speech_filter", "resample_on_mismatch"}:
+            elif config_key in {
+                "prefer_porcupine",
+                "apply_noise_gate",
+                "apply_speech_filter",
+                "resample_on_mismatch",
+                "wake_process",
+                "wake_verify",
+                "save_segment_video",
+                "camera_mjpeg",
+                "frame_align_to_words",
+                "ocr_text_crops",
+                "camera_low_latency",
+                "camera_decimate",
+                "camera_lazy_start",
+            }:
                 config_data[config_key] = value.lower() in ("true", "1", "yes")
             elif config_key == "wake_variants":
                 config_data[config_key] = [variant.strip() for variant in value.split(",") if variant.strip()]
@@ -20,15 +20,16 @@ def create_temp_segment_dir(prefix: str = "glasses_segment_") -> Path:
 def archive_session(
     session_root: Path,
     timestamp_key: str,
-    video_path: Path,
+    video_path: Path | None,
     transcript: str,
     response_payload: dict,
     audio_path: Path | None = None,
 ) -> Path:
     session_dir = ensure_dir(session_root / timestamp_key)
 
-    target_video = session_dir / "segment.mp4"
-    shutil.move(str(video_path), target_video)
+    if video_path and video_path.exists():
+        # Keep the container suffix: MJPEG passthrough segments are .avi.
+        shutil.move(str(video_path), session_dir / ("segment" + video_path.suffix))
 
     transcript_path = session_dir / "transcript.txt"
     transcript_path.write_text(transcript, encoding="utf-8")
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import re
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from app.util.matcher import PatternMatch, PatternMatcher
 
 
 # Vision-related intent patterns
 DEICTIC_PATTERNS = [
-    r"\bwhat\s+is\s+(this|that)\b",
+    r"\bwhat\s+(is|was)\s+(this|that)\b",
     r"\bwhat\s+am\s+i\s+(holding|looking\s+at)\b",
     r"\bcan\s+you\s+see\s+what\s+i'?m\s+(holding|doing)\b",
     r"\blook\s+at\b",
@@ -35,57 +39,65 @@ OCR_PATTERNS = [
     r"\bwritten\b",
 ]
 
-# Chat/greeting patterns (explicitly non-vision)
-CHAT_PATTERNS = [
-    r"^\s*(hi|hello|hey|howdy|greetings)\b",
-    r"\bhow\s+are\s+you\b",
-    r"\bwhat'?s\s+up\b",
-    r"\bgood\s+(morning|afternoon|evening|night)\b",
-    r"\bnice\s+to\s+(meet|see)\s+you\b",
-    r"\bhow\s+do\s+you\s+do\b",
-    r"^\s*(thanks|thank\s+you|thx)\b",
-    r"^\s*(bye|goodbye|see\s+ya)\b",
+# Vision intent classes, used to pick crop, resolution and detail per request
+INTENT_IDENTIFY = "identify"
+INTENT_OCR = "ocr"
+INTENT_COUNT = "count"
+INTENT_COLOR = "color"
+INTENT_DESCRIBE = "describe"
+
+COUNT_PATTERNS = [
+    r"\bhow\s+many\b",
+    r"\bcount\b",
+    r"\bnumber\s+of\b",
+]
+
+COLOR_PATTERNS = [
+    r"\b(what|which)\s+colou?rs?\b",
+    r"\bcolou?rs?\s+(is|are|of)\b",
 ]
 
-# Leading greeting prefixes that should be ignored when evaluating intent.
-CHAT_PREFIX_PATTERNS = [
-    r"^\s*(hi|hello|hey|howdy|greetings)\b",
-    r"^\s*good\s+(morning|afternoon|evening|night)\b",
-    r"^\s*(thanks|thank\s+you|thx)\b",
-    r"^\s*(bye|goodbye|see\s+ya)\b",
+DESCRIBE_PATTERNS = [
+    r"\bdescribe\s+(the\s+)?(scene|room|area|view|surroundings|everything)\b",
+    r"\bwhat\s+(do|can)\s+you\s+see\b",
+    r"\bwhat'?s\s+(around|in\s+front)\b",
+    r"\bwhere\s+is\b",
 ]
 
+# Checked in order; the first class with a matching pattern wins.
+INTENT_CLASS_PATTERNS = [
+    (INTENT_OCR, OCR_PATTERNS),
+    (INTENT_COUNT, COUNT_PATTERNS),
+    (INTENT_COLOR, COLOR_PATTERNS),
+    (INTENT_DESCRIBE, DESCRIBE_PATTERNS),
+]
 
-def _matches_patterns(text: str, patterns: list[str]) -> bool:
-    """Return True if any regex in patterns matches text (case-insensitive)."""
-    for pattern in patterns:
-        if re.search(pattern, text, flags=re.IGNORECASE):
-            return True
-    return False
+# Categories reported by find_vision_intent
+VISION_DEICTIC = "deictic"
+VISION_OCR = "ocr"
 
+# Compiled once: each check below is a single scan of the text.
+_VISION_MATCHER = PatternMatcher([(VISION_DEICTIC, DEICTIC_PATTERNS), (VISION_OCR, OCR_PATTERNS)])
+_CLASS_MATCHER = PatternMatcher(INTENT_CLASS_PATTERNS)
 
-def _strip_leading_greeting(text: str) -> tuple[str, bool]:
-    """Strip leading greeting phrases and punctuation from text."""
-    for pattern in CHAT_PREFIX_PATTERNS:
-        match = re.match(pattern, text, flags=re.IGNORECASE)
-        if match:
-            remainder = text[match.end():]
-            remainder = remainder.lstrip(" ,.!?-")
-            return remainder, True
-    return text, False
 
+def find_vision_intent(transcript: str) -> Optional[PatternMatch]:
+    """
+    Return the first vision trigger in ``transcript``, or None.
 
-def _is_chat_only(text: str) -> bool:
-    """Return True if text is purely chat/greeting with no extra content."""
-    normalized = text.strip()
-    if not normalized:
-        return True
+    The match says which pattern family fired (``VISION_DEICTIC`` or
+    ``VISION_OCR``) and where (character offsets into ``transcript``). All
+    patterns are scanned in one pass, so this is cheap enough to run on
+    every partial hypothesis.
 
-    for pattern in CHAT_PATTERNS:
-        extended_pattern = f"{pattern}(?:[\\s,.!?]*)$"
-        if re.fullmatch(extended_pattern, normalized, flags=re.IGNORECASE):
-            return True
-    return False
+    Args:
+        transcript: The user's spoken/transcribed query
+    """
+    if not transcript or not transcript.strip():
+        return None
+    # A leading greeting never hides a trigger (the greeting ends on a word
+    # boundary), so the greeting-stripped text needs no second scan.
+    return _VISION_MATCHER.search(transcript)
 
 
 def wants_vision(transcript: str) -> bool:
@@ -106,22 +118,107 @@ def wants_vision(transcript: str) -> bool:
     Returns:
         True if vision is needed, False otherwise
     """
-    if not transcript or not transcript.strip():
-        return False
+    # Greetings and small talk never match a vision pattern, so no match
+    # means no vision (conservative default).
+    return find_vision_intent(transcript) is not None
+
 
-    text_lower = transcript.lower().strip()
-    no_greeting_text, _ = _strip_leading_greeting(text_lower)
+class StreamingVisionIntent:
+    """
+    Run :func:`wants_vision` on partial transcripts and report stable intent.
 
-    def needs_vision(candidate: str) -> bool:
-        return _matches_patterns(candidate, DEICTIC_PATTERNS) or _matches_patterns(candidate, OCR_PATTERNS)
+    Partial hypotheses are revised as audio arrives ("is this" may become
+    "is this going to rain"), so intent only counts once :func:`wants_vision`
+    has held continuously for ``stable_ms``. Feeding the same text again is
+    cheap (the previous answer is reused), so callers can update on every
+    audio chunk.
 
-    # Evaluate both the original text and the greeting-stripped text.
-    if needs_vision(text_lower) or needs_vision(no_greeting_text):
-        return True
+    Args:
+        stable_ms: How long a vision match must persist before it triggers
+    """
 
-    # If the user only greeted or made small talk, treat as non-vision.
-    if _is_chat_only(text_lower):
+    def __init__(self, stable_ms: int = 300) -> None:
+        self.stable_ms = stable_ms
+        self.triggered = False
+        self.trigger_text: Optional[str] = None
+        self._text: Optional[str] = None
+        self._match = False
+        self._match_since: Optional[float] = None
+
+    def update(self, text: str, now: Optional[float] = None) -> bool:
+        """Feed the latest partial transcript; return True once, when intent becomes stable."""
+        if self.triggered:
+            return False
+        now = time.monotonic() if now is None else now
+        if text != self._text:
+            self._text = text
+            self._match = wants_vision(text)
+        if not self._match:
+            self._match_since = None
+            return False
+        if self._match_since is None:
+            self._match_since = now
+        if (now - self._match_since) * 1000.0 >= self.stable_ms:
+            self.triggered = True
+            self.trigger_text = text
+            return True
         return False
 
-    # Default conservatively: no vision unless clearly requested
-    return False
+
+def classify_vision_intent(transcript: str) -> Optional[str]:
+    """
+    Classify a vision request so image preparation can match it.
+
+    Args:
+        transcript: The user's spoken/transcribed query
+
+    Returns:
+        One of INTENT_OCR, INTENT_COUNT, INTENT_COLOR, INTENT_DESCRIBE or
+        INTENT_IDENTIFY (any other vision request), or None when
+        :func:`wants_vision` is False
+    """
+    if not wants_vision(transcript):
+        return None
+
+    match = _CLASS_MATCHER.best(transcript)
+    return match.category if match else INTENT_IDENTIFY
+
+
+def trigger_word_times(words: Sequence[Dict[str, Any]]) -> List[float]:
+    """
+    Return the times at which deictic/OCR trigger phrases were spoken.
+
+    ``words`` are recognizer word timings (``word``, ``start``, ``end``). Each
+    DEICTIC/OCR pattern match is mapped back to the word that ends it, e.g.
+    "this" in "what is this" or "label" in "read the label", and that word's
+    start time is reported.
+
+    Args:
+        words: Word timing dicts in spoken order
+
+    Returns:
+        Sorted, de-duplicated start times in seconds
+    """
+    spans: List[tuple[int, int, float]] = []
+    parts: List[str] = []
+    offset = 0
+    for item in words:
+        word = str(item.get("word", "")).strip().lower()
+        if not word or item.get("start") is None:
+            continue
+        spans.append((offset, offset + len(word), float(item["start"])))
+        parts.append(word)
+        offset += len(word) + 1
+    if not spans:
+        return []
+
+    text = " ".join(parts)
+    times = set()
+    for pattern in DEICTIC_PATTERNS + OCR_PATTERNS:
+        for match in re.finditer(pattern, text, flags=re.IGNORECASE):
+            last_char = max(match.start(), match.end() - 1)
+            for start, end, start_s in spans:
+                if start <= last_char < end:
+                    times.add(start_s)
+                    break
+    return sorted(times)
@@ -266,6 +266,32 @@ class AudioEventLogger:
             },
         )
 
+    def log_wake_verification(
+        self,
+        *,
+        confirmed: bool,
+        text: str,
+        score: int,
+        elapsed_ms: float,
+        budget_exceeded: bool,
+        stats: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Record the outcome and cost of a second-stage wake verification."""
+        payload: Dict[str, Any] = {
+            "confirmed": confirmed,
+            "text": text,
+            "score": score,
+            "elapsed_ms": round(elapsed_ms, 1),
+            "budget_exceeded": budget_exceeded,
+        }
+        if stats:
+            payload["stats"] = stats
+        self._structured.log("wake.verified" if confirmed else "wake.rejected", payload)
+
+    def log_metrics(self, event: str, payload: Dict[str, Any]) -> None:
+        """Record a named performance measurement (e.g. ``segment.loop_rates``)."""
+        self._structured.log(event, dict(payload))
+
     def log_segment_start(
         self,
         *,
@@ -0,0 +1,88 @@
+"""Precompiled, single-pass matching of categorised regex pattern lists.
+
+Intent detection and response cleanup each hold lists of pattern strings per
+category. Looping ``re.search(pattern, text, flags)`` over them costs one
+scan (plus a regex-cache lookup) per pattern. :class:`PatternMatcher`
+compiles every pattern of every category into one alternation with a named
+group per category, so a single scan answers "did anything match, which
+category, and where". That keeps intent cheap enough to run on every partial
+transcript.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Optional, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class PatternMatch:
+    """Category and span of a match."""
+
+    category: str
+    start: int
+    end: int
+
+
+class PatternMatcher:
+    """One compiled alternation over ``(category, patterns)`` pairs.
+
+    Categories (and patterns within them) are tried in the order given, so at
+    any one position the earlier category wins, like a loop over the lists.
+
+    Args:
+        categories: ``(name, [regex, ...])`` pairs in priority order
+        flags: ``re`` flags applied to every pattern
+        suffix: Regex appended after the alternation (e.g. trailing punctuation)
+    """
+
+    def __init__(
+        self,
+        categories: Sequence[Tuple[str, Sequence[str]]],
+        flags: int = re.IGNORECASE,
+        suffix: str = "",
+    ) -> None:
+        self.categories = [name for name, _ in categories]
+        self._groups = [f"_c{index}" for index in range(len(categories))]
+        bodies = ["|".join(f"(?:{pattern})" for pattern in patterns) for _, patterns in categories]
+        alternation = "|".join(f"(?P<{group}>{body})" for group, body in zip(self._groups, bodies))
+        self._regex = re.compile(f"(?:{alternation}){suffix}", flags)
+        # Zero-width lookahead per category: reports the best category at every position.
+        self._probe = re.compile(
+            "|".join(f"(?=(?P<{group}>{body}))" for group, body in zip(self._groups, bodies)), flags
+        )
+
+    def _category(self, match: re.Match) -> Tuple[int, str]:
+        for index, group in enumerate(self._groups):
+            if match.group(group) is not None:
+                return index, group
+        raise AssertionError("match without a category group")  # pragma: no cover
+
+    def _wrap(self, match: Optional[re.Match]) -> Optional[PatternMatch]:
+        if match is None:
+            return None
+        index, _ = self._category(match)
+        return PatternMatch(self.categories[index], match.start(), match.end())
+
+    def search(self, text: str) -> Optional[PatternMatch]:
+        """Leftmost match anywhere in ``text``."""
+        return self._wrap(self._regex.search(text))
+
+    def match(self, text: str) -> Optional[PatternMatch]:
+        """Match anchored at the start of ``text``."""
+        return self._wrap(self._regex.match(text))
+
+    def fullmatch(self, text: str) -> Optional[PatternMatch]:
+        """Match covering the whole of ``text``."""
+        return self._wrap(self._regex.fullmatch(text))
+
+    def best(self, text: str) -> Optional[PatternMatch]:
+        """Highest-priority category matching anywhere in ``text`` (first occurrence)."""
+        best: Optional[Tuple[int, PatternMatch]] = None
+        for probe in self._probe.finditer(text):
+            index, group = self._category(probe)
+            if best is None or index < best[0]:
+                best = (index, PatternMatch(self.categories[index], probe.start(group), probe.end(group)))
+                if index == 0:
+                    break
+        return best[1] if best else None
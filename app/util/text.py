@@ -3,6 +3,8 @@ from __future__ import annotations
 import re
 from typing import Optional
 
+from app.util.matcher import PatternMatcher
+
 
 # Scene-related prefixes that should be stripped when no images are sent.
 # We keep patterns lightweight (no anchors) and add shared trailing punctuation
@@ -22,18 +24,22 @@ SCENE_PREFACE_PATTERNS = [
 ]
 
 
+# One anchored alternation; trailing whitespace or punctuation such as comma,
+# colon, dash or period is consumed with the preface.
+_PREFACE_MATCHER = PatternMatcher(
+    [("scene_preface", SCENE_PREFACE_PATTERNS)],
+    flags=re.IGNORECASE | re.DOTALL,
+    suffix=r"(?:[\s,.:;-]+|$)",
+)
+
+
 def _strip_preface(text: str) -> tuple[str, bool]:
     """Return text without a recognised scene preface and whether one was removed."""
     stripped = text.lstrip()
-    for pattern in SCENE_PREFACE_PATTERNS:
-        # Allow trailing whitespace or punctuation such as comma, colon, dash, period.
-        match = re.match(
-            rf"(?is)^{pattern}(?:[\s,.:;-]+|$)",
-            stripped,
-        )
-        if match:
-            without = stripped[match.end():]
-            return without.lstrip(), True
+    match = _PREFACE_MATCHER.match(stripped)
+    if match:
+        without = stripped[match.end:]
+        return without.lstrip(), True
     return stripped, False
 
 
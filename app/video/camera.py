@@ -0,0 +1,275 @@
+"""Persistent, warmed camera shared across turns and vision captures.
+
+Opening a camera and letting auto-exposure settle costs seconds. The
+:class:`CameraManager` keeps the device open with a :class:`FrameGrabber`
+running, so segments and ``VisionPipeline.capture_and_process`` get an already
+exposed frame immediately. After ``idle_timeout_s`` without users the camera
+is powered down and the next use pays the warm-up once.
+"""
+from __future__ import annotations
+
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Union
+
+from app.util.log import logger
+
+from .capture import VideoCapture
+from .grabber import FrameGrabber, GrabbedFrame
+
+
+class CameraManager:
+    """Own one camera device and its grabber thread across many users.
+
+    Args:
+        source: Camera index or stream URL
+        width: Requested capture width
+        mjpeg: Request MJPEG from the camera
+        passthrough: Keep camera JPEG bytes undecoded (see :class:`VideoCapture`)
+        low_latency: For network streams, minimal buffering, newest-frame
+            listener dispatch and automatic reconnect (see :class:`FrameGrabber`)
+        reconnect_max_backoff_s: Longest wait between reconnect attempts
+        decimate: Decode only the frames listeners need (see :class:`FrameGrabber`)
+        min_decode_fps: Decode rate kept up for ``latest()`` while decimating
+        warmup_ms: Minimum time after opening before frames count as settled
+        warmup_frames: Minimum frames grabbed after opening before frames count as settled
+        idle_timeout_s: Power the camera down after this long unused (0 = on release)
+    """
+
+    RECONNECT_AFTER_FAILURES = 20
+
+    def __init__(
+        self,
+        source: Union[int, str] = 0,
+        width: Optional[int] = None,
+        *,
+        mjpeg: bool = False,
+        passthrough: bool = False,
+        low_latency: bool = False,
+        reconnect_max_backoff_s: float = 8.0,
+        decimate: bool = False,
+        min_decode_fps: float = 2.0,
+        warmup_ms: int = 1000,
+        warmup_frames: int = 10,
+        idle_timeout_s: float = 30.0,
+    ) -> None:
+        self.settings: Dict[str, Any] = {
+            "source": source,
+            "width": width,
+            "mjpeg": mjpeg,
+            "passthrough": passthrough,
+            "low_latency": low_latency,
+        }
+        self.reconnect_max_backoff_s = reconnect_max_backoff_s
+        self.decimate = decimate
+        self.min_decode_fps = min_decode_fps
+        self.warmup_ms = warmup_ms
+        self.warmup_frames = warmup_frames
+        self.idle_timeout_s = idle_timeout_s
+        self._camera: Optional[VideoCapture] = None
+        self._grabber: Optional[FrameGrabber] = None
+        self._opened_at = 0.0
+        self._users = 0
+        self._last_release = 0.0
+        self._lock = threading.RLock()
+        self._watchdog: Optional[threading.Thread] = None
+        self._power_ups = 0
+
+    @property
+    def is_open(self) -> bool:
+        return self._grabber is not None
+
+    @property
+    def in_use(self) -> bool:
+        """True while any user (segment, pre-roll ring, capture) holds the camera."""
+        return self._users > 0
+
+    @property
+    def passthrough(self) -> bool:
+        return bool(self._camera and self._camera.passthrough)
+
+    def fps(self) -> float:
+        return self._camera.fps() if self._camera else 30.0
+
+    def warm(self) -> FrameGrabber:
+        """Open the camera (if needed) and start grabbing; does not wait for exposure."""
+        with self._lock:
+            if self._grabber is None or not self._grabber.is_alive():
+                started = time.perf_counter()
+                self._camera = VideoCapture(**self.settings)
+                self._camera.start()
+                low_latency = self._camera.low_latency
+                self._grabber = FrameGrabber(
+                    self._camera,
+                    low_latency=low_latency,
+                    reconnect_after=self.RECONNECT_AFTER_FAILURES if low_latency else 0,
+                    max_backoff_s=self.reconnect_max_backoff_s,
+                    decimate=self.decimate,
+                    min_decode_fps=self.min_decode_fps,
+                )
+                self._grabber.start()
+                self._opened_at = time.monotonic()
+                self._power_ups += 1
+                width, height = self._camera.frame_size()
+                logger.info(
+                    f"[CAMERA] opened {self.settings['source']} at {width}x{height} "
+                    f"in {(time.perf_counter() - started) * 1000:.0f}ms (power-up #{self._power_ups})"
+                )
+                self._ensure_watchdog()
+            self._last_release = time.monotonic()
+            return self._grabber
+
+    def wait_until_warm(self, timeout: float = 5.0) -> Optional[GrabbedFrame]:
+        """Block until exposure has settled and return the latest frame."""
+        grabber = self.warm()
+        deadline = time.monotonic() + timeout
+        while True:
+            settled_at = self._opened_at + self.warmup_ms / 1000.0
+            warm = grabber.frame_count >= self.warmup_frames and time.monotonic() >= settled_at
+            if warm or time.monotonic() >= deadline:
+                return grabber.wait_for_frame(timeout=max(0.0, deadline - time.monotonic()))
+            time.sleep(0.02)
+
+    @property
+    def grabber(self) -> Optional[FrameGrabber]:
+        return self._grabber
+
+    def acquire(self) -> FrameGrabber:
+        """Register a long-lived user (keeps the camera from idling out)."""
+        with self._lock:
+            self._users += 1
+            return self.warm()
+
+    def release(self) -> None:
+        with self._lock:
+            self._users = max(0, self._users - 1)
+            self._last_release = time.monotonic()
+            if self._users == 0 and self.idle_timeout_s <= 0:
+                self._power_down()
+
+    @contextmanager
+    def session(self, wait_warm: bool = True, timeout: float = 5.0) -> Iterator[FrameGrabber]:
+        """Use the warmed grabber for the duration of the ``with`` block."""
+        grabber = self.acquire()
+        try:
+            if wait_warm:
+                self.wait_until_warm(timeout)
+            yield grabber
+        finally:
+            self.release()
+
+    def capture(self, timeout: float = 5.0) -> Optional[GrabbedFrame]:
+        """Return a settled frame newer than the moment of the call."""
+        with self.session(timeout=timeout) as grabber:
+            latest = grabber.latest()
+            return grabber.wait_for_frame(timeout=timeout, after_seq=latest.seq if latest else -1)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._power_down()
+
+    def _power_down(self) -> None:
+        if self._grabber is not None:
+            self._grabber.stop(timeout=2.0)
+            self._grabber = None
+        if self._camera is not None:
+            self._camera.release()
+            self._camera = None
+            logger.info(f"[CAMERA] powered down {self.settings['source']}")
+
+    def _ensure_watchdog(self) -> None:
+        if self.idle_timeout_s <= 0 or (self._watchdog and self._watchdog.is_alive()):
+            return
+        self._watchdog = threading.Thread(target=self._idle_watchdog, name="camera-idle", daemon=True)
+        self._watchdog.start()
+
+    def _idle_watchdog(self) -> None:
+        interval = min(1.0, max(0.1, self.idle_timeout_s / 4))
+        while True:
+            time.sleep(interval)
+            with self._lock:
+                if self._grabber is None:
+                    return
+                if self._users == 0 and time.monotonic() - self._last_release >= self.idle_timeout_s:
+                    self._power_down()
+                    return
+
+
+_MANAGER: Optional[CameraManager] = None
+_MANAGER_LOCK = threading.Lock()
+
+
+def get_camera_manager(
+    source: Optional[Union[int, str]] = None, width: Optional[int] = None, **options: Any
+) -> CameraManager:
+    """Return the shared camera manager, recreating it if the device settings changed.
+
+    ``source=None`` returns the current manager whatever its source (camera 0
+    if there is none yet), and ``width=None`` reuses an existing manager for
+    the same source at whatever width it was opened with, so ad-hoc captures
+    do not reopen the device.
+
+    Raises:
+        RuntimeError: The settings differ from the shared manager's and it is
+            in use; it is never powered down under a segment or pre-roll ring.
+    """
+    global _MANAGER
+    if isinstance(source, str) and source.isdigit():
+        source = int(source)
+    with _MANAGER_LOCK:
+        if source is None:
+            if _MANAGER is not None and not options and width is None:
+                return _MANAGER
+            source = _MANAGER.settings["source"] if _MANAGER is not None else 0
+        if _MANAGER is not None and _MANAGER.settings["source"] == source:
+            if width is None and not options:
+                return _MANAGER
+            candidate = CameraManager(source, width, **options)
+            if candidate.settings == _MANAGER.settings:
+                _MANAGER.warmup_ms = candidate.warmup_ms
+                _MANAGER.warmup_frames = candidate.warmup_frames
+                _MANAGER.idle_timeout_s = candidate.idle_timeout_s
+                _MANAGER.reconnect_max_backoff_s = candidate.reconnect_max_backoff_s
+                _MANAGER.decimate = candidate.decimate
+                _MANAGER.min_decode_fps = candidate.min_decode_fps
+                if _MANAGER.grabber is not None:
+                    _MANAGER.grabber.decimate = candidate.decimate
+                    _MANAGER.grabber.min_decode_fps = candidate.min_decode_fps
+                return _MANAGER
+        else:
+            candidate = CameraManager(source, width, **options)
+        if _MANAGER is not None:
+            with _MANAGER._lock:
+                if _MANAGER.in_use:
+                    raise RuntimeError(
+                        f"Camera {_MANAGER.settings['source']} is in use; "
+                        f"not reopening it with different settings ({source})"
+                    )
+                _MANAGER.shutdown()
+        _MANAGER = candidate
+        return _MANAGER
+
+
+def camera_manager_for_config(config) -> CameraManager:
+    """Shared camera manager configured from :class:`AppConfig`."""
+    return get_camera_manager(
+        config.camera_source,
+        config.video_width_px,
+        mjpeg=config.camera_mjpeg,
+        passthrough=config.camera_mjpeg and config.save_segment_video,
+        low_latency=config.camera_low_latency,
+        reconnect_max_backoff_s=config.camera_reconnect_max_backoff_s,
+        decimate=config.camera_decimate,
+        min_decode_fps=config.camera_min_decode_fps,
+        warmup_ms=config.camera_warmup_ms,
+        warmup_frames=config.camera_warmup_frames,
+        idle_timeout_s=config.camera_idle_timeout_s,
+    )
+
+
+@atexit.register
+def _shutdown_manager() -> None:
+    if _MANAGER is not None:
+        _MANAGER.shutdown()
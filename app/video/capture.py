@@ -1,35 +1,156 @@
 from __future__ import annotations
 
-from typing import Optional, Union
+import os
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple, Union
 
 import cv2
 
+# FFmpeg demuxer options for low-latency network streams: no input buffering,
+# TCP interleaving (no reordering waits on lossy links), short probe.
+LOW_LATENCY_FFMPEG_OPTIONS = "rtsp_transport;tcp|fflags;nobuffer|flags;low_delay|max_delay;0|probesize;32768"
+NETWORK_TIMEOUT_MS = 5000
+FFMPEG_OPTIONS_ENV = "OPENCV_FFMPEG_CAPTURE_OPTIONS"
+
+# Serializes opens that temporarily set FFMPEG_OPTIONS_ENV.
+_ENV_LOCK = threading.Lock()
+
+
+@contextmanager
+def _ffmpeg_capture_options(options: str) -> Iterator[None]:
+    """Set FFmpeg capture options for one open, then restore the environment.
+
+    OpenCV only reads FFmpeg demuxer options from the process environment at
+    open time (open params cover timeouts, not demuxer flags). Options the
+    user set explicitly are left alone.
+    """
+    with _ENV_LOCK:
+        if FFMPEG_OPTIONS_ENV in os.environ:
+            yield
+            return
+        os.environ[FFMPEG_OPTIONS_ENV] = options
+        try:
+            yield
+        finally:
+            os.environ.pop(FFMPEG_OPTIONS_ENV, None)
+
+
+def is_encoded_frame(frame) -> bool:
+    """True if ``frame`` is a still-compressed buffer (1-D / 1xN) rather than a BGR image."""
+    return frame is not None and (frame.ndim == 1 or (frame.ndim == 2 and frame.shape[0] == 1))
+
 
 class VideoCapture:
-    """Wrapper over OpenCV VideoCapture supporting USB and RTSP sources."""
+    """Wrapper over OpenCV VideoCapture supporting USB and RTSP sources.
+
+    Args:
+        source: Camera index or stream URL
+        width: Requested capture width
+        mjpeg: Ask the camera for MJPEG (``CAP_PROP_FOURCC``)
+        passthrough: With ``mjpeg``, disable OpenCV's RGB conversion so
+            ``read`` returns the camera's JPEG bytes undecoded (V4L2 backends)
+        low_latency: For network streams, open through FFmpeg with input
+            buffering disabled, a one-frame capture buffer and read timeouts,
+            so ``read`` returns the newest frame instead of a queued one
+    """
 
-    def __init__(self, source: Union[int, str] = 0, width: Optional[int] = None) -> None:
+    def __init__(
+        self,
+        source: Union[int, str] = 0,
+        width: Optional[int] = None,
+        mjpeg: bool = False,
+        passthrough: bool = False,
+        low_latency: bool = False,
+    ) -> None:
         if isinstance(source, str) and source.isdigit():
             self.source: Union[int, str] = int(source)
         else:
             self.source = source
         self.width = width
+        self.mjpeg = mjpeg
+        self.passthrough = mjpeg and passthrough
+        self.low_latency = low_latency and self.is_network
         self._capture: Optional[cv2.VideoCapture] = None
 
+    @property
+    def is_network(self) -> bool:
+        return isinstance(self.source, str) and "://" in self.source
+
     def start(self) -> None:
         if self._capture:
             return
-        self._capture = cv2.VideoCapture(self.source)
+        self._capture = self._open_low_latency() if self.low_latency else cv2.VideoCapture(self.source)
         if not self._capture.isOpened():
+            self._capture = None
             raise RuntimeError(f"Failed to open video source: {self.source}")
+        if self.low_latency:
+            self._capture.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        if self.mjpeg:
+            self._capture.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*"MJPG"))
+            if self.passthrough:
+                self._capture.set(cv2.CAP_PROP_CONVERT_RGB, 0)
         if self.width:
-            self._capture.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+            self._set_resolution(self.width)
+
+    def _set_resolution(self, width: int) -> None:
+        """Ask the device for ``width`` at its native aspect ratio (many drivers
+        ignore a width without a matching height), so frames arrive at the size
+        vision uses instead of being downscaled after decode."""
+        native_w = self._capture.get(cv2.CAP_PROP_FRAME_WIDTH)
+        native_h = self._capture.get(cv2.CAP_PROP_FRAME_HEIGHT)
+        self._capture.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if native_w and native_h and native_w != width:
+            height = int(round(width * native_h / native_w / 2.0)) * 2
+            self._capture.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+    def _open_low_latency(self) -> cv2.VideoCapture:
+        params: List[int] = []
+        for name in ("CAP_PROP_OPEN_TIMEOUT_MSEC", "CAP_PROP_READ_TIMEOUT_MSEC"):
+            prop = getattr(cv2, name, None)  # OpenCV >= 4.5.2
+            if prop is not None:
+                params += [prop, NETWORK_TIMEOUT_MS]
+        # Scoped to this open so later (e.g. USB or file) captures are unaffected
+        with _ffmpeg_capture_options(LOW_LATENCY_FFMPEG_OPTIONS):
+            if params:
+                return cv2.VideoCapture(self.source, cv2.CAP_FFMPEG, params)
+            return cv2.VideoCapture(self.source, cv2.CAP_FFMPEG)
+
+    def reconnect(self) -> None:
+        """Close and reopen the source (e.g. after a dropped network stream)."""
+        self.release()
+        self.start()
+
+    def position_ms(self) -> float:
+        """Stream timestamp of the last frame read (0 if the backend does not report it)."""
+        if not self._capture:
+            return 0.0
+        value = self._capture.get(cv2.CAP_PROP_POS_MSEC)
+        return value if value == value else 0.0
 
     def read(self):
         if not self._capture:
             raise RuntimeError("VideoCapture not started")
         return self._capture.read()
 
+    def grab(self) -> bool:
+        """Advance to the next frame without converting it (cheap; see :meth:`retrieve`)."""
+        if not self._capture:
+            raise RuntimeError("VideoCapture not started")
+        return self._capture.grab()
+
+    def retrieve(self):
+        """Decode the frame from the last :meth:`grab` (``read`` = ``grab`` + ``retrieve``)."""
+        if not self._capture:
+            raise RuntimeError("VideoCapture not started")
+        return self._capture.retrieve()
+
+    def frame_size(self) -> Tuple[int, int]:
+        """Actual ``(width, height)`` the device delivers."""
+        if not self._capture:
+            raise RuntimeError("VideoCapture not started")
+        return int(self._capture.get(cv2.CAP_PROP_FRAME_WIDTH)), int(self._capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
     def fps(self) -> float:
         if not self._capture:
             raise RuntimeError("VideoCapture not started")
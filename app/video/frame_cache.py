@@ -0,0 +1,151 @@
+"""Cross-turn cache of encoded vision frames keyed by perceptual hash.
+
+In a multi-turn exchange ("what is this?" ... "and how much does it cost?")
+the camera usually shows the same thing each turn. :class:`EncodedFrameCache`
+remembers the base64 JPEG produced for a crop of a frame, so a later frame
+whose crop hashes (almost) the same is sent without encoding again.
+
+A close dHash only says the two crops look alike at 9x8 pixels. Two price
+labels that differ in one digit hash the same, so the hash only finds
+candidates. An entry is reused only when a grayscale copy of the resized
+crop matches too: no 8x8 block may differ by more than ``block_tolerance``
+grey levels on average. Entries are evicted least-recently-used first once
+the stored base64 plus these copies exceed ``max_bytes``.
+"""
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+from .keyframes import hamming
+
+CacheKey = Tuple[int, Hashable]
+CacheEntry = Tuple[str, int, Optional[np.ndarray]]
+
+BLOCK = 8
+
+
+def pixels_match(a: Optional[np.ndarray], b: Optional[np.ndarray], tolerance: float) -> bool:
+    """True when two grayscale images agree block by block (8x8 mean abs difference)."""
+    if a is None or b is None:
+        return a is None and b is None
+    if a.shape != b.shape:
+        return False
+    height, width = (a.shape[0] // BLOCK) * BLOCK, (a.shape[1] // BLOCK) * BLOCK
+    diff = np.abs(a.astype(np.int16) - b.astype(np.int16))
+    if height == 0 or width == 0:
+        return float(diff.max(initial=0)) <= tolerance
+    blocks = diff[:height, :width].reshape(height // BLOCK, BLOCK, width // BLOCK, BLOCK).mean(axis=(1, 3))
+    # Edge strips narrower than a block are compared per pixel.
+    edges = [diff[height:, :], diff[:, width:]]
+    edge_max = max((float(edge.max()) for edge in edges if edge.size), default=0.0)
+    return float(blocks.max()) <= tolerance and edge_max <= 2 * tolerance
+
+
+class EncodedFrameCache:
+    """Byte-bounded LRU of ``(phash, params) -> (base64 JPEG, JPEG size)``.
+
+    Args:
+        max_bytes: Upper bound on stored base64 characters plus check pixels
+        match_bits: dHash distance (of 64) at which a frame is a candidate
+        block_tolerance: Largest 8x8-block mean grey-level difference still
+            treated as the same crop
+    """
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024, match_bits: int = 4, block_tolerance: float = 12.0) -> None:
+        self.max_bytes = max_bytes
+        self.match_bits = match_bits
+        self.block_tolerance = block_tolerance
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, phash: int, params: Hashable, pixels: Optional[np.ndarray] = None) -> Optional[Tuple[str, int]]:
+        """Return ``(b64, jpeg_bytes)`` for an identical-looking crop encoded with ``params``.
+
+        ``pixels`` is the grayscale resized crop; it must match the stored copy.
+        """
+        with self._lock:
+            candidates = [(phash, params)] if (phash, params) in self._entries else []
+            candidates += [
+                cached
+                for cached in reversed(self._entries)
+                if cached[1] == params and cached[0] != phash and hamming(cached[0], phash) <= self.match_bits
+            ]
+            key = next(
+                (cached for cached in candidates if pixels_match(self._entries[cached][2], pixels, self.block_tolerance)),
+                None,
+            )
+            if key is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            b64, jpeg_bytes, _ = self._entries[key]
+            return b64, jpeg_bytes
+
+    def put(
+        self, phash: int, params: Hashable, b64: str, jpeg_bytes: int, pixels: Optional[np.ndarray] = None
+    ) -> None:
+        size = len(b64) + (pixels.nbytes if pixels is not None else 0)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            key = (phash, params)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= self._entry_bytes(previous)
+            self._entries[key] = (b64, jpeg_bytes, pixels)
+            self._bytes += size
+            self._evict()
+
+    def resize(self, max_bytes: int, match_bits: int) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            self.match_bits = match_bits
+            self._evict()
+
+    def _evict(self) -> None:
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= self._entry_bytes(evicted)
+
+    @staticmethod
+    def _entry_bytes(entry: CacheEntry) -> int:
+        b64, _, pixels = entry
+        return len(b64) + (pixels.nbytes if pixels is not None else 0)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "bytes": self._bytes, "hits": self._hits, "misses": self._misses}
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+_CACHE: Optional[EncodedFrameCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_frame_cache(max_bytes: int, match_bits: int = 4) -> EncodedFrameCache:
+    """Return the shared cache, resizing it in place if the limits changed."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = EncodedFrameCache(max_bytes, match_bits)
+        elif (_CACHE.max_bytes, _CACHE.match_bits) != (max_bytes, match_bits):
+            _CACHE.resize(max_bytes, match_bits)
+        return _CACHE
@@ -0,0 +1,189 @@
+"""In-memory candidate frames collected while a segment is recording."""
+from __future__ import annotations
+
+import threading
+from typing import Iterable, Iterator, List, Optional, Sequence, Union, overload
+
+import cv2
+import numpy as np
+
+from .grabber import GrabbedFrame
+from .keyframes import hamming, perceptual_hash, sharpness
+from .writer import _downscale_frame
+
+
+def _frame_bytes(grabbed: GrabbedFrame) -> int:
+    return len(grabbed.jpeg) if grabbed.jpeg is not None else int(grabbed.frame.nbytes)
+
+
+class CandidateFrameBuffer:
+    """Bounded, timestamped set of downscaled frames sampled during capture.
+
+    Frames are accepted at ``sample_fps``. When more than ``max_candidates``
+    have been kept (or they exceed ``max_bytes``) the set is thinned to every
+    other frame and the sampling interval doubles, so the buffer always spans
+    the whole segment with bounded memory and vision frames are available as
+    soon as recording stops.
+
+    With ``jpeg_quality`` set, frames are held as JPEG bytes (a tenth of the
+    raw size or less) and only decoded when read through a :class:`FrameStore`.
+    With ``dedupe_bits`` set, a frame whose perceptual hash is within that
+    distance of the last kept frame is a repeat, so a steady view costs one
+    slot. Blur barely moves the hash, so a sharper repeat replaces the kept
+    frame instead of being skipped.
+
+    Args:
+        sample_fps: Initial candidate sampling rate
+        max_candidates: Maximum frames held at once
+        max_width: Frames wider than this are downscaled on arrival
+        jpeg_quality: Store frames JPEG-compressed at this quality (None keeps arrays)
+        max_bytes: Cap on stored frame bytes (0 = count cap only)
+        dedupe_bits: Perceptual-hash distance treated as a repeat (0 keeps every sample)
+    """
+
+    def __init__(
+        self,
+        sample_fps: float,
+        max_candidates: int,
+        max_width: int,
+        *,
+        jpeg_quality: Optional[int] = None,
+        max_bytes: int = 0,
+        dedupe_bits: int = 0,
+    ) -> None:
+        self.max_candidates = max(2, max_candidates)
+        self.max_width = max_width
+        self.max_bytes = max_bytes
+        self.dedupe_bits = dedupe_bits
+        self._encode_params = None if jpeg_quality is None else [int(cv2.IMWRITE_JPEG_QUALITY), int(jpeg_quality)]
+        self._interval_s = 1.0 / sample_fps if sample_fps > 0 else 0.0
+        self._frames: List[GrabbedFrame] = []
+        self._last_kept_at: float = float("-inf")
+        self._last_hash: Optional[int] = None
+        self._last_sharpness = 0.0
+        self._last_stored: Optional[GrabbedFrame] = None
+        self._bytes = 0
+        self.high_water_bytes = 0
+        self.duplicates_skipped = 0
+        self.duplicates_replaced = 0
+        self._lock = threading.Lock()
+
+    def offer(self, grabbed: GrabbedFrame) -> bool:
+        """Keep ``grabbed`` if the sampling interval has elapsed; return True if kept.
+
+        A sharper repeat of the last kept frame takes its place (and returns True).
+        """
+        with self._lock:
+            if grabbed.timestamp - self._last_kept_at < self._interval_s:
+                return False
+            self._last_kept_at = grabbed.timestamp
+
+        # Downscale, hash and encode outside the lock (this runs on the grabber thread).
+        small = _downscale_frame(grabbed.frame, self.max_width)
+        repeat = False
+        if self.dedupe_bits > 0:
+            phash = perceptual_hash(small)
+            focus = sharpness(small)
+            repeat = self._last_hash is not None and hamming(phash, self._last_hash) <= self.dedupe_bits
+            if repeat and focus <= self._last_sharpness:
+                self.duplicates_skipped += 1
+                return False
+            if not repeat:
+                self._last_hash = phash
+            self._last_sharpness = focus
+        if self._encode_params is not None:
+            ok, encoded = cv2.imencode(".jpg", small, self._encode_params)
+            if not ok:
+                return False
+            stored = GrabbedFrame(jpeg=encoded.tobytes(), seq=grabbed.seq, timestamp=grabbed.timestamp)
+        else:
+            stored = GrabbedFrame(frame=small, seq=grabbed.seq, timestamp=grabbed.timestamp)
+
+        with self._lock:
+            if repeat:
+                self.duplicates_skipped += 1
+                if not self._frames or self._frames[-1] is not self._last_stored:
+                    return False  # the frame it repeats was thinned out
+                self._bytes -= _frame_bytes(self._frames[-1])
+                self._frames[-1] = stored
+                self.duplicates_replaced += 1
+            else:
+                self._frames.append(stored)
+            self._last_stored = stored
+            self._bytes += _frame_bytes(stored)
+            self.high_water_bytes = max(self.high_water_bytes, self._bytes)
+            while len(self._frames) > self.max_candidates or (
+                self.max_bytes > 0 and self._bytes > self.max_bytes and len(self._frames) > 2
+            ):
+                self._frames = self._frames[::2]
+                self._bytes = sum(_frame_bytes(f) for f in self._frames)
+                self._interval_s *= 2
+            return True
+
+    def candidates(self) -> List[GrabbedFrame]:
+        with self._lock:
+            return list(self._frames)
+
+    def select(self, max_images: int) -> List[GrabbedFrame]:
+        """Return up to ``max_images`` candidates evenly spaced over the segment."""
+        frames = self.candidates()
+        if max_images <= 0 or not frames:
+            return []
+        if len(frames) <= max_images:
+            return frames
+        if max_images == 1:
+            return [frames[len(frames) // 2]]
+        step = (len(frames) - 1) / (max_images - 1)
+        return [frames[round(i * step)] for i in range(max_images)]
+
+    @property
+    def memory_bytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+
+class FrameStore(Sequence[np.ndarray]):
+    """Read-only list of frames that keeps JPEG-held frames compressed.
+
+    Indexing decodes a JPEG-held frame each time and does not keep the array,
+    so a :class:`SegmentResult` kept until the next turn holds only the
+    compressed bytes. Frames that were never compressed are returned as is.
+    """
+
+    def __init__(self, frames: Iterable[GrabbedFrame] = ()) -> None:
+        self._items: List[Union[bytes, np.ndarray]] = [
+            f.jpeg if f.jpeg is not None else f.frame for f in frames
+        ]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(item) if isinstance(item, bytes) else int(item.nbytes) for item in self._items)
+
+    @staticmethod
+    def _materialize(item: Union[bytes, np.ndarray]) -> np.ndarray:
+        if isinstance(item, bytes):
+            return cv2.imdecode(np.frombuffer(item, dtype=np.uint8), cv2.IMREAD_COLOR)
+        return item
+
+    @overload
+    def __getitem__(self, index: int) -> np.ndarray: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[np.ndarray]: ...
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._materialize(item) for item in self._items[index]]
+        return self._materialize(self._items[index])
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for item in self._items:
+            yield self._materialize(item)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        return f"FrameStore({len(self._items)} frames, {self.nbytes} bytes)"
@@ -0,0 +1,339 @@
+"""Background camera grabber decoupled from the audio loop.
+
+``cv2.VideoCapture.read`` blocks until the next camera frame (~33 ms at
+30 fps), which is longer than an audio chunk. :class:`FrameGrabber` owns the
+camera on its own thread and keeps only the most recent frame plus capture
+timestamps, so audio code can look at video without ever waiting on it.
+
+Network cameras add their own lag: OpenCV/FFmpeg queue frames, and a
+listener slower than the stream lets that queue grow. Low-latency mode (see
+:class:`FrameGrabber`) keeps the read loop draining the stream, runs listeners
+only on the newest frame and reconnects dropped streams.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from app.util.log import logger
+
+from .capture import VideoCapture, is_encoded_frame
+
+
+class GrabbedFrame:
+    """A camera frame with its capture sequence number and monotonic timestamp.
+
+    Frames grabbed in MJPEG passthrough mode carry only ``jpeg``; ``frame`` is
+    decoded on first access, so frames nobody looks at are never decoded.
+    """
+
+    __slots__ = ("_frame", "jpeg", "seq", "timestamp")
+
+    def __init__(
+        self,
+        frame: Optional[np.ndarray] = None,
+        seq: int = 0,
+        timestamp: float = 0.0,
+        jpeg: Optional[bytes] = None,
+    ) -> None:
+        if frame is None and jpeg is None:
+            raise ValueError("GrabbedFrame needs a frame or JPEG bytes")
+        self._frame = frame
+        self.jpeg = jpeg
+        self.seq = seq
+        self.timestamp = timestamp
+
+    @classmethod
+    def from_capture(cls, raw: np.ndarray, seq: int, timestamp: float) -> "GrabbedFrame":
+        """Wrap a ``VideoCapture.read`` result (decoded BGR or passthrough JPEG)."""
+        if is_encoded_frame(raw):
+            return cls(jpeg=raw.tobytes(), seq=seq, timestamp=timestamp)
+        return cls(frame=raw, seq=seq, timestamp=timestamp)
+
+    @property
+    def frame(self) -> np.ndarray:
+        if self._frame is None:
+            self._frame = cv2.imdecode(np.frombuffer(self.jpeg, dtype=np.uint8), cv2.IMREAD_COLOR)
+        return self._frame
+
+
+class FrameGrabber(threading.Thread):
+    """Continuously read ``camera`` and publish the latest frame.
+
+    In ``low_latency`` mode (network cameras) the read loop never waits on
+    listeners: frames are handed to a dispatcher thread that only ever runs
+    the newest one, so slow listeners cannot let the stream back up. After
+    ``reconnect_after`` consecutive read failures the source is reopened with
+    exponential backoff up to ``max_backoff_s``.
+
+    The age of frames when they are consumed (``latest``, ``wait_for_frame``
+    and listener calls) is tracked and reported by :meth:`stats`.
+
+    With ``decimate``, every frame is ``grab()``-ed (keeping the device
+    queue drained and timestamps exact) but only ``retrieve()``-d (decoded)
+    when something needs it: a listener registered without ``fps`` (e.g. the
+    MP4 writer), the fastest rate-limited listener being due, a
+    ``wait_for_frame`` caller, or ``min_decode_fps`` to keep :meth:`latest`
+    reasonably fresh. While only 2 fps samplers listen, decode CPU drops by
+    the same factor.
+
+    Args:
+        camera: Started :class:`VideoCapture`
+        on_frame: Optional callbacks run for every frame (on the grabber
+            thread, or the dispatcher in low-latency mode); e.g. an MP4
+            writer; they must not block for long
+        decimate: Skip decoding frames no listener needs
+        min_decode_fps: Decode rate kept up for :meth:`latest` when decimating
+        low_latency: Decouple listeners and reconnect dropped streams
+        reconnect_after: Consecutive read failures before reopening (0 = never)
+        max_backoff_s: Longest wait between reconnect attempts
+    """
+
+    AGE_WINDOW = 256
+
+    def __init__(
+        self,
+        camera: VideoCapture,
+        on_frame: Optional[List[Callable[[GrabbedFrame], None]]] = None,
+        *,
+        low_latency: bool = False,
+        reconnect_after: int = 0,
+        max_backoff_s: float = 8.0,
+        decimate: bool = False,
+        min_decode_fps: float = 2.0,
+    ) -> None:
+        super().__init__(daemon=True, name="camera-grabber")
+        self._camera = camera
+        # (callback, fps) pairs; fps None = wants every frame
+        self._on_frame: List[Tuple[Callable[[GrabbedFrame], None], Optional[float]]] = [
+            (callback, None) for callback in on_frame or []
+        ]
+        self.decimate = decimate
+        self.min_decode_fps = min_decode_fps
+        self._decoded = 0
+        self._last_decoded_at = float("-inf")
+        self._decode_requested = False
+        self.low_latency = low_latency
+        self.reconnect_after = reconnect_after
+        self.max_backoff_s = max_backoff_s
+        self._stop_event = threading.Event()
+        self._cond = threading.Condition()
+        self._latest: Optional[GrabbedFrame] = None
+        self._seq = 0
+        self._failures = 0
+        self._reconnects = 0
+        self._skipped_dispatch = 0
+        self._ages: Deque[float] = deque(maxlen=self.AGE_WINDOW)
+        self._stream_lag_s = 0.0
+        self._stream_origin: Optional[Tuple[float, float]] = None
+        self._pending: Optional[GrabbedFrame] = None
+        self._dispatch_cond = threading.Condition()
+        self._dispatcher: Optional[threading.Thread] = None
+        self._started_at: Optional[float] = None
+        self._stopped_at: Optional[float] = None
+
+    def add_listener(self, callback: Callable[[GrabbedFrame], None], fps: Optional[float] = None) -> None:
+        """Run ``callback`` for decoded frames; ``fps`` is the most it needs (None = every frame)."""
+        # Replace rather than mutate so the grabber thread iterates a stable list.
+        self._on_frame = [*self._on_frame, (callback, fps)]
+
+    def remove_listener(self, callback: Callable[[GrabbedFrame], None]) -> None:
+        self._on_frame = [(cb, fps) for cb, fps in self._on_frame if cb != callback]
+
+    @property
+    def frame_count(self) -> int:
+        """Frames pulled from the camera (decoded or not)."""
+        return self._seq
+
+    @property
+    def decoded_count(self) -> int:
+        return self._decoded
+
+    @property
+    def failure_count(self) -> int:
+        return self._failures
+
+    @property
+    def reconnect_count(self) -> int:
+        return self._reconnects
+
+    def run(self) -> None:
+        self._started_at = time.monotonic()
+        if self.low_latency:
+            self._dispatcher = threading.Thread(target=self._dispatch_loop, name="camera-dispatch", daemon=True)
+            self._dispatcher.start()
+        consecutive_failures = 0
+        try:
+            while not self._stop_event.is_set():
+                ok = self._camera.grab()
+                timestamp = time.monotonic()
+                frame = None
+                if ok:
+                    seq = self._seq
+                    self._seq += 1
+                    if not self._decode_due(timestamp):
+                        consecutive_failures = 0
+                        continue
+                    ok, frame = self._camera.retrieve()
+                if not ok or frame is None:
+                    self._failures += 1
+                    consecutive_failures += 1
+                    if self.reconnect_after and consecutive_failures >= self.reconnect_after:
+                        self._reconnect()
+                        consecutive_failures = 0
+                    else:
+                        time.sleep(0.01)
+                    continue
+                consecutive_failures = 0
+                self._decoded += 1
+                self._last_decoded_at = timestamp
+                self._decode_requested = False
+                grabbed = GrabbedFrame.from_capture(frame, seq=seq, timestamp=timestamp)
+                if self.low_latency:
+                    self._track_stream_lag(grabbed.timestamp)
+                with self._cond:
+                    self._latest = grabbed
+                    self._cond.notify_all()
+                if self.low_latency:
+                    with self._dispatch_cond:
+                        if self._pending is not None:
+                            self._skipped_dispatch += 1
+                        self._pending = grabbed
+                        self._dispatch_cond.notify()
+                else:
+                    self._dispatch(grabbed)
+        finally:
+            self._stopped_at = time.monotonic()
+            with self._dispatch_cond:
+                self._dispatch_cond.notify_all()
+
+    def _decode_due(self, timestamp: float) -> bool:
+        if not self.decimate or self._decode_requested:
+            return True
+        rates = [fps for _, fps in self._on_frame]
+        if any(fps is None or fps <= 0 for fps in rates):
+            return True
+        fps = max([self.min_decode_fps, *rates])
+        return fps > 0 and timestamp - self._last_decoded_at >= 1.0 / fps
+
+    def _dispatch(self, grabbed: GrabbedFrame) -> None:
+        listeners = self._on_frame
+        if not listeners:
+            return
+        self._record_age(grabbed)
+        for callback, _ in listeners:
+            try:
+                callback(grabbed)
+            except Exception as exc:  # pragma: no cover - keep grabbing
+                logger.warning(f"[GRABBER] frame callback failed: {exc}")
+
+    def _dispatch_loop(self) -> None:
+        """Run listeners on the newest frame only (low-latency mode)."""
+        while True:
+            with self._dispatch_cond:
+                while self._pending is None and not self._stop_event.is_set():
+                    self._dispatch_cond.wait(0.5)
+                if self._pending is None:
+                    return
+                grabbed, self._pending = self._pending, None
+            self._dispatch(grabbed)
+
+    def _reconnect(self) -> None:
+        """Reopen the camera with exponential backoff until it works or the grabber stops."""
+        backoff = min(0.5, self.max_backoff_s)
+        while not self._stop_event.is_set():
+            try:
+                self._camera.reconnect()
+            except Exception as exc:
+                logger.warning(f"[GRABBER] reconnect to {self._camera.source} failed ({exc}); retrying in {backoff:.1f}s")
+                self._stop_event.wait(backoff)
+                backoff = min(self.max_backoff_s, backoff * 2)
+                continue
+            self._reconnects += 1
+            self._stream_origin = None
+            logger.info(f"[GRABBER] reconnected to {self._camera.source} (#{self._reconnects})")
+            return
+
+    def _track_stream_lag(self, now: float) -> None:
+        # Wall time elapsed minus stream time elapsed grows when frames queue up
+        # in the demuxer/decoder instead of being read as they arrive.
+        position = self._camera.position_ms() / 1000.0
+        if position <= 0:
+            return
+        if self._stream_origin is None:
+            self._stream_origin = (now, position)
+            return
+        wall0, pos0 = self._stream_origin
+        lag = (now - wall0) - (position - pos0)
+        if lag < 0:  # the first frame was itself late; re-anchor on the fresher one
+            self._stream_origin = (now, position)
+            lag = 0.0
+        self._stream_lag_s = lag
+
+    def _record_age(self, grabbed: Optional[GrabbedFrame]) -> None:
+        if grabbed is not None:
+            self._ages.append(time.monotonic() - grabbed.timestamp)
+
+    def latest(self) -> Optional[GrabbedFrame]:
+        """Return the most recent frame without blocking (None before the first)."""
+        latest = self._latest
+        self._record_age(latest)
+        return latest
+
+    def wait_for_frame(self, timeout: float = 2.0, after_seq: int = -1) -> Optional[GrabbedFrame]:
+        """Block until a frame newer than ``after_seq`` exists (for setup, not the audio loop)."""
+        deadline = time.monotonic() + timeout
+        self._decode_requested = True
+        with self._cond:
+            while self._latest is None or self._latest.seq <= after_seq:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.is_alive():
+                    result = self._latest if self._latest and self._latest.seq > after_seq else None
+                    self._record_age(result)
+                    return result
+                self._cond.wait(remaining)
+            self._record_age(self._latest)
+            return self._latest
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout=timeout)
+        if self._dispatcher is not None and self._dispatcher.is_alive():
+            self._dispatcher.join(timeout=timeout)
+
+    def frame_age_ms(self) -> Dict[str, float]:
+        """Age of frames at consumption (ms since grabbed) over the recent window."""
+        ages = sorted(self._ages)
+        if not ages:
+            return {}
+        return {
+            "samples": len(ages),
+            "p50": round(ages[len(ages) // 2] * 1000.0, 1),
+            "p95": round(ages[min(len(ages) - 1, int(len(ages) * 0.95))] * 1000.0, 1),
+            "max": round(ages[-1] * 1000.0, 1),
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Frames grabbed, read failures, achieved capture rate and frame age."""
+        end = self._stopped_at or time.monotonic()
+        elapsed = end - self._started_at if self._started_at else 0.0
+        stats: Dict[str, Any] = {
+            "frames": self._seq,
+            "failures": self._failures,
+            "elapsed_s": round(elapsed, 3),
+            "fps": round(self._seq / elapsed, 2) if elapsed > 0 else 0.0,
+            "decoded": self._decoded,
+            "decode_ratio": round(self._decoded / self._seq, 3) if self._seq else 0.0,
+            "frame_age_ms": self.frame_age_ms(),
+        }
+        if self.low_latency:
+            stats["reconnects"] = self._reconnects
+            stats["skipped_dispatch"] = self._skipped_dispatch
+            stats["stream_lag_ms"] = round(self._stream_lag_s * 1000.0, 1)
+        return stats
@@ -0,0 +1,165 @@
+"""Sharpness- and motion-aware keyframe selection for VLM requests.
+
+Uniformly spaced frames are often blurry or near-identical, and each image
+adds upload bytes and model tokens. :func:`select_keyframes` scores every
+candidate on a small grayscale copy (Laplacian variance for sharpness, mean
+level and clipping for exposure, difference to its neighbours for motion),
+groups frames that show the same thing by perceptual hash, and returns the
+best frame of the fewest groups needed to cover the segment.
+
+When the transcript says *when* the user pointed at something ("what is
+*this*"), :func:`select_frames_near` picks the frames captured closest to those
+instants instead.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import cv2
+import numpy as np
+
+ANALYSIS_WIDTH = 160
+DEDUPE_BITS = 10  # dHash distance (of 64) under which two frames show the same scene
+
+
+@dataclass
+class FrameQuality:
+    """Cheap per-frame quality measurements."""
+
+    index: int
+    sharpness: float
+    brightness: float
+    clipped: float
+    motion: float
+    phash: int
+
+    @property
+    def exposure(self) -> float:
+        """1.0 for mid-grey, falling towards 0 for dark/blown-out frames."""
+        level = 1.0 - abs(self.brightness - 128.0) / 128.0
+        return max(0.05, level * (1.0 - min(0.9, self.clipped)))
+
+
+def _small_gray(frame: np.ndarray) -> np.ndarray:
+    gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    height, width = gray.shape[:2]
+    if width > ANALYSIS_WIDTH:
+        gray = cv2.resize(gray, (ANALYSIS_WIDTH, max(1, int(height * ANALYSIS_WIDTH / width))), interpolation=cv2.INTER_AREA)
+    return gray
+
+
+def dhash(gray: np.ndarray) -> int:
+    """64-bit difference hash of a grayscale image."""
+    small = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def perceptual_hash(frame: np.ndarray) -> int:
+    """dHash of a BGR or grayscale frame, computed on a small grayscale copy."""
+    return dhash(_small_gray(frame))
+
+
+def sharpness(frame: np.ndarray) -> float:
+    """Laplacian variance of a BGR or grayscale frame, on a small grayscale copy."""
+    return float(cv2.Laplacian(_small_gray(frame), cv2.CV_64F).var())
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def analyze_frames(frames: Sequence[np.ndarray]) -> List[FrameQuality]:
+    """Measure sharpness, exposure, motion and perceptual hash for each frame."""
+    grays = [_small_gray(frame) for frame in frames]
+    qualities: List[FrameQuality] = []
+    for index, gray in enumerate(grays):
+        diffs = []
+        for neighbour in (index - 1, index + 1):
+            if 0 <= neighbour < len(grays) and grays[neighbour].shape == gray.shape:
+                diffs.append(float(cv2.absdiff(gray, grays[neighbour]).mean()))
+        qualities.append(
+            FrameQuality(
+                index=index,
+                sharpness=float(cv2.Laplacian(gray, cv2.CV_64F).var()),
+                brightness=float(gray.mean()),
+                clipped=float(np.count_nonzero((gray <= 5) | (gray >= 250))) / gray.size,
+                motion=min(diffs) if diffs else 0.0,
+                phash=dhash(gray),
+            )
+        )
+    return qualities
+
+
+def _score(quality: FrameQuality, reference_sharpness: float) -> float:
+    sharp = quality.sharpness / reference_sharpness if reference_sharpness > 0 else 1.0
+    # Large differences to both neighbours usually mean camera motion (and blur).
+    steadiness = 1.0 - min(0.5, quality.motion / 64.0)
+    return sharp * quality.exposure * steadiness
+
+
+def select_keyframes(
+    frames: Sequence[np.ndarray],
+    max_count: int,
+    *,
+    dedupe_bits: int = DEDUPE_BITS,
+) -> List[int]:
+    """Return indices (in time order) of the fewest good frames covering ``frames``.
+
+    Args:
+        frames: Candidate frames in capture order
+        max_count: Upper bound on frames returned
+        dedupe_bits: Perceptual-hash distance treated as the same scene
+    """
+    if not frames or max_count <= 0:
+        return []
+    qualities = analyze_frames(frames)
+    reference = float(np.median([q.sharpness for q in qualities])) or 1.0
+
+    # Group frames showing the same scene; a frame joins the closest existing
+    # group (even a non-adjacent one, e.g. looking away and back) if near enough.
+    groups: List[List[FrameQuality]] = []
+    for quality in qualities:
+        best_group = None
+        best_distance = dedupe_bits + 1
+        for group in groups:
+            distance = hamming(quality.phash, group[0].phash)
+            if distance < best_distance:
+                best_group, best_distance = group, distance
+        if best_group is not None and best_distance <= dedupe_bits:
+            best_group.append(quality)
+        else:
+            groups.append([quality])
+
+    # Larger groups cover more of the segment; keep those first.
+    groups.sort(key=lambda g: (len(g), max(_score(q, reference) for q in g)), reverse=True)
+    chosen = [max(group, key=lambda q: _score(q, reference)).index for group in groups[:max_count]]
+    return sorted(chosen)
+
+
+def select_frames_near(
+    timestamps: Sequence[float],
+    instants: Sequence[float],
+    max_count: int = 2,
+) -> List[int]:
+    """Return indices (in time order) of the frames captured closest to ``instants``.
+
+    One frame is chosen per instant (earliest instants first), so a single
+    "what is this" yields one image and "this ... or that" yields two.
+
+    Args:
+        timestamps: Frame capture times, same timebase as ``instants``
+        instants: Times of interest, e.g. from :func:`app.util.intent.trigger_word_times`
+        max_count: Upper bound on frames returned
+    """
+    if not timestamps or not instants or max_count <= 0:
+        return []
+    chosen: List[int] = []
+    for instant in sorted(instants):
+        nearest = min(range(len(timestamps)), key=lambda i: abs(timestamps[i] - instant))
+        if nearest not in chosen:
+            chosen.append(nearest)
+        if len(chosen) >= max_count:
+            break
+    return sorted(chosen)
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
-import os
-import tempfile
+import base64
 import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Deque, Dict, Iterable, Iterator, Optional, Tuple, Union
 
 import cv2
 
@@ -13,111 +14,70 @@ try:
 except ImportError:  # pragma: no cover - numpy required for vision mode
     np = None  # type: ignore[assignment]
 
-try:
-    from PIL import Image
-except ImportError:  # pragma: no cover - pillow required for preprocessing
-    Image = None  # type: ignore[assignment]
-
-from app.ai.prompt import create_vision_message_from_base64
-from .validation import (
-    encode_pil_to_base64,
-    validate_base64_image,
-    validate_image_for_api,
-    validate_numpy_frame,
-)
+from app.util.log import logger
+from .camera import get_camera_manager
+from .utils import frame_to_jpeg
+from .validation import validate_image_path, validate_numpy_frame
 
 
-def capture_image_reliable(camera_index: int = 0, filename: Optional[str] = None):
+def capture_image_reliable(
+    camera_index: Optional[Union[int, str]] = None, filename: Optional[str] = None, timeout: float = 5.0
+):
     """
-    Robust camera capture with warm-up and validation.
+    Robust camera capture from the shared, warmed camera.
+
+    The first call powers the camera up and waits for auto-exposure to settle;
+    later calls (and segment recording) reuse the open device until it has
+    been idle for ``camera_idle_timeout_s``. ``camera_index=None`` uses
+    whichever camera is already shared (camera 0 if none); a different
+    index fails (returns None) while that camera is in use.
 
     Returns:
         Captured frame as numpy array or None if capture failed.
     """
-    cap = cv2.VideoCapture(camera_index)
-    if not cap.isOpened():
+    try:
+        grabbed = get_camera_manager(camera_index).capture(timeout=timeout)
+    except RuntimeError:
+        return None
+    if grabbed is None:
         return None
 
-    try:
-        # Allow auto-exposure to settle
-        time.sleep(2.0)
-        for _ in range(10):
-            cap.read()
-
-        ret, frame = cap.read()
-        if not ret or frame is None or (np is not None and frame.size == 0):
-            return None
-
-        if filename:
-            try:
-                cv2.imwrite(filename, frame)
-            except Exception:
-                # Best-effort save; continue even if writing fails
-                pass
+    frame = grabbed.frame
+    if frame is None or (np is not None and frame.size == 0):
+        return None
 
-        return frame
-    finally:
-        cap.release()
+    if filename:
+        try:
+            cv2.imwrite(filename, frame)
+        except Exception:
+            # Best-effort save; continue even if writing fails
+            pass
 
+    return frame
 
-def preprocess_for_vision_api(
-    image_path: str,
-    max_size: Tuple[int, int] = (1024, 1024),
-    quality: int = 85,
-    image_format: str = "JPEG",
-):
-    """
-    Complete preprocessing pipeline for vision APIs.
 
-    - Opens and verifies the image
-    - Converts to RGB (removing alpha)
-    - Resizes while maintaining aspect ratio
-    - Optimizes for upload
-    """
-    if Image is None:
+def decode_image_bytes(data: bytes) -> Optional["np.ndarray"]:
+    """Decode encoded image bytes once to a BGR frame, flattening alpha onto white."""
+    image = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_UNCHANGED)
+    if image is None:
         return None
-
-    try:
-        image = Image.open(image_path)
-        image.verify()
-
-        image = Image.open(image_path)
-
-        if image.mode in ("RGBA", "LA", "P"):
-            background = Image.new("RGB", image.size, (255, 255, 255))
-            if image.mode == "P":
-                image = image.convert("RGBA")
-            alpha = image.split()[-1] if "A" in image.mode else None
-            background.paste(image, mask=alpha)
-            image = background
-        elif image.mode != "RGB":
-            image = image.convert("RGB")
-
-        image.thumbnail(max_size, Image.LANCZOS)
-
-        # Saving to a temporary buffer ensures optimizations are applied
-        temp_buffer = tempfile.SpooledTemporaryFile()
-        image.save(temp_buffer, format=image_format, quality=quality, optimize=True)
-        temp_buffer.seek(0)
-
-        processed = Image.open(temp_buffer)
-        processed.load()
-        return processed
-    except Exception:
-        return None
-
-
-def _infer_mime_type(image_path: str) -> str:
-    extension = Path(image_path).suffix.lower().lstrip(".")
-    mime_map = {
-        "jpg": "image/jpeg",
-        "jpeg": "image/jpeg",
-        "png": "image/png",
-        "gif": "image/gif",
-        "webp": "image/webp",
-        "bmp": "image/bmp",
-    }
-    return mime_map.get(extension, "image/jpeg")
+    if image.ndim == 2:
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    if image.shape[2] == 4:
+        alpha = image[:, :, 3:4].astype(np.float32) / 255.0
+        flattened = image[:, :, :3].astype(np.float32) * alpha + 255.0 * (1.0 - alpha)
+        return flattened.astype(np.uint8)
+    return image
+
+
+def fit_within(frame: "np.ndarray", max_size: Tuple[int, int]) -> "np.ndarray":
+    """Downscale ``frame`` to fit ``max_size`` (width, height), keeping aspect ratio."""
+    height, width = frame.shape[:2]
+    scale = min(max_size[0] / float(width), max_size[1] / float(height), 1.0)
+    if scale >= 1.0:
+        return frame
+    new_size = (max(1, int(width * scale)), max(1, int(height * scale)))
+    return cv2.resize(frame, new_size, interpolation=cv2.INTER_AREA)
 
 
 class VisionPipeline:
@@ -131,83 +91,202 @@ class VisionPipeline:
     def __init__(self, api_type: str = "openai", prompt: str = "What do you see in this image?") -> None:
         self.api_type = api_type.lower()
         self.prompt = prompt
-
-    def process_image(self, image_path: str, *, mime_type: Optional[str] = None) -> Dict[str, object]:
+        self.batch_stats: Dict[str, float] = {}
+
+    def process_image(
+        self,
+        image: Union[str, Path, bytes, "np.ndarray"],
+        *,
+        mime_type: Optional[str] = None,
+        max_size: Tuple[int, int] = (1024, 1024),
+        quality: int = 85,
+    ) -> Dict[str, object]:
         """
-        Validate and prepare an image from disk for the configured API.
+        Validate and prepare an image for the configured API, entirely in memory.
+
+        ``image`` may be a file path, encoded image bytes, or a BGR frame. Files
+        are read once, bytes are decoded once (skipped for frames), and the
+        result is JPEG-encoded once; validation uses cheap size/header checks
+        around those steps instead of extra decodes.
 
         Returns:
-            Dict containing `messages`, `base64_image`, and metadata about processing.
+            Dict containing `messages`, `base64_image`, and metadata about
+            processing, including per-stage `timings_ms`.
         """
-        validation_ok, validation_msg = validate_image_for_api(image_path)
-        if not validation_ok:
-            return {"success": False, "error": f"Validation failed: {validation_msg}"}
+        if np is None:
+            return {"success": False, "error": "NumPy not installed; required for image processing"}
+
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+        meta: Dict[str, object] = {}
+
+        if isinstance(image, (str, Path)):
+            image_path = str(image)
+            path_ok, path_msg = validate_image_path(image_path)
+            if not path_ok:
+                return {"success": False, "error": f"Validation failed: {path_msg}"}
+            with open(image_path, "rb") as handle:
+                image = handle.read()
+            meta["image_path"] = image_path
+            timings["read"] = (time.perf_counter() - started) * 1000.0
+
+        if isinstance(image, (bytes, bytearray, memoryview)):
+            data = bytes(image)
+            if not data:
+                return {"success": False, "error": "Validation failed: File is empty"}
+            if len(data) > 20 * 1024 * 1024:
+                return {"success": False, "error": "Validation failed: File too large (>20MB)"}
+            stage = time.perf_counter()
+            frame = decode_image_bytes(data)
+            timings["decode"] = (time.perf_counter() - stage) * 1000.0
+            if frame is None:
+                return {"success": False, "error": "Validation failed: Image could not be decoded"}
+            meta["source_bytes"] = len(data)
+        else:
+            frame = image
+
+        frame_valid, frame_msg = validate_numpy_frame(frame)
+        if not frame_valid:
+            return {"success": False, "error": f"Validation failed: {frame_msg}"}
 
-        processed = preprocess_for_vision_api(image_path)
-        if processed is None:
-            return {"success": False, "error": "Preprocessing failed"}
+        stage = time.perf_counter()
+        resized = fit_within(frame, max_size)
+        timings["resize"] = (time.perf_counter() - stage) * 1000.0
 
-        base64_image, success, encode_msg = encode_pil_to_base64(processed)
-        if not success or not base64_image:
-            return {"success": False, "error": f"Encoding failed: {encode_msg}"}
+        stage = time.perf_counter()
+        try:
+            jpeg_bytes = frame_to_jpeg(resized, quality=quality)
+        except RuntimeError as exc:
+            return {"success": False, "error": f"Encoding failed: {exc}"}
+        timings["encode"] = (time.perf_counter() - stage) * 1000.0
 
-        valid_b64, b64_msg = validate_base64_image(base64_image)
-        if not valid_b64:
-            return {"success": False, "error": f"Base64 validation failed: {b64_msg}"}
+        stage = time.perf_counter()
+        base64_image = base64.b64encode(jpeg_bytes).decode("utf-8")
+        timings["base64"] = (time.perf_counter() - stage) * 1000.0
 
-        resolved_mime = mime_type or _infer_mime_type(image_path)
+        # Imported here: app.ai.prompt imports app.video (validation), which
+        # imports this module, so a module-level import is circular.
+        from app.ai.prompt import create_vision_message_from_base64
+
+        resolved_mime = mime_type or "image/jpeg"
         messages = create_vision_message_from_base64(
             self.prompt,
             base64_image,
             mime_type=resolved_mime,
             api_type=self.api_type,
         )
+        timings["total"] = (time.perf_counter() - started) * 1000.0
 
-        width, height = processed.size
-        return {
-            "success": True,
-            "messages": messages,
-            "base64_image": base64_image,
-            "meta": {
-                "image_path": image_path,
+        height, width = resized.shape[:2]
+        meta.update(
+            {
                 "width": width,
                 "height": height,
                 "mime_type": resolved_mime,
                 "base64_chars": len(base64_image),
-            },
+                "jpeg_bytes": len(jpeg_bytes),
+                "timings_ms": {stage_name: round(ms, 2) for stage_name, ms in timings.items()},
+            }
+        )
+        return {
+            "success": True,
+            "messages": messages,
+            "base64_image": base64_image,
+            "meta": meta,
         }
 
-    def capture_and_process(self, camera_index: int = 0) -> Dict[str, object]:
+    def process_images(
+        self,
+        images: Iterable[Union[str, Path, bytes, "np.ndarray"]],
+        *,
+        workers: int = 4,
+        max_pending: Optional[int] = None,
+        **options: object,
+    ) -> Iterator[Dict[str, object]]:
+        """
+        Process many images on a thread pool, yielding results in input order.
+
+        OpenCV releases the GIL while decoding, resizing and encoding, so
+        threads scale without pickling frames to worker processes. At most
+        ``max_pending`` (default ``2 * workers``) images are in flight or
+        waiting to be consumed, so memory stays bounded however long
+        ``images`` is. Throughput so far is kept in :attr:`batch_stats`
+        (``images``, ``failed``, ``elapsed_s``, ``images_per_s``) and logged
+        when the batch finishes.
+
+        Args:
+            images: Paths, encoded bytes or frames (may be a lazy iterator)
+            workers: Worker threads
+            max_pending: Bound on submitted-but-unconsumed images
+            **options: Passed to :meth:`process_image` (e.g. ``max_size``)
+        """
+        workers = max(1, workers)
+        limit = max(workers, max_pending or 2 * workers)
+        started = time.perf_counter()
+        done = failed = 0
+        pending: Deque[Future] = deque()
+
+        def _record(result: Dict[str, object]) -> Dict[str, object]:
+            nonlocal done, failed
+            done += 1
+            failed += 0 if result.get("success") else 1
+            elapsed = time.perf_counter() - started
+            self.batch_stats = {
+                "images": done,
+                "failed": failed,
+                "elapsed_s": round(elapsed, 3),
+                "images_per_s": round(done / elapsed, 2) if elapsed > 0 else 0.0,
+            }
+            return result
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="vision-batch") as pool:
+            for image in images:
+                pending.append(pool.submit(self._process_one, image, options))
+                if len(pending) >= limit:
+                    yield _record(pending.popleft().result())
+            while pending:
+                yield _record(pending.popleft().result())
+
+        logger.info(
+            f"[VISION] batch processed {self.batch_stats.get('images', 0)} images "
+            f"({self.batch_stats.get('failed', 0)} failed) at {self.batch_stats.get('images_per_s', 0.0)} images/s "
+            f"with {workers} workers"
+        )
+
+    def _process_one(self, image: Union[str, Path, bytes, "np.ndarray"], options: Dict[str, object]) -> Dict[str, object]:
+        try:
+            return self.process_image(image, **options)  # type: ignore[arg-type]
+        except Exception as exc:  # keep the batch going
+            return {"success": False, "error": f"Processing failed: {exc}"}
+
+    def capture_and_process(self, camera_index: Optional[Union[int, str]] = None) -> Dict[str, object]:
         """
         Capture from camera and return API-ready payload.
 
+        The frame goes straight from the shared camera to the encoder; nothing
+        is written to disk.
+
         Returns:
             Dict with success flag, messages, and diagnostics.
         """
         if np is None:
             return {"success": False, "error": "NumPy not installed; required for camera capture"}
 
-        with tempfile.NamedTemporaryFile(suffix=".jpg", delete=False) as tmp:
-            temp_path = Path(tmp.name)
-
-        try:
-            frame = capture_image_reliable(camera_index, str(temp_path))
-            if frame is None:
-                return {"success": False, "error": "Camera capture failed"}
-
-            frame_valid, frame_msg = validate_numpy_frame(frame)
-            if not frame_valid:
-                return {"success": False, "error": f"Captured frame invalid: {frame_msg}"}
+        stage = time.perf_counter()
+        frame = capture_image_reliable(camera_index)
+        capture_ms = (time.perf_counter() - stage) * 1000.0
+        if frame is None:
+            return {"success": False, "error": "Camera capture failed"}
 
-            result = self.process_image(str(temp_path))
-            if not result.get("success"):
-                return result
+        frame_valid, frame_msg = validate_numpy_frame(frame)
+        if not frame_valid:
+            return {"success": False, "error": f"Captured frame invalid: {frame_msg}"}
 
-            result.setdefault("meta", {})
-            result["meta"]["camera_index"] = camera_index
+        result = self.process_image(frame)
+        if not result.get("success"):
             return result
-        finally:
-            try:
-                os.remove(temp_path)
-            except OSError:
-                pass
+
+        result.setdefault("meta", {})
+        result["meta"]["camera_index"] = camera_index
+        result["meta"]["timings_ms"]["capture"] = round(capture_ms, 2)
+        return result
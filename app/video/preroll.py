@@ -0,0 +1,100 @@
+"""Low-rate rolling ring of recent frames captured before the wake word.
+
+Users often ask "what was that?" about something they already looked away
+from. :class:`VideoPreRollRing` listens to the shared camera grabber while the
+wake listener runs and keeps the last few seconds at a low rate as small JPEGs
+in a fixed number of slots, so memory is strictly bounded and the frames are
+ready the moment a vision turn starts.
+"""
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import TYPE_CHECKING, Deque, List, Optional
+
+import cv2
+
+from app.util.log import logger
+
+from .grabber import GrabbedFrame
+from .writer import _downscale_frame
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .camera import CameraManager
+
+
+class VideoPreRollRing:
+    """Keep ``seconds`` of frames at ``fps`` as downscaled JPEG bytes.
+
+    Args:
+        seconds: Span of history to keep
+        fps: Sampling rate into the ring
+        max_width: Frames are downscaled to this width before encoding
+        jpeg_quality: JPEG quality for stored frames
+    """
+
+    def __init__(self, seconds: float = 3.0, fps: float = 2.0, max_width: int = 480, jpeg_quality: int = 75) -> None:
+        self.seconds = seconds
+        self.fps = fps
+        self.max_width = max_width
+        self.capacity = max(1, int(round(seconds * fps)))
+        self._interval_s = 1.0 / fps if fps > 0 else 0.0
+        self._encode_params = [int(cv2.IMWRITE_JPEG_QUALITY), int(jpeg_quality)]
+        self._frames: Deque[GrabbedFrame] = deque(maxlen=self.capacity)
+        self._last_kept_at = float("-inf")
+        self._lock = threading.Lock()
+        self._manager: Optional["CameraManager"] = None
+
+    # ------------------------------------------------------------ lifecycle
+    @property
+    def attached(self) -> bool:
+        return self._manager is not None
+
+    def attach(self, manager: "CameraManager") -> None:
+        """Hold the camera open and start sampling its frames."""
+        if self._manager is not None:
+            return
+        manager.acquire().add_listener(self.offer, fps=self.fps)
+        self._manager = manager
+        logger.info(f"[PREROLL] video ring running ({self.capacity} frames @ {self.fps} fps)")
+
+    def detach(self) -> None:
+        manager, self._manager = self._manager, None
+        if manager is None:
+            return
+        grabber = manager.grabber
+        if grabber is not None:
+            grabber.remove_listener(self.offer)
+        manager.release()
+
+    # ------------------------------------------------------------ sampling
+    def offer(self, grabbed: GrabbedFrame) -> bool:
+        """Grabber callback: store ``grabbed`` if the sampling interval elapsed."""
+        if grabbed.timestamp - self._last_kept_at < self._interval_s:
+            return False
+        self._last_kept_at = grabbed.timestamp
+        small = _downscale_frame(grabbed.frame, self.max_width)
+        ok, encoded = cv2.imencode(".jpg", small, self._encode_params)
+        if not ok:
+            return False
+        with self._lock:
+            self._frames.append(GrabbedFrame(jpeg=encoded.tobytes(), seq=grabbed.seq, timestamp=grabbed.timestamp))
+        return True
+
+    def snapshot(self, before: Optional[float] = None) -> List[GrabbedFrame]:
+        """Frames within the last ``seconds`` before ``before`` (monotonic), oldest first."""
+        with self._lock:
+            frames = list(self._frames)
+        if before is None:
+            return frames
+        return [f for f in frames if before - self.seconds <= f.timestamp < before]
+
+    @property
+    def memory_bytes(self) -> int:
+        with self._lock:
+            return sum(len(f.jpeg or b"") for f in self._frames)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._frames.clear()
+        self._last_kept_at = float("-inf")
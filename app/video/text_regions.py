@@ -0,0 +1,130 @@
+"""Find likely text regions for OCR-type vision requests.
+
+A centre crop downscaled to ``video_width_px`` spends most of its bytes on
+background and shrinks the writing the model has to read. :func:`find_text_regions`
+locates dense, horizontally elongated clusters of strong edges with classical
+OpenCV operations (morphological gradient, Otsu threshold, horizontal closing
+to join characters into lines, contour filtering) on a reduced copy of the
+frame, and :func:`crop_text_regions` cuts those boxes out of the frame it was
+given at that frame's full size. The route passes stored candidate frames, so
+crops are at the capture width (after any JPEG storage), not camera-native.
+"""
+from __future__ import annotations
+
+from typing import List, Sequence, Tuple
+
+import cv2
+import numpy as np
+
+Box = Tuple[int, int, int, int]  # x, y, width, height
+
+ANALYSIS_WIDTH = 640
+MIN_AREA_RATIO = 0.002  # of the analysed frame
+MIN_FILL = 0.3  # fraction of edge pixels inside a candidate box
+PAD_RATIO = 0.08
+MAX_CANDIDATES = 32
+
+
+def _merge_boxes(boxes: List[Box]) -> List[Box]:
+    """Union boxes that overlap until none do."""
+    merged = list(boxes)
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(merged)):
+            for j in range(i + 1, len(merged)):
+                ax, ay, aw, ah = merged[i]
+                bx, by, bw, bh = merged[j]
+                if ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah:
+                    x0, y0 = min(ax, bx), min(ay, by)
+                    x1, y1 = max(ax + aw, bx + bw), max(ay + ah, by + bh)
+                    merged[i] = (x0, y0, x1 - x0, y1 - y0)
+                    del merged[j]
+                    changed = True
+                    break
+            if changed:
+                break
+    return merged
+
+
+def find_text_regions(frame: np.ndarray, max_regions: int = 3) -> List[Box]:
+    """Return up to ``max_regions`` boxes (in ``frame`` coordinates) likely to hold text.
+
+    Boxes are ordered by how much text-like edge content they hold.
+
+    Args:
+        frame: BGR or grayscale frame
+        max_regions: Upper bound on boxes returned
+    """
+    gray = frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    height, width = gray.shape[:2]
+    scale = min(1.0, ANALYSIS_WIDTH / float(width))
+    small = cv2.resize(gray, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA) if scale < 1.0 else gray
+    small_h, small_w = small.shape[:2]
+
+    gradient = cv2.morphologyEx(small, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+    _, edges = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    # Join characters into words/lines without bridging separate lines.
+    line_kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (max(9, small_w // 40), 1))
+    connected = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, line_kernel)
+    # RETR_LIST: text printed inside a label outline must not be hidden by the outline.
+    contours, _ = cv2.findContours(connected, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+
+    min_area = MIN_AREA_RATIO * small_w * small_h
+    candidates: List[Tuple[float, Box]] = []
+    for contour in contours:
+        x, y, w, h = cv2.boundingRect(contour)
+        if w * h < min_area or h < 6 or w < 1.5 * h:
+            continue
+        fill = cv2.countNonZero(edges[y:y + h, x:x + w]) / float(w * h)
+        if fill < MIN_FILL:
+            continue
+        candidates.append((fill * w * h, (x, y, w, h)))
+    if not candidates:
+        return []
+    # Cluttered scenes yield many candidates; only the strongest are worth merging.
+    candidates.sort(key=lambda item: item[0], reverse=True)
+    candidates = candidates[:MAX_CANDIDATES]
+
+    # Pad, merge neighbouring lines into blocks, then rank blocks.
+    padded: List[Box] = []
+    for _, (x, y, w, h) in candidates:
+        pad_x, pad_y = int(w * PAD_RATIO) + 2, int(h * PAD_RATIO * 3) + 2
+        x0, y0 = max(0, x - pad_x), max(0, y - pad_y)
+        x1, y1 = min(small_w, x + w + pad_x), min(small_h, y + h + pad_y)
+        padded.append((x0, y0, x1 - x0, y1 - y0))
+    blocks = _merge_boxes(padded)
+    blocks.sort(key=lambda b: cv2.countNonZero(edges[b[1]:b[1] + b[3], b[0]:b[0] + b[2]]), reverse=True)
+
+    inverse = 1.0 / scale
+    return [
+        (int(x * inverse), int(y * inverse), min(width, int(w * inverse)), min(height, int(h * inverse)))
+        for x, y, w, h in blocks[:max_regions]
+    ]
+
+
+def crop_text_regions(
+    frames: Sequence[np.ndarray],
+    max_regions: int = 2,
+    max_area_ratio: float = 0.6,
+) -> List[np.ndarray]:
+    """Full-size crops of the text regions found in ``frames`` (no downscale).
+
+    Regions covering more than ``max_area_ratio`` of a frame are skipped (the
+    detector found clutter rather than text, and the normal path is better).
+
+    Args:
+        frames: Source frames, best first
+        max_regions: Upper bound on crops returned across all frames
+        max_area_ratio: Largest region (as a fraction of the frame) worth cropping
+    """
+    crops: List[np.ndarray] = []
+    for frame in frames:
+        frame_area = frame.shape[0] * frame.shape[1]
+        for x, y, w, h in find_text_regions(frame, max_regions - len(crops)):
+            if w * h > max_area_ratio * frame_area:
+                continue
+            crops.append(frame[y:y + h, x:x + w])
+        if len(crops) >= max_regions:
+            break
+    return crops
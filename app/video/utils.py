@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import base64
-from typing import List
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout
+from typing import Dict, List, Optional, Tuple
 
 import cv2
 import numpy as np
 
-from .validation import validate_numpy_frame, validate_opencv_to_base64
+from .frame_cache import EncodedFrameCache
+from .keyframes import perceptual_hash, select_keyframes
+from .validation import validate_encoded_image, validate_numpy_frame
 
 
 def center_crop(frame: np.ndarray, ratio: float) -> np.ndarray:
@@ -64,20 +69,18 @@ def resize_frame(frame: np.ndarray, max_width: int) -> np.ndarray:
     return cv2.resize(frame, new_size, interpolation=cv2.INTER_AREA)
 
 
-def frame_to_jpeg_b64(frame: np.ndarray, quality: int = 85) -> str:
+def frame_to_jpeg(frame: np.ndarray, quality: int = 85) -> bytes:
     """
-    Convert numpy frame to JPEG and encode as base64 string.
+    Encode a numpy frame as JPEG bytes exactly once.
 
-    Uses JPEG instead of PNG for better compression and token efficiency.
-
-    FIX Problem 8: Added validation to prevent encoding failures.
+    The result is checked with a header/dimension check rather than a decode.
 
     Args:
         frame: Input video frame (numpy array)
         quality: JPEG quality (0-100, default 85)
 
     Returns:
-        Base64-encoded JPEG string
+        JPEG bytes
 
     Raises:
         RuntimeError: If frame validation or encoding fails
@@ -87,28 +90,35 @@ def frame_to_jpeg_b64(frame: np.ndarray, quality: int = 85) -> str:
     if not is_valid:
         raise RuntimeError(f"Frame validation failed: {msg}")
 
-    # Encode as JPEG with validation
-    success, error_msg, size_bytes = validate_opencv_to_base64(frame)
-
-    if not success:
-        raise RuntimeError(f"Failed to encode frame: {error_msg}")
-
-    # If validation passed, do actual encoding (already validated above)
     encode_params = [int(cv2.IMWRITE_JPEG_QUALITY), quality]
     success, buffer = cv2.imencode(".jpg", frame, encode_params)
-
     if not success:
         raise RuntimeError("Failed to encode frame as JPEG")
 
-    # Convert to base64
     jpg_bytes = buffer.tobytes()
-    b64_string = base64.b64encode(jpg_bytes).decode("utf-8")
+    is_valid, msg = validate_encoded_image(jpg_bytes)
+    if not is_valid:
+        raise RuntimeError(f"Failed to encode frame: {msg}")
+    return jpg_bytes
+
+
+def frame_to_jpeg_b64(frame: np.ndarray, quality: int = 85) -> str:
+    """
+    Convert numpy frame to JPEG and encode as base64 string.
+
+    Uses JPEG instead of PNG for better compression and token efficiency.
+
+    Args:
+        frame: Input video frame (numpy array)
+        quality: JPEG quality (0-100, default 85)
 
-    # Final validation
-    if len(b64_string) == 0:
-        raise RuntimeError("Base64 encoding resulted in empty string")
+    Returns:
+        Base64-encoded JPEG string
 
-    return b64_string
+    Raises:
+        RuntimeError: If frame validation or encoding fails
+    """
+    return base64.b64encode(frame_to_jpeg(frame, quality)).decode("utf-8")
 
 
 def sample_frames(
@@ -134,28 +144,96 @@ def sample_frames(
     return sampled[:max_count]
 
 
+_POOL: Optional[ThreadPoolExecutor] = None
+_POOL_WORKERS = 0
+_POOL_LOCK = threading.Lock()
+
+
+def _frame_pool(workers: int) -> ThreadPoolExecutor:
+    """Shared encode pool, recreated only when the worker count changes."""
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_WORKERS != workers:
+            if _POOL is not None:
+                _POOL.shutdown(wait=False)
+            _POOL = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="frame-encode")
+            _POOL_WORKERS = workers
+        return _POOL
+
+
+def _prepare_frame(
+    frame: np.ndarray,
+    crop_ratio: Optional[float],
+    max_width: int,
+    jpeg_quality: int,
+    cache: Optional[EncodedFrameCache] = None,
+) -> Tuple[str, int, Optional[float]]:
+    """Crop, resize and encode one frame.
+
+    Returns (base64, jpeg bytes, encode seconds); encode seconds is None when
+    the result came from ``cache``.
+    """
+    # 1. Center crop (None: frame is already a crop, e.g. a text region)
+    cropped = center_crop(frame, crop_ratio) if crop_ratio is not None else frame
+    # 2. Resize
+    resized = resize_frame(cropped, max_width)
+    if cache is not None:
+        # The hash finds candidates; the grayscale copy confirms the pixels match
+        params = (crop_ratio, max_width, jpeg_quality)
+        phash = perceptual_hash(resized)
+        gray = cv2.cvtColor(resized, cv2.COLOR_BGR2GRAY) if resized.ndim == 3 else resized
+        cached = cache.get(phash, params, gray)
+        if cached is not None:
+            return cached[0], cached[1], None
+    # 3. Encode to JPEG (once) and base64
+    encode_started = time.perf_counter()
+    jpg = frame_to_jpeg(resized, quality=jpeg_quality)
+    b64_str = base64.b64encode(jpg).decode("utf-8")
+    if cache is not None:
+        cache.put(phash, params, b64_str, len(jpg), gray)
+    return b64_str, len(jpg), time.perf_counter() - encode_started
+
+
 def process_frames_for_vision(
     frames: List[np.ndarray],
     max_count: int = 6,
-    crop_ratio: float = 0.38,
+    crop_ratio: Optional[float] = 0.38,
     max_width: int = 960,
-    jpeg_quality: int = 85
+    jpeg_quality: int = 85,
+    selector: str = "uniform",
+    stats: Optional[Dict[str, float]] = None,
+    workers: int = 1,
+    deadline: Optional[float] = None,
+    cache: Optional[EncodedFrameCache] = None,
 ) -> List[str]:
     """
     Process raw video frames for VLM inference.
 
     Pipeline:
-    1. Sample up to max_count frames
+    1. Sample up to max_count frames (evenly, or the fewest sharp,
+       well-exposed, non-duplicate keyframes with ``selector="keyframes"``)
     2. Center-crop each frame to crop_ratio
     3. Resize to max_width
     4. Encode as JPEG and convert to base64
 
+    With ``workers > 1`` steps 2-4 run on a shared thread pool (OpenCV
+    releases the GIL while resizing and encoding); results keep frame order.
+
     Args:
         frames: List of raw video frames
         max_count: Maximum frames to include
-        crop_ratio: Center crop ratio (0.0 to 1.0)
+        crop_ratio: Center crop ratio (0.0 to 1.0), or None to send frames uncropped
         max_width: Maximum frame width in pixels
         jpeg_quality: JPEG compression quality
+        selector: "uniform" or "keyframes"
+        stats: Optional dict that receives ``prep_ms`` (wall time of the call),
+            ``encode_ms`` (summed JPEG encode time), ``jpeg_bytes`` and
+            ``dropped``/``cache_hits`` totals, added to any existing values
+        workers: Frames processed concurrently
+        deadline: ``time.monotonic()`` cutoff; frames not ready by then are
+            dropped so they cannot hold up the VLM request
+        cache: Reuse encodings of near-identical crops from earlier turns
+            (hits are counted in ``stats["cache_hits"]``)
 
     Returns:
         List of base64-encoded JPEG strings
@@ -163,26 +241,49 @@ def process_frames_for_vision(
     if not frames:
         return []
 
-    # Sample frames evenly
-    if len(frames) > max_count:
+    started = time.perf_counter()
+    if selector == "keyframes":
+        sampled = [frames[i] for i in select_keyframes(frames, max_count)]
+    elif len(frames) > max_count:
+        # Sample frames evenly
         interval = len(frames) // max_count
         sampled = sample_frames(frames, max_count, interval)
     else:
         sampled = frames[:max_count]
 
-    processed_b64: List[str] = []
-    for frame in sampled:
-        try:
-            # 1. Center crop
-            cropped = center_crop(frame, crop_ratio)
-            # 2. Resize
-            resized = resize_frame(cropped, max_width)
-            # 3. Encode to JPEG base64
-            b64_str = frame_to_jpeg_b64(resized, quality=jpeg_quality)
-            processed_b64.append(b64_str)
-        except Exception as e:
-            # Skip frames that fail processing
-            print(f"Warning: Failed to process frame: {e}")
-            continue
-
-    return processed_b64
+    results: List[Tuple[str, int, Optional[float]]] = []
+    dropped = 0
+    if workers > 1 and len(sampled) > 1:
+        pool = _frame_pool(workers)
+        futures = [pool.submit(_prepare_frame, frame, crop_ratio, max_width, jpeg_quality, cache) for frame in sampled]
+        for future in futures:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                results.append(future.result(timeout=timeout))
+            except FuturesTimeout:
+                future.cancel()
+                dropped += 1
+            except Exception as e:
+                # Skip frames that fail processing
+                print(f"Warning: Failed to process frame: {e}")
+    else:
+        for frame in sampled:
+            if deadline is not None and time.monotonic() >= deadline:
+                dropped += 1
+                continue
+            try:
+                results.append(_prepare_frame(frame, crop_ratio, max_width, jpeg_quality, cache))
+            except Exception as e:
+                # Skip frames that fail processing
+                print(f"Warning: Failed to process frame: {e}")
+                continue
+
+    if dropped:
+        print(f"Warning: Dropped {dropped} frame(s) that missed the image prep deadline")
+    if stats is not None:
+        stats["prep_ms"] = stats.get("prep_ms", 0.0) + (time.perf_counter() - started) * 1000.0
+        stats["encode_ms"] = stats.get("encode_ms", 0.0) + sum(r[2] or 0.0 for r in results) * 1000.0
+        stats["jpeg_bytes"] = stats.get("jpeg_bytes", 0) + sum(r[1] for r in results)
+        stats["dropped"] = stats.get("dropped", 0) + dropped
+        stats["cache_hits"] = stats.get("cache_hits", 0) + sum(1 for r in results if r[2] is None)
+    return [r[0] for r in results]
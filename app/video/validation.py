@@ -12,6 +12,7 @@ This module provides validation at each pipeline stage.
 import base64
 import io
 import os
+import struct
 from typing import Optional, Tuple
 
 import cv2
@@ -95,7 +96,7 @@ def validate_image_content(image_path: str) -> Tuple[bool, str]:
         if img.format not in valid_formats:
             return False, f"Unsupported format: {img.format}"
 
-    return True, f"Valid {img.format} {width}x{height}"
+        return True, f"Valid {img.format} {width}x{height}"
 
     except Exception as e:
         return False, f"Validation failed: {str(e)}"
@@ -145,6 +146,73 @@ def validate_numpy_frame(frame: np.ndarray) -> Tuple[bool, str]:
     return True, f"Valid frame {width}x{height}"
 
 
+# JPEG start-of-frame markers carrying the image dimensions (not DHT/JPG/DAC)
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def encoded_image_info(data: bytes) -> Optional[Tuple[str, int, int]]:
+    """Read format and dimensions from a JPEG or PNG header without decoding pixels.
+
+    Args:
+        data: Encoded image bytes
+
+    Returns:
+        ``(format, width, height)`` or None if the header is not recognised
+    """
+    if data[:8] == _PNG_SIGNATURE and len(data) >= 24 and data[12:16] == b"IHDR":
+        width, height = struct.unpack(">II", data[16:24])
+        return "PNG", width, height
+    if data[:2] != b"\xff\xd8":
+        return None
+    pos = 2
+    while pos + 4 <= len(data):
+        if data[pos] != 0xFF:
+            return None
+        marker = data[pos + 1]
+        if marker == 0xFF:  # fill byte
+            pos += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD7:  # standalone markers
+            pos += 2
+            continue
+        (length,) = struct.unpack(">H", data[pos + 2:pos + 4])
+        if marker in _JPEG_SOF_MARKERS:
+            if pos + 9 > len(data):
+                return None
+            height, width = struct.unpack(">HH", data[pos + 5:pos + 9])
+            return "JPEG", width, height
+        pos += 2 + length
+    return None
+
+
+def validate_encoded_image(data: bytes) -> Tuple[bool, str]:
+    """Cheap check of freshly encoded image bytes (header, end marker, dimensions).
+
+    Used on the encode path instead of a full decode: the encoder just produced
+    these bytes, so only truncation or an empty/odd result needs catching.
+
+    Args:
+        data: Encoded JPEG or PNG bytes
+
+    Returns:
+        (is_valid, error_message) tuple
+    """
+    if not data:
+        return False, "Encoded image is empty"
+    if len(data) > 20 * 1024 * 1024:
+        return False, "Encoded image too large (>20MB)"
+    info = encoded_image_info(data)
+    if info is None:
+        return False, "Unrecognised image header"
+    image_format, width, height = info
+    if width == 0 or height == 0:
+        return False, "Invalid dimensions"
+    if image_format == "JPEG" and data.rstrip(b"\x00")[-2:] != b"\xff\xd9":
+        return False, "JPEG data is truncated"
+    return True, f"Valid {image_format} {width}x{height}"
+
+
 def validate_base64_image(base64_string: str) -> Tuple[bool, str]:
     """Validate base64 encoded image data.
 
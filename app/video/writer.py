@@ -1,12 +1,22 @@
 from __future__ import annotations
 
 import math
+import queue
+import shutil
+import subprocess
+import threading
+import time
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional, Union
 
 import cv2
 import numpy as np
 
+from app.util.log import logger
+
+DROP_POLICIES = ("drop_oldest", "drop_newest", "block")
+
 
 class VideoSegmentWriter:
     """Simple MP4 writer around OpenCV."""
@@ -30,6 +40,212 @@ class VideoSegmentWriter:
         self.close()
 
 
+@dataclass
+class EncoderStats:
+    """Counters for :class:`AsyncVideoWriter`."""
+
+    enqueued: int = 0
+    written: int = 0
+    dropped: int = 0
+    errors: int = 0
+    max_queue_depth: int = 0
+    encode_ms_total: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["encode_ms_avg"] = round(self.encode_ms_total / self.written, 2) if self.written else 0.0
+        data["encode_ms_total"] = round(self.encode_ms_total, 1)
+        return data
+
+
+class AsyncVideoWriter:
+    """Encode a segment on a background thread fed by a bounded queue.
+
+    ``write`` never blocks the caller for long: when the queue is full a frame
+    is dropped according to ``drop_policy`` and counted. Encoding uses an
+    ``ffmpeg`` pipe when available (``backend="auto"``), otherwise OpenCV.
+    In ``mjpeg_passthrough`` mode frames arrive as camera JPEG bytes via
+    ``write_jpeg`` and are stored as-is (``ffmpeg -c:v copy``) without a
+    decode/re-encode; without ffmpeg they are decoded and written as MJPG.
+
+    Args:
+        target_path: Output path (suffix is forced to ``.avi`` for MJPEG passthrough)
+        fps: Nominal frame rate
+        frame_size: (width, height)
+        queue_size: Maximum frames waiting for the encoder
+        drop_policy: ``drop_oldest``, ``drop_newest`` or ``block`` (waits
+            briefly, then drops the new frame)
+        backend: ``auto``, ``ffmpeg`` or ``opencv``
+        mjpeg_passthrough: Store compressed camera frames directly
+    """
+
+    def __init__(
+        self,
+        target_path: Path,
+        fps: float,
+        frame_size: tuple[int, int],
+        *,
+        queue_size: int = 60,
+        drop_policy: str = "drop_oldest",
+        backend: str = "auto",
+        mjpeg_passthrough: bool = False,
+    ) -> None:
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"drop_policy must be one of {DROP_POLICIES}, got '{drop_policy}'")
+        self.fps = fps
+        self.frame_size = frame_size
+        self.drop_policy = drop_policy
+        self.mjpeg_passthrough = mjpeg_passthrough
+        self.path = Path(target_path).with_suffix(".avi") if mjpeg_passthrough else Path(target_path)
+        self.stats = EncoderStats()
+
+        ffmpeg = shutil.which("ffmpeg")
+        if backend == "ffmpeg" and not ffmpeg:
+            raise RuntimeError("ffmpeg backend requested but ffmpeg is not on PATH")
+        self.backend = "ffmpeg" if ffmpeg and backend in ("auto", "ffmpeg") else "opencv"
+
+        self._queue: "queue.Queue[Optional[Union[np.ndarray, bytes]]]" = queue.Queue(maxsize=max(1, queue_size))
+        self._process: Optional[subprocess.Popen] = None
+        self._cv_writer: Optional[cv2.VideoWriter] = None
+        self._open_backend()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="video-encoder", daemon=True)
+        self._thread.start()
+
+    def _open_backend(self) -> None:
+        width, height = self.frame_size
+        if self.backend == "ffmpeg":
+            if self.mjpeg_passthrough:
+                input_args = ["-f", "mjpeg", "-framerate", f"{self.fps:.3f}", "-i", "-"]
+                output_args = ["-c:v", "copy"]
+            else:
+                input_args = [
+                    "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{width}x{height}",
+                    "-framerate", f"{self.fps:.3f}", "-i", "-",
+                ]
+                output_args = ["-c:v", "libx264", "-preset", "ultrafast", "-pix_fmt", "yuv420p"]
+            self._process = subprocess.Popen(
+                ["ffmpeg", "-loglevel", "error", "-y", *input_args, "-an", *output_args, str(self.path)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        else:
+            fourcc = cv2.VideoWriter_fourcc(*("MJPG" if self.mjpeg_passthrough else "mp4v"))
+            self._cv_writer = cv2.VideoWriter(str(self.path), fourcc, self.fps, self.frame_size)
+            if not self._cv_writer.isOpened():
+                raise RuntimeError(f"Failed to open video writer for {self.path}")
+
+    def write(self, frame: np.ndarray) -> bool:
+        """Queue a decoded BGR frame; returns False if a frame was dropped."""
+        return self._enqueue(frame)
+
+    def write_jpeg(self, data: bytes) -> bool:
+        """Queue a camera JPEG (MJPEG passthrough); returns False if a frame was dropped."""
+        return self._enqueue(data)
+
+    def _enqueue(self, item: Union[np.ndarray, bytes]) -> bool:
+        if self._closed:
+            return False
+        self.stats.enqueued += 1
+        accepted = True
+        try:
+            if self.drop_policy == "block":
+                self._queue.put(item, timeout=0.1)
+            else:
+                self._queue.put_nowait(item)
+        except queue.Full:
+            accepted = False
+            if self.drop_policy == "drop_oldest":
+                try:
+                    self._queue.get_nowait()
+                    self._queue.put_nowait(item)
+                except (queue.Empty, queue.Full):
+                    pass
+            self.stats.dropped += 1
+        self.stats.max_queue_depth = max(self.stats.max_queue_depth, self._queue.qsize())
+        return accepted
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            start = time.perf_counter()
+            try:
+                self._encode(item)
+                self.stats.written += 1
+            except Exception as exc:
+                self.stats.errors += 1
+                if self.stats.errors == 1:
+                    logger.warning(f"[VIDEO] encoder error: {exc}")
+            self.stats.encode_ms_total += (time.perf_counter() - start) * 1000
+
+    def _encode(self, item: Union[np.ndarray, bytes]) -> None:
+        if isinstance(item, (bytes, bytearray)) and not self.mjpeg_passthrough:
+            item = cv2.imdecode(np.frombuffer(item, dtype=np.uint8), cv2.IMREAD_COLOR)
+        elif isinstance(item, np.ndarray) and self.mjpeg_passthrough:
+            ok, encoded = cv2.imencode(".jpg", item)
+            if not ok:
+                raise RuntimeError("JPEG encode failed")
+            item = encoded.tobytes()
+
+        if self._process is not None:
+            data = item if isinstance(item, (bytes, bytearray)) else np.ascontiguousarray(item).tobytes()
+            self._process.stdin.write(data)
+        elif isinstance(item, (bytes, bytearray)):
+            self._cv_writer.write(cv2.imdecode(np.frombuffer(item, dtype=np.uint8), cv2.IMREAD_COLOR))
+        else:
+            self._cv_writer.write(item)
+
+    def close(self, timeout: float = 5.0) -> Dict[str, Any]:
+        """Flush queued frames, finalize the file and return encoder stats."""
+        if self._closed:
+            return self.stats.as_dict()
+        self._closed = True
+        try:
+            # Never wait forever on a full queue behind a stalled encoder.
+            self._queue.put(None, timeout=timeout if self._thread.is_alive() else 0)
+        except queue.Full:
+            discarded = 0
+            while True:
+                try:
+                    self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                discarded += 1
+            self.stats.dropped += discarded
+            logger.warning(f"[VIDEO] encoder stalled; discarded {discarded} queued frames")
+            try:
+                self._queue.put_nowait(None)
+            except queue.Full:
+                pass
+        self._thread.join(timeout=timeout)
+        if self._process is not None:
+            try:
+                self._process.stdin.close()
+                self._process.wait(timeout=timeout)
+            except Exception:
+                self._process.kill()
+            self._process = None
+        if self._cv_writer is not None:
+            self._cv_writer.release()
+            self._cv_writer = None
+        stats = self.stats.as_dict()
+        logger.info(
+            f"[VIDEO] {self.path.name} ({self.backend}{', mjpeg passthrough' if self.mjpeg_passthrough else ''}): "
+            f"{stats['written']} written, {stats['dropped']} dropped, max queue {stats['max_queue_depth']}, "
+            f"{stats['encode_ms_avg']}ms/frame"
+        )
+        return stats
+
+    def __enter__(self) -> "AsyncVideoWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
 def sample_video_frames(
     video_path: Path,
     sample_fps: float,
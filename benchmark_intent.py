@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Intent matcher microbenchmark.
+
+Times the intent checks that run on every partial transcript, comparing the
+previous per-pattern loop (``re.search(pattern, text, flags)`` for each
+pattern string) with the precompiled single-pass matchers in
+app/util/intent.py and app/util/text.py, and reports matches per second:
+
+- wants_vision:     vision trigger anywhere (deictic + OCR patterns)
+- classify:         vision intent class (OCR / count / colour / describe)
+- scene_preface:    strip_scene_preface on VLM responses
+
+Both implementations are checked to agree on every input before timing.
+
+Examples:
+    python benchmark_intent.py
+    python benchmark_intent.py --transcripts partials.txt --seconds 2 --json intent_bench.json
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.util import intent
+from app.util import text as text_utils
+
+SAMPLE_TRANSCRIPTS = [
+    "hey glasses what is this",
+    "hello",
+    "hello how are you",
+    "can you read the label on this bottle",
+    "what",
+    "what is",
+    "what is the weather like tomorrow",
+    "how many apples are on the table",
+    "what color is my shirt",
+    "tell me a joke about penguins",
+    "good morning",
+    "describe the scene in front of me",
+    "remind me to call my mother at five o'clock",
+    "what does this sign say",
+    "thanks",
+]
+
+SAMPLE_RESPONSES = [
+    "I see a red car in the parking lot.",
+    "From the image, this appears to be a coffee mug.",
+    "The capital of France is Paris.",
+    "Looking at the photo: a dog on a couch.",
+    "Sure! Here's a joke about penguins.",
+]
+
+
+# --- previous implementation (per-pattern loop), kept here as the baseline ---
+
+def _loop_matches(text: str, patterns: Sequence[str]) -> bool:
+    for pattern in patterns:
+        if re.search(pattern, text, flags=re.IGNORECASE):
+            return True
+    return False
+
+
+def loop_wants_vision(transcript: str) -> bool:
+    if not transcript or not transcript.strip():
+        return False
+    text_lower = transcript.lower().strip()
+    return _loop_matches(text_lower, intent.DEICTIC_PATTERNS) or _loop_matches(text_lower, intent.OCR_PATTERNS)
+
+
+def loop_classify(transcript: str):
+    if not loop_wants_vision(transcript):
+        return None
+    text_lower = transcript.lower().strip()
+    for name, patterns in intent.INTENT_CLASS_PATTERNS:
+        if _loop_matches(text_lower, patterns):
+            return name
+    return intent.INTENT_IDENTIFY
+
+
+def loop_scene_preface(response: str) -> str:
+    stripped = response.lstrip()
+    for pattern in text_utils.SCENE_PREFACE_PATTERNS:
+        match = re.match(rf"(?is)^{pattern}(?:[\s,.:;-]+|$)", stripped)
+        if match:
+            stripped = stripped[match.end():].lstrip()
+            break
+    if stripped and stripped[0].islower():
+        stripped = stripped[0].upper() + stripped[1:]
+    return stripped.strip()
+
+
+def rate(func: Callable[[str], object], inputs: List[str], seconds: float) -> float:
+    """Calls per second of ``func`` cycling over ``inputs`` for about ``seconds``."""
+    calls = 0
+    started = time.perf_counter()
+    deadline = started + seconds
+    while time.perf_counter() < deadline:
+        for item in inputs:
+            func(item)
+        calls += len(inputs)
+    return calls / (time.perf_counter() - started)
+
+
+def prefixes(transcripts: List[str]) -> List[str]:
+    """Every word prefix of each transcript, as a streaming recognizer would emit them."""
+    partials: List[str] = []
+    for transcript in transcripts:
+        words = transcript.split()
+        partials.extend(" ".join(words[:n]) for n in range(1, len(words) + 1))
+    return partials
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark intent matching throughput")
+    parser.add_argument("--transcripts", type=Path, help="Text file, one transcript per line (default: built-in samples)")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Timing duration per case")
+    parser.add_argument("--json", type=Path, help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    transcripts = SAMPLE_TRANSCRIPTS
+    if args.transcripts:
+        transcripts = [line.strip() for line in args.transcripts.read_text().splitlines() if line.strip()]
+    partials = prefixes(transcripts)
+
+    cases = [
+        ("wants_vision", partials, loop_wants_vision, intent.wants_vision),
+        ("classify", partials, loop_classify, intent.classify_vision_intent),
+        ("scene_preface", SAMPLE_RESPONSES, loop_scene_preface, text_utils.strip_scene_preface),
+    ]
+
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"{'case':<14} {'inputs':>7} {'loop /s':>12} {'compiled /s':>12} {'speedup':>8}")
+    for name, inputs, baseline, compiled in cases:
+        mismatched = [item for item in inputs if baseline(item) != compiled(item)]
+        if mismatched:
+            print(f"{name}: results differ for {mismatched[:3]}", file=sys.stderr)
+            return 1
+        loop_rate = rate(baseline, inputs, args.seconds)
+        compiled_rate = rate(compiled, inputs, args.seconds)
+        results[name] = {
+            "inputs": len(inputs),
+            "loop_per_s": round(loop_rate, 1),
+            "compiled_per_s": round(compiled_rate, 1),
+            "speedup": round(compiled_rate / loop_rate, 2) if loop_rate else 0.0,
+        }
+        row = results[name]
+        print(
+            f"{name:<14} {row['inputs']:>7} {row['loop_per_s']:>12.0f} {row['compiled_per_s']:>12.0f} "
+            f"{row['speedup']:>7.2f}x"
+        )
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Vision payload benchmark for OCR-type requests.
+
+Prepares each image the way routing would for a "read this" question and
+reports, per strategy, the base64 bytes that would be sent and the
+preprocessing time per request:
+
+- center: centre crop (center_crop_ratio) downscaled to video_width_px
+- full:   whole frame downscaled to video_width_px
+- text:   text-region crops at native resolution (app/video/text_regions.py),
+          falling back to "center" when no regions are found
+
+Examples:
+    python benchmark_vision.py samples/labels/*.jpg
+    python benchmark_vision.py samples/labels --repeat 5 --json ocr_bench.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import cv2
+
+from app.util.config import load_config
+from app.video.text_regions import crop_text_regions
+from app.video.utils import process_frames_for_vision
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+STRATEGIES = ("center", "full", "text")
+
+
+@dataclass
+class StrategyResult:
+    strategy: str
+    bytes_sent: List[int] = field(default_factory=list)
+    prep_ms: List[float] = field(default_factory=list)
+    images: List[int] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "requests": len(self.bytes_sent),
+            "mean_bytes": round(statistics.mean(self.bytes_sent), 1) if self.bytes_sent else 0.0,
+            "mean_prep_ms": round(statistics.mean(self.prep_ms), 2) if self.prep_ms else 0.0,
+            "p95_prep_ms": round(_percentile(self.prep_ms, 95), 2),
+            "mean_images": round(statistics.mean(self.images), 2) if self.images else 0.0,
+        }
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def collect_images(inputs: List[Path]) -> List[Path]:
+    paths: List[Path] = []
+    for item in inputs:
+        if item.is_dir():
+            paths.extend(sorted(p for p in item.rglob("*") if p.suffix.lower() in IMAGE_SUFFIXES))
+        elif item.suffix.lower() in IMAGE_SUFFIXES:
+            paths.append(item)
+    return paths
+
+
+def prepare(strategy: str, frame, config, max_images: int) -> List[str]:
+    if strategy == "center":
+        return process_frames_for_vision(
+            [frame], max_count=1, crop_ratio=config.center_crop_ratio, max_width=config.video_width_px
+        )
+    if strategy == "full":
+        return process_frames_for_vision([frame], max_count=1, crop_ratio=None, max_width=config.video_width_px)
+    crops = crop_text_regions([frame], max_regions=max_images)
+    if not crops:
+        return prepare("center", frame, config, max_images)
+    return process_frames_for_vision(
+        crops, max_count=max_images, crop_ratio=None, max_width=config.ocr_crop_max_width
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark bytes sent and prep time for OCR vision requests")
+    parser.add_argument("inputs", nargs="+", type=Path, help="Image files or directories")
+    parser.add_argument("-c", "--config", type=Path, help="App config JSON (defaults to config.json)")
+    parser.add_argument("--max-images", type=int, default=2, help="Images per request (OCR policy default: 2)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per image and strategy")
+    parser.add_argument("--json", type=Path, help="Write per-strategy results to this JSON file")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    paths = collect_images(args.inputs)
+    if not paths:
+        print("No images found", file=sys.stderr)
+        return 1
+
+    results = {name: StrategyResult(name) for name in STRATEGIES}
+    for path in paths:
+        frame = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        if frame is None:
+            print(f"Skipping unreadable {path}", file=sys.stderr)
+            continue
+        for name in STRATEGIES:
+            prepare(name, frame, config, args.max_images)  # warm-up
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                images = prepare(name, frame, config, args.max_images)
+                elapsed_ms = (time.perf_counter() - started) * 1000.0
+                results[name].bytes_sent.append(sum(len(image) for image in images))
+                results[name].prep_ms.append(elapsed_ms)
+                results[name].images.append(len(images))
+
+    print(f"{'strategy':<8} {'requests':>8} {'mean bytes':>12} {'mean ms':>9} {'p95 ms':>8} {'images':>7}")
+    for name in STRATEGIES:
+        row = results[name].summary()
+        print(
+            f"{name:<8} {row['requests']:>8} {row['mean_bytes']:>12.0f} {row['mean_prep_ms']:>9.2f} "
+            f"{row['p95_prep_ms']:>8.2f} {row['mean_images']:>7.2f}"
+        )
+
+    if args.json:
+        args.json.write_text(
+            json.dumps({name: {**asdict(r), "summary": r.summary()} for name, r in results.items()}, indent=2)
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
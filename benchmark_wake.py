@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""
+Wake word latency / accuracy benchmark.
+
+Replays labeled audio through the same listeners the app uses (built by
+HybridWakeWordManager, so WakeWordListener for Vosk and PorcupineWakeListener
+for Porcupine) frame by frame on a simulated clock, and reports:
+
+- detection latency (end of wake phrase -> detection), p50/p95
+- misses on positive clips
+- false accepts per hour on near-miss and negative (background) audio
+- CPU seconds per hour of audio (and real-time factor)
+
+Manifest (JSON list, {"clips": [...]}, or JSONL), paths relative to the manifest:
+
+    {"path": "positives/hey_glasses_01.wav", "label": "positive", "phrase_end_s": 1.42}
+    {"path": "near_miss/hey_glosses.wav", "label": "near_miss"}
+    {"path": "negatives/cafe_60min.wav", "label": "negative"}
+
+Clips should be 16-bit PCM WAV; other rates / stereo are converted.
+
+Examples:
+    python benchmark_wake.py data/wake/manifest.json
+    python benchmark_wake.py manifest.json --method vosk --sensitivity 0.4,0.65,0.9 \\
+        --vad-level 0,1,2 --fuzzy-threshold 70,75,85 --json results.json
+    python benchmark_wake.py manifest.json --method porcupine --sensitivity 0.5,0.7
+"""
+
+import argparse
+import audioop
+import itertools
+import json
+import os
+import statistics
+import sys
+import time
+import wave
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.audio.wake_hybrid import HybridWakeWordManager
+from app.util.config import load_config
+
+LABELS = {"positive", "near_miss", "negative"}
+
+
+@dataclass
+class Clip:
+    path: Path
+    label: str
+    phrase_end_s: Optional[float] = None
+    pcm: bytes = b""
+    sample_rate: int = 16000
+
+    @property
+    def duration_s(self) -> float:
+        return len(self.pcm) / 2 / self.sample_rate
+
+
+@dataclass
+class BenchmarkResult:
+    method: str
+    params: Dict[str, Any]
+    positives: int = 0
+    misses: int = 0
+    latencies_ms: List[float] = field(default_factory=list)
+    near_miss_accepts: int = 0
+    negative_accepts: int = 0
+    positive_spurious: int = 0
+    audio_s: float = 0.0
+    non_wake_s: float = 0.0
+    cpu_s: float = 0.0
+
+    @property
+    def false_accepts(self) -> int:
+        return self.near_miss_accepts + self.negative_accepts + self.positive_spurious
+
+    @property
+    def false_accepts_per_hour(self) -> float:
+        hours = self.non_wake_s / 3600
+        return self.false_accepts / hours if hours else 0.0
+
+    @property
+    def cpu_s_per_audio_hour(self) -> float:
+        hours = self.audio_s / 3600
+        return self.cpu_s / hours if hours else 0.0
+
+    def latency_percentile(self, pct: float) -> Optional[float]:
+        if not self.latencies_ms:
+            return None
+        ordered = sorted(self.latencies_ms)
+        index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+        return ordered[index]
+
+    def summary(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("latencies_ms")
+        data.update(
+            {
+                "latency_p50_ms": self.latency_percentile(50),
+                "latency_p95_ms": self.latency_percentile(95),
+                "latency_mean_ms": statistics.fmean(self.latencies_ms) if self.latencies_ms else None,
+                "false_accepts": self.false_accepts,
+                "false_accepts_per_hour": round(self.false_accepts_per_hour, 3),
+                "cpu_s_per_audio_hour": round(self.cpu_s_per_audio_hour, 1),
+                "real_time_factor": round(self.cpu_s / self.audio_s, 4) if self.audio_s else None,
+            }
+        )
+        return data
+
+
+def load_manifest(manifest_path: Path, sample_rate: int) -> List[Clip]:
+    text = manifest_path.read_text(encoding="utf-8").strip()
+    if text.startswith("[") or text.startswith("{\"clips\""):
+        data = json.loads(text)
+        entries = data["clips"] if isinstance(data, dict) else data
+    else:
+        entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+
+    clips: List[Clip] = []
+    for entry in entries:
+        label = entry["label"]
+        if label not in LABELS:
+            raise ValueError(f"Unknown label '{label}' (expected one of {sorted(LABELS)})")
+        if label == "positive" and entry.get("phrase_end_s") is None:
+            raise ValueError(f"Positive clip {entry['path']} needs phrase_end_s")
+        path = (manifest_path.parent / entry["path"]).resolve()
+        clips.append(
+            Clip(
+                path=path,
+                label=label,
+                phrase_end_s=entry.get("phrase_end_s"),
+                pcm=read_pcm(path, sample_rate),
+                sample_rate=sample_rate,
+            )
+        )
+    return clips
+
+
+def read_pcm(path: Path, sample_rate: int) -> bytes:
+    """Read a WAV file as 16-bit mono PCM at ``sample_rate``."""
+    with wave.open(str(path), "rb") as wav:
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        rate = wav.getframerate()
+        pcm = wav.readframes(wav.getnframes())
+    if width != 2:
+        pcm = audioop.lin2lin(pcm, width, 2)
+    if channels == 2:
+        pcm = audioop.tomono(pcm, 2, 0.5, 0.5)
+    elif channels != 1:
+        raise ValueError(f"{path}: unsupported channel count {channels}")
+    if rate != sample_rate:
+        pcm, _ = audioop.ratecv(pcm, 2, 1, rate, sample_rate, None)
+    return pcm
+
+
+def build_listener(config, method: str, model, params: Dict[str, Any], verify: bool):
+    """Create the listener the app would use for ``method`` with overridden params."""
+    from app.audio.wake_verify import create_wake_verifier
+
+    transcriber = None
+    if method == "vosk":
+        from app.audio.stt import WakeGrammarRecognizer
+
+        transcriber = WakeGrammarRecognizer(model, config.sample_rate_hz, config.wake_variants)
+
+    manager = HybridWakeWordManager(
+        wake_word=config.wake_word,
+        wake_variants=config.wake_variants,
+        on_detect=lambda _buffer: None,
+        transcriber=transcriber,
+        sample_rate=config.sample_rate_hz,
+        chunk_samples=config.chunk_samples,
+        pre_roll_ms=config.pre_roll_ms,
+        wake_vad_level=params.get("vad_level", config.wake_vad_level),
+        wake_match_window_ms=config.wake_match_window_ms,
+        wake_sensitivity=params.get("sensitivity", config.wake_sensitivity),
+        wake_fuzzy_threshold=params.get("fuzzy_threshold", config.wake_fuzzy_threshold),
+        verifier=create_wake_verifier(config, model) if verify else None,
+        porcupine_access_key=config.porcupine_access_key,
+        porcupine_keyword_path=config.porcupine_keyword_path,
+        porcupine_sensitivity=params.get("sensitivity", config.porcupine_sensitivity),
+        prefer_porcupine=method == "porcupine",
+    )
+    listener = manager.create_listener()
+    if manager.detection_method != method:
+        raise RuntimeError(f"Requested {method} but HybridWakeWordManager selected {manager.detection_method}")
+    return listener, config.chunk_samples
+
+
+class SimulatedClock:
+    """Monotonic clock advanced by replayed audio, not wall time."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def replay(listener, pcm: bytes, frame_samples: int, sample_rate: int, clock: SimulatedClock) -> List[float]:
+    """Feed ``pcm`` through ``listener`` and return detection times (s, frame end)."""
+    frame_bytes = frame_samples * 2
+    frame_s = frame_samples / sample_rate
+    detections: List[float] = []
+    listener.reset_stream_state()
+    for index, offset in enumerate(range(0, len(pcm) - frame_bytes + 1, frame_bytes)):
+        clock.advance(frame_s)
+        if listener.detect_frame(pcm[offset : offset + frame_bytes], now=clock.now) is not None:
+            detections.append((index + 1) * frame_s)
+            listener.reset_stream_state()
+    # Separate clips so debounce / match windows never span two files.
+    clock.advance(5.0)
+    return detections
+
+
+def run_benchmark(
+    clips: List[Clip],
+    listener,
+    frame_samples: int,
+    sample_rate: int,
+    *,
+    method: str,
+    params: Dict[str, Any],
+    max_latency_s: float,
+    warmup_pcm: bytes,
+) -> BenchmarkResult:
+    result = BenchmarkResult(method=method, params=params)
+    clock = SimulatedClock()
+    if warmup_pcm:
+        # Let AGC / adaptive VAD calibrate before anything is scored.
+        replay(listener, warmup_pcm, frame_samples, sample_rate, clock)
+
+    for clip in clips:
+        cpu_start = time.process_time()
+        detections = replay(listener, clip.pcm, frame_samples, sample_rate, clock)
+        result.cpu_s += time.process_time() - cpu_start
+        result.audio_s += clip.duration_s
+
+        if clip.label == "positive":
+            result.positives += 1
+            deadline = clip.phrase_end_s + max_latency_s
+            hits = [t for t in detections if t <= deadline]
+            if hits:
+                result.latencies_ms.append((hits[0] - clip.phrase_end_s) * 1000)
+            else:
+                result.misses += 1
+            result.positive_spurious += sum(1 for t in detections if t > deadline)
+        else:
+            result.non_wake_s += clip.duration_s
+            if clip.label == "near_miss":
+                result.near_miss_accepts += len(detections)
+            else:
+                result.negative_accepts += len(detections)
+    return result
+
+
+def _parse_list(value: Optional[str], cast) -> List[Any]:
+    if value is None:
+        return [None]
+    return [cast(item) for item in value.split(",") if item.strip()]
+
+
+def print_table(results: List[BenchmarkResult]) -> None:
+    header = (
+        f"{'method':<10} {'sens':>5} {'vad':>4} {'fuzzy':>6} {'pos':>5} {'miss':>5} "
+        f"{'p50ms':>7} {'p95ms':>7} {'FA':>4} {'FA/h':>7} {'nearFA':>7} {'CPUs/h':>8} {'RTF':>7}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        s = r.summary()
+
+        def fmt(value, spec):
+            return format(value, spec) if value is not None else "-"
+
+        print(
+            f"{r.method:<10} {fmt(r.params.get('sensitivity'), '5.2f')} {fmt(r.params.get('vad_level'), '4d')} "
+            f"{fmt(r.params.get('fuzzy_threshold'), '6d')} {r.positives:>5} {r.misses:>5} "
+            f"{fmt(s['latency_p50_ms'], '7.0f')} {fmt(s['latency_p95_ms'], '7.0f')} {r.false_accepts:>4} "
+            f"{s['false_accepts_per_hour']:>7.2f} {r.near_miss_accepts:>7} {s['cpu_s_per_audio_hour']:>8.1f} "
+            f"{fmt(s['real_time_factor'], '7.4f')}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark wake word latency and accuracy on labeled audio")
+    parser.add_argument("manifest", type=Path, help="Manifest of labeled WAV clips (JSON or JSONL)")
+    parser.add_argument("-c", "--config", type=Path, help="App config JSON (defaults to config.json)")
+    parser.add_argument("--method", choices=["vosk", "porcupine", "both"], default="both")
+    parser.add_argument("--sensitivity", help="Comma list of wake/porcupine sensitivities to sweep")
+    parser.add_argument("--vad-level", help="Comma list of wake_vad_level values to sweep (Vosk)")
+    parser.add_argument("--fuzzy-threshold", help="Comma list of fuzzy thresholds to sweep (Vosk)")
+    parser.add_argument("--verify", action="store_true", help="Enable second-stage verification")
+    parser.add_argument("--max-latency-ms", type=int, default=1500, help="Detections later than this count as misses")
+    parser.add_argument("--warmup-s", type=float, default=1.5, help="Calibration audio fed before scoring")
+    parser.add_argument("--json", type=Path, help="Write full results to this JSON file")
+    args = parser.parse_args()
+
+    config = load_config(args.config)
+    clips = load_manifest(args.manifest, config.sample_rate_hz)
+    counts = {label: sum(1 for c in clips if c.label == label) for label in sorted(LABELS)}
+    print(f"Loaded {len(clips)} clips {counts}, {sum(c.duration_s for c in clips) / 60:.1f} min of audio")
+
+    negatives = [c for c in clips if c.label == "negative"]
+    warmup_samples = int(args.warmup_s * config.sample_rate_hz)
+    warmup_pcm = negatives[0].pcm[: warmup_samples * 2] if negatives else b"\x00\x00" * warmup_samples
+
+    methods = ["vosk", "porcupine"] if args.method == "both" else [args.method]
+    model = None
+    if "vosk" in methods or args.verify:
+        from vosk import Model
+
+        model_path = config.vosk_model_path or os.getenv("VOSK_MODEL_PATH")
+        if not model_path:
+            print("Set VOSK_MODEL_PATH or vosk_model_path to benchmark Vosk", file=sys.stderr)
+            return 1
+        model = Model(model_path)
+
+    results: List[BenchmarkResult] = []
+    for method in methods:
+        sweep = itertools.product(
+            _parse_list(args.sensitivity, float),
+            _parse_list(args.vad_level, int) if method == "vosk" else [None],
+            _parse_list(args.fuzzy_threshold, int) if method == "vosk" else [None],
+        )
+        for sensitivity, vad_level, fuzzy_threshold in sweep:
+            params = {
+                key: value
+                for key, value in {
+                    "sensitivity": sensitivity,
+                    "vad_level": vad_level,
+                    "fuzzy_threshold": fuzzy_threshold,
+                }.items()
+                if value is not None
+            }
+            try:
+                listener, frame_samples = build_listener(config, method, model, params, args.verify)
+            except Exception as exc:
+                print(f"Skipping {method} {params}: {exc}", file=sys.stderr)
+                break
+            results.append(
+                run_benchmark(
+                    clips,
+                    listener,
+                    frame_samples,
+                    config.sample_rate_hz,
+                    method=method,
+                    params=params,
+                    max_latency_s=args.max_latency_ms / 1000,
+                    warmup_pcm=warmup_pcm,
+                )
+            )
+
+    if not results:
+        print("No wake method could be benchmarked", file=sys.stderr)
+        return 1
+
+    print()
+    print_table(results)
+    if args.json:
+        args.json.write_text(json.dumps([r.summary() for r in results], indent=2, default=str), encoding="utf-8")
+        print(f"\nWrote {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
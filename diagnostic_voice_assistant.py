@@ -43,7 +43,7 @@ from vosk import Model
 from app.ai.vlm_client import VLMClient
 from app.audio.capture import run_segment, SegmentCaptureResult
 from app.audio.mic import MicrophoneStream
-from app.audio.stt import StreamingTranscriber
+from app.audio.stt import StreamingTranscriber, WakeGrammarRecognizer
 from app.audio.tts import SpeechSynthesizer
 from app.audio.wake import WakeWordListener
 from app.session import SessionCallbacks, SessionManager, SessionState
@@ -587,7 +587,7 @@ def test_1_complete_speech_capture(
 
 def test_2_wake_word_reliability(
     config: AppConfig,
-    wake_transcriber: StreamingTranscriber,
+    wake_transcriber: WakeGrammarRecognizer,
     logger: DiagnosticLogger,
     validator: TestValidator,
     attempts: int = 3,
@@ -1130,7 +1130,7 @@ def monitor_mode(config: AppConfig, logger: DiagnosticLogger, duration_s: int =
     # Create wake word listener
     from vosk import Model
     model = Model(config.vosk_model_path)
-    wake_transcriber = StreamingTranscriber(sample_rate=config.sample_rate_hz, model=model)
+    wake_transcriber = WakeGrammarRecognizer(model, config.sample_rate_hz, config.wake_variants)
 
     listener = WakeWordListener(
         wake_variants=config.wake_variants,
@@ -1255,7 +1255,7 @@ Examples:
 
     try:
         model = Model(config.vosk_model_path)
-        wake_transcriber = StreamingTranscriber(sample_rate=config.sample_rate_hz, model=model)
+        wake_transcriber = WakeGrammarRecognizer(model, config.sample_rate_hz, config.wake_variants)
         segment_transcriber = StreamingTranscriber(sample_rate=config.sample_rate_hz, model=model)
         logger.log("System", "✅ Vosk models loaded", level="SUCCESS")
     except Exception as e:
@@ -13,7 +13,7 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 from app.audio.mic import MicrophoneStream
 from app.audio.tts import SpeechSynthesizer
-from app.audio.stt import StreamingTranscriber
+from app.audio.stt import StreamingTranscriber, WakeGrammarRecognizer
 from app.audio.wake import WakeWordListener
 from app.util.config import load_config
 from vosk import Model
@@ -137,7 +137,7 @@ try:
     listener = WakeWordListener(
         wake_variants=[config.wake_word],
         on_detect=on_detect,
-        transcriber=stt,
+        transcriber=WakeGrammarRecognizer(model, config.sample_rate_hz, [config.wake_word]),
         sample_rate=config.sample_rate_hz,
         chunk_samples=config.chunk_samples,
         mic_device_name=config.mic_device_name,
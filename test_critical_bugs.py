@@ -18,7 +18,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from app.util.config import load_config
-from app.audio.stt import StreamingTranscriber
+from app.audio.stt import StreamingTranscriber, WakeGrammarRecognizer
 from app.audio.tts import SpeechSynthesizer
 from app.audio.wake import WakeWordListener
 from app.audio.mic import MicrophoneStream
@@ -67,7 +67,7 @@ def test_wake_word_detection(config, transcriber, logger):
     wake_listener = WakeWordListener(
         wake_variants=config.wake_variants,
         on_detect=on_wake_detect,
-        transcriber=transcriber,
+        transcriber=WakeGrammarRecognizer(transcriber.model, config.sample_rate_hz, config.wake_variants),
         sample_rate=config.sample_rate_hz,
         chunk_samples=config.chunk_samples,
         mic_device_name=config.mic_device_name,
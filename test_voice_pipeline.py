@@ -21,7 +21,7 @@ from vosk import Model
 from app.ai.vlm_client import VLMClient
 from app.audio.capture import run_segment, SegmentCaptureResult
 from app.audio.mic import MicrophoneStream
-from app.audio.stt import StreamingTranscriber
+from app.audio.stt import StreamingTranscriber, WakeGrammarRecognizer
 from app.audio.tts import SpeechSynthesizer
 from app.audio.wake import WakeWordListener
 from app.session import SessionCallbacks, SessionManager, SessionState
@@ -110,7 +110,7 @@ def test_1_speech_capture(config: AppConfig, transcriber: StreamingTranscriber)
         return success
 
 
-def test_2_wake_word_detection(config: AppConfig, wake_transcriber: StreamingTranscriber) -> bool:
+def test_2_wake_word_detection(config: AppConfig, wake_transcriber: WakeGrammarRecognizer) -> bool:
     """
     Test Issue #2: Unreliable Wake Word Detection
 
@@ -330,7 +330,7 @@ def main():
 
     try:
         model = Model(config.vosk_model_path)
-        wake_transcriber = StreamingTranscriber(sample_rate=config.sample_rate_hz, model=model)
+        wake_transcriber = WakeGrammarRecognizer(model, config.sample_rate_hz, config.wake_variants)
         segment_transcriber = StreamingTranscriber(sample_rate=config.sample_rate_hz, model=model)
     except Exception as e:
         print(f"❌ Failed to initialize Vosk: {e}", file=sys.stderr)
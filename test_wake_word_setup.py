@@ -9,7 +9,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from app.util.config import load_config
-from app.audio.stt import StreamingTranscriber
+from app.audio.stt import WakeGrammarRecognizer
 from app.audio.wake_hybrid import create_wake_listener
 from vosk import Model
 import os
@@ -41,7 +41,7 @@ def test_wake_word_setup():
         return
     
     model = Model(model_path)
-    transcriber = StreamingTranscriber(sample_rate=config.sample_rate_hz, model=model)
+    transcriber = WakeGrammarRecognizer(model, config.sample_rate_hz, config.wake_variants)
     print(f"   ✓ Vosk model loaded: {model_path}")
     
     # Create wake listener
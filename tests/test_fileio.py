@@ -0,0 +1,26 @@
+"""
+Unit tests for session archiving helpers (app/util/fileio.py)
+"""
+
+import json
+
+from app.util.fileio import archive_session
+
+
+class TestArchiveSession:
+    """Test suite for archive_session"""
+
+    def test_video_keeps_its_container_suffix(self, tmp_path):
+        video = tmp_path / "capture.avi"
+        video.write_bytes(b"RIFF")
+        session_dir = archive_session(tmp_path / "sessions", "20260101_120000", video, "hello", {"answer": "hi"})
+
+        assert (session_dir / "segment.avi").read_bytes() == b"RIFF"
+        assert not (session_dir / "segment.mp4").exists()
+        assert not video.exists()
+        assert (session_dir / "transcript.txt").read_text(encoding="utf-8") == "hello"
+        assert json.loads((session_dir / "answer.json").read_text(encoding="utf-8")) == {"answer": "hi"}
+
+    def test_missing_video_is_skipped(self, tmp_path):
+        session_dir = archive_session(tmp_path, "key", None, "", {})
+        assert sorted(path.name for path in session_dir.iterdir()) == ["answer.json", "transcript.txt"]
@@ -0,0 +1,89 @@
+"""
+Unit tests for the adaptive image budget (app/ai/budget.py)
+"""
+
+from app.ai.budget import ImageBudgeter, ImagePlan, crop_width, estimate_image_bytes, plan_for_intent
+
+
+class TestImageBudgeter:
+    """Test suite for ImageBudgeter"""
+
+    def test_unmeasured_uses_full_quality(self):
+        plan = ImageBudgeter().plan(max_images=6)
+        assert (plan.max_width, plan.jpeg_quality, plan.detail, plan.max_images) == (960, 85, "high", 6)
+
+    def test_fast_uplink_keeps_full_quality(self):
+        budgeter = ImageBudgeter(target_upload_ms=1000)
+        # 0.4 s base latency, 10 MB/s upload
+        for size in (2_000, 400_000, 1_000_000):
+            budgeter.record(size, 0.4 + size / 10_000_000)
+        throughput, base = budgeter.estimate()
+        assert abs(throughput - 10_000_000) / 10_000_000 < 0.01
+        assert abs(base - 0.4) < 0.01
+        plan = budgeter.plan(max_images=6)
+        assert plan.max_width == 960
+        assert plan.max_images == 6
+
+    def test_slow_uplink_shrinks_payload(self):
+        budgeter = ImageBudgeter(target_upload_ms=1000)
+        # 0.5 s base latency, 100 KB/s upload
+        for size in (2_000, 300_000, 600_000):
+            budgeter.record(size, 0.5 + size / 100_000)
+        plan = budgeter.plan(max_images=6)
+        assert plan.max_width < 960
+        assert plan.est_bytes <= plan.budget_bytes
+        assert 1 <= plan.max_images <= 2
+
+    def test_budget_below_one_image_still_sends_one(self):
+        budgeter = ImageBudgeter(target_upload_ms=100)
+        for size in (1_000, 500_000):
+            budgeter.record(size, 0.2 + size / 10_000)
+        plan = budgeter.plan(max_images=6)
+        assert plan.max_images == 1
+        assert plan.max_width == 512
+
+    def test_estimate_scales_with_width_and_quality(self):
+        assert estimate_image_bytes(960, 85) > estimate_image_bytes(640, 85) > estimate_image_bytes(640, 70)
+
+    def test_estimate_uses_crop_width(self):
+        # A 0.38 centre crop of a 960 px frame is sent at 364 px whatever the tier width
+        source = crop_width(960, 0.38)
+        assert source == 364
+        assert estimate_image_bytes(960, 85, source) == estimate_image_bytes(640, 85, source) == estimate_image_bytes(364, 85)
+        assert estimate_image_bytes(960, 85, source) < estimate_image_bytes(960, 85) / 6
+
+    def test_small_crop_fits_more_images(self):
+        budgeter = ImageBudgeter(target_upload_ms=1000)
+        # 0.5 s base latency, 100 KB/s upload
+        for size in (2_000, 300_000, 600_000):
+            budgeter.record(size, 0.5 + size / 100_000)
+        plan = budgeter.plan(max_images=6, source_width=crop_width(960, 0.38))
+        assert (plan.max_width, plan.jpeg_quality) == (960, 85)
+        assert plan.max_images == 3
+        assert plan.est_bytes <= plan.budget_bytes
+
+
+class TestPlanForIntent:
+    """Test suite for per-intent image policies"""
+
+    def setup_method(self):
+        self.plan = ImagePlan(max_width=640, jpeg_quality=75, detail="low", max_images=6)
+
+    def test_ocr_keeps_resolution_and_detail(self):
+        plan = plan_for_intent(self.plan, "ocr", crop_ratio=0.38)
+        assert plan.max_width >= 960
+        assert plan.jpeg_quality >= 85
+        assert plan.detail == "high"
+        assert plan.max_images <= 2
+
+    def test_color_sends_one_thumbnail(self):
+        plan = plan_for_intent(self.plan, "color", crop_ratio=0.38)
+        assert plan.max_width <= 256
+        assert plan.detail == "low"
+        assert plan.max_images == 1
+
+    def test_identify_uses_budget_and_configured_crop(self):
+        plan = plan_for_intent(self.plan, "identify", crop_ratio=0.38)
+        assert (plan.max_width, plan.jpeg_quality, plan.detail, plan.max_images) == (640, 75, "low", 6)
+        assert plan.crop_ratio == 0.38
+        assert plan.intent == "identify"
@@ -6,7 +6,13 @@ vision-related vs chat-related intents.
 """
 
 import pytest
-from app.util.intent import wants_vision
+from app.util.intent import (
+    StreamingVisionIntent,
+    classify_vision_intent,
+    find_vision_intent,
+    trigger_word_times,
+    wants_vision,
+)
 
 
 class TestWantsVision:
@@ -61,6 +67,9 @@ class TestWantsVision:
     def test_deictic_what_is_that(self):
         assert wants_vision("what is that") is True
 
+    def test_deictic_what_was_that(self):
+        assert wants_vision("what was that") is True
+
     def test_deictic_look_at(self):
         assert wants_vision("look at this object") is True
 
@@ -198,3 +207,90 @@ class TestWantsVision:
 
     def test_what_size(self):
         assert wants_vision("what size is that") is True
+
+
+class TestTriggerWordTimes:
+    """Test suite for trigger_word_times()"""
+
+    @staticmethod
+    def _words(*timed):
+        return [{"word": w, "start": t, "end": t + 0.2} for w, t in timed]
+
+    def test_deictic_word_time(self):
+        words = self._words(("what", 0.5), ("is", 0.8), ("this", 1.1))
+        assert trigger_word_times(words) == [1.1]
+
+    def test_ocr_and_deictic_times(self):
+        words = self._words(("read", 0.4), ("that", 0.7), ("and", 2.0), ("what", 2.3), ("is", 2.5), ("this", 2.7))
+        assert trigger_word_times(words) == [0.4, 2.7]
+
+    def test_no_trigger(self):
+        assert trigger_word_times(self._words(("tell", 0.2), ("me", 0.4), ("a", 0.5), ("joke", 0.6))) == []
+        assert trigger_word_times([]) == []
+
+
+class TestClassifyVisionIntent:
+    """Test suite for classify_vision_intent()"""
+
+    def test_ocr(self):
+        assert classify_vision_intent("read this label") == "ocr"
+
+    def test_count(self):
+        assert classify_vision_intent("how many apples are there") == "count"
+
+    def test_color(self):
+        assert classify_vision_intent("hey, what color is this") == "color"
+
+    def test_describe(self):
+        assert classify_vision_intent("what do you see") == "describe"
+
+    def test_identify_default(self):
+        assert classify_vision_intent("what is this") == "identify"
+
+    def test_non_vision(self):
+        assert classify_vision_intent("tell me a joke") is None
+        assert classify_vision_intent("hello") is None
+
+
+class TestStreamingVisionIntent:
+    """Test suite for StreamingVisionIntent (partial-transcript intent)"""
+
+    def test_triggers_once_after_stable_match(self):
+        detector = StreamingVisionIntent(stable_ms=300)
+        assert detector.update("what", now=0.0) is False
+        assert detector.update("what is this", now=0.1) is False
+        assert detector.update("what is this", now=0.3) is False
+        assert detector.update("what is this thing", now=0.45) is True
+        assert detector.triggered is True
+        assert detector.trigger_text == "what is this thing"
+        assert detector.update("what is this thing", now=1.0) is False
+
+    def test_flicker_resets_stability(self):
+        detector = StreamingVisionIntent(stable_ms=300)
+        detector.update("is this", now=0.0)
+        detector.update("is", now=0.2)
+        assert detector.update("is this", now=0.4) is False
+        assert detector.update("is this", now=0.75) is True
+
+    def test_chat_never_triggers(self):
+        detector = StreamingVisionIntent(stable_ms=0)
+        for step, text in enumerate(["hello", "hello how", "hello how are you"]):
+            assert detector.update(text, now=step * 0.1) is False
+        assert detector.triggered is False
+
+
+class TestFindVisionIntent:
+    """Test suite for find_vision_intent()"""
+
+    def test_reports_category_and_position(self):
+        match = find_vision_intent("Hey glasses, what is this")
+        assert match.category == "deictic"
+        assert "Hey glasses, what is this"[match.start:match.end] == "what is this"
+
+    def test_ocr_category(self):
+        match = find_vision_intent("could you read it")
+        assert (match.category, match.start) == ("ocr", 10)
+
+    def test_no_match(self):
+        assert find_vision_intent("hello, how are you") is None
+        assert find_vision_intent("   ") is None
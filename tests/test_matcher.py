@@ -0,0 +1,38 @@
+"""
+Unit tests for the precompiled pattern matcher (app/util/matcher.py)
+"""
+
+from app.util.matcher import PatternMatch, PatternMatcher
+
+
+MATCHER = PatternMatcher(
+    [
+        ("ocr", [r"\bread\b", r"\blabel\b"]),
+        ("count", [r"\bhow\s+many\b"]),
+    ]
+)
+
+
+class TestPatternMatcher:
+    """Test suite for PatternMatcher"""
+
+    def test_search_returns_leftmost_category_and_span(self):
+        assert MATCHER.search("How many can you read") == PatternMatch("count", 0, 8)
+        assert MATCHER.search("please read it") == PatternMatch("ocr", 7, 11)
+        assert MATCHER.search("nothing here") is None
+
+    def test_best_prefers_earlier_category_anywhere(self):
+        assert MATCHER.best("how many can you read") == PatternMatch("ocr", 17, 21)
+        assert MATCHER.best("how many") == PatternMatch("count", 0, 8)
+        assert MATCHER.best("") is None
+
+    def test_match_and_fullmatch_are_anchored(self):
+        assert MATCHER.match("read this") == PatternMatch("ocr", 0, 4)
+        assert MATCHER.match("now read") is None
+        assert MATCHER.fullmatch("label") == PatternMatch("ocr", 0, 5)
+        assert MATCHER.fullmatch("label it") is None
+
+    def test_suffix_applies_to_every_pattern(self):
+        matcher = PatternMatcher([("preface", [r"I see", r"From the image"])], suffix=r"(?:[\s,.:;-]+|$)")
+        assert matcher.match("From the image, a cup").end == 16
+        assert matcher.match("I seem fine") is None
@@ -0,0 +1,57 @@
+import pytest
+
+from app.audio.reblock import FrameReblocker
+
+
+def _pcm(start: int, count: int) -> bytes:
+    return bytes((start + i) % 256 for i in range(count))
+
+
+def test_capture_chunks_are_reblocked_to_frame_size():
+    rb = FrameReblocker(8192, 1024)
+
+    stream = _pcm(0, 640 * 8)
+    for offset in range(0, len(stream), 640):
+        rb.write(stream[offset : offset + 640])
+
+    frames = [bytes(f) for f in rb]
+    assert [len(f) for f in frames] == [1024] * 5
+    assert b"".join(frames) == stream[: 1024 * 5]
+    assert rb.pending_bytes == len(stream) - 1024 * 5
+
+
+def test_frames_are_contiguous_across_wraparound():
+    rb = FrameReblocker(1000, 300)
+    stream = _pcm(7, 3000)
+    collected = []
+    for offset in range(0, len(stream), 250):
+        rb.write(stream[offset : offset + 250])
+        for frame in rb:
+            assert isinstance(frame, memoryview)
+            collected.append(bytes(frame))
+    assert b"".join(collected) == stream[: len(collected) * 300]
+    assert len(collected) == 10
+
+
+def test_lapped_reader_skips_overwritten_audio():
+    rb = FrameReblocker(1000, 200)
+    stream = _pcm(0, 1600)
+    rb.write(stream)
+
+    frames = [bytes(f) for f in rb]
+    assert rb.dropped_bytes == 600
+    assert b"".join(frames) == stream[600:]
+
+
+def test_reset_discards_buffered_audio():
+    rb = FrameReblocker(1000, 200)
+    rb.write(_pcm(0, 300))
+    rb.reset()
+    assert rb.read() is None
+    rb.write(_pcm(50, 200))
+    assert bytes(rb.read()) == _pcm(50, 200)
+
+
+def test_frame_must_fit_twice():
+    with pytest.raises(ValueError):
+        FrameReblocker(1000, 600)
@@ -331,6 +331,96 @@ class TestRouteAndRespond:
         assert len(images_arg) == 3
         assert result["image_count"] == 3
 
+    def test_pre_wake_frames_share_image_budget(self):
+        """Test that pre-wake ring frames are sent first within max_images"""
+        self.mock_vlm_client.infer.return_value = {
+            "text": "That was a red bicycle.",
+            "payload": {},
+            "response": {},
+        }
+
+        pre_wake = [
+            np.random.randint(0, 256, (270, 480, 3), dtype=np.uint8)
+            for _ in range(2)
+        ]
+
+        result = route_and_respond(
+            config=self.config,
+            vlm_client=self.mock_vlm_client,
+            transcript="what was that",
+            segment_frames=self.sample_frames,
+            pre_wake_frames=pre_wake,
+        )
+
+        images_arg = self.mock_vlm_client.infer.call_args[0][1]
+        assert len(images_arg) <= 6
+        assert result["pre_wake_image_count"] == 2
+
+    def test_frames_aligned_to_trigger_words(self):
+        """Test that the frame nearest the spoken "this" is sent instead of a spread"""
+        self.mock_vlm_client.infer.return_value = {
+            "text": "That is a mug.",
+            "payload": {},
+            "response": {},
+        }
+
+        timestamps = [0.5 * i for i in range(len(self.sample_frames))]
+        words = [
+            {"word": "what", "start": 1.6, "end": 1.8},
+            {"word": "is", "start": 1.8, "end": 1.9},
+            {"word": "this", "start": 2.1, "end": 2.4},
+        ]
+
+        result = route_and_respond(
+            config=self.config,
+            vlm_client=self.mock_vlm_client,
+            transcript="what is this",
+            segment_frames=self.sample_frames,
+            frame_timestamps=timestamps,
+            words=words,
+        )
+
+        assert result["image_count"] == 1
+        assert result["aligned_image_count"] == 1
+
+    def test_color_question_sends_low_detail_thumbnail(self):
+        """Test that a colour question sends one small low-detail image"""
+        self.mock_vlm_client.infer.return_value = {
+            "text": "It is blue.",
+            "payload": {},
+            "response": {},
+        }
+
+        result = route_and_respond(
+            config=self.config,
+            vlm_client=self.mock_vlm_client,
+            transcript="what color is this",
+            segment_frames=self.sample_frames,
+        )
+
+        assert result["vision_intent"] == "color"
+        assert result["image_count"] == 1
+        assert self.mock_vlm_client.infer.call_args[1]["image_detail"] == "low"
+
+    def test_pre_wake_frames_ignored_for_chat(self):
+        """Test that pre-wake frames are not sent for chat-only queries"""
+        self.mock_vlm_client.infer.return_value = {
+            "text": "Hello!",
+            "payload": {},
+            "response": {},
+        }
+
+        result = route_and_respond(
+            config=self.config,
+            vlm_client=self.mock_vlm_client,
+            transcript="hi",
+            segment_frames=self.sample_frames,
+            pre_wake_frames=[np.zeros((270, 480, 3), dtype=np.uint8)],
+        )
+
+        assert self.mock_vlm_client.infer.call_args[0][1] == []
+        assert result["pre_wake_image_count"] == 0
+
     # --- Metadata Tests ---
 
     def test_metadata_vision_used_true(self):
@@ -373,6 +463,29 @@ class TestRouteAndRespond:
         assert "image_count" in result
         assert result["image_count"] == 0
 
+    def test_image_budget_logs_jpeg_bytes(self, monkeypatch):
+        """Test that the logged image size is decoded JPEG bytes, not base64 characters"""
+        import base64
+
+        import app.route as route_module
+
+        event_logger = Mock()
+        monkeypatch.setattr(route_module, "get_event_logger", lambda: event_logger)
+        self.mock_vlm_client.infer.return_value = {"text": "A mug.", "payload": {}, "response": {}}
+
+        route_and_respond(
+            config=self.config,
+            vlm_client=self.mock_vlm_client,
+            transcript="what is this",
+            segment_frames=self.sample_frames,
+        )
+
+        images_arg = self.mock_vlm_client.infer.call_args[0][1]
+        budget_calls = [c for c in event_logger.log_metrics.call_args_list if c[0][0] == "vision.image_budget"]
+        logged = budget_calls[0][0][1]["image_bytes"]
+        assert logged == sum(len(base64.b64decode(image)) for image in images_arg)
+        assert logged < sum(len(image) for image in images_arg)
+
     # --- Response Passthrough Tests ---
 
     def test_response_passthrough(self):
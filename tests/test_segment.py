@@ -0,0 +1,285 @@
+"""
+Unit tests for SegmentRecorder.record_segment (app/segment.py)
+
+The microphone, recognizer loop and camera are replaced with fakes so the
+eager and lazy (``camera_lazy_start``) camera paths run without devices.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+import app.segment as segment
+import app.video.camera as camera_module
+from app.audio.capture import SegmentCaptureResult
+from app.util.config import AppConfig
+
+
+class FakeMic:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeGrabber:
+    def __init__(self):
+        self.listeners = []
+        self.frame_count = 0
+        self.failure_count = 0
+        self._latest = None
+
+    def push(self, timestamp):
+        self.frame_count += 1
+        self._latest = segment.GrabbedFrame(
+            frame=np.zeros((48, 64, 3), dtype=np.uint8), seq=self.frame_count, timestamp=timestamp
+        )
+        for callback, _ in list(self.listeners):
+            callback(self._latest)
+
+    def latest(self):
+        return self._latest
+
+    def add_listener(self, callback, fps=None):
+        self.listeners.append((callback, fps))
+
+    def remove_listener(self, callback):
+        self.listeners = [(cb, fps) for cb, fps in self.listeners if cb != callback]
+
+    def stats(self):
+        return {"frames": self.frame_count, "failures": 0, "frame_age_ms": {}}
+
+
+class FakeCameraManager:
+    passthrough = False
+
+    def __init__(self):
+        self.grabber = FakeGrabber()
+        self.acquired = 0
+        self.released = 0
+
+    def acquire(self):
+        self.acquired += 1
+        if self.grabber.latest() is None:
+            self.grabber.push(time.monotonic())
+        return self.grabber
+
+    def wait_until_warm(self, timeout=5.0):
+        return self.grabber.latest()
+
+    def release(self):
+        self.released += 1
+
+    def fps(self):
+        return 30.0
+
+    def capture(self, timeout=5.0):
+        self.acquire()
+        self.release()
+        return self.grabber.latest()
+
+
+class FakeTranscriber:
+    pass
+
+
+def _fake_run_segment(partials, camera):
+    """Build a run_segment stand-in that reports ``partials`` and pushes frames."""
+
+    def run_segment(*, on_chunk=None, on_partial=None, **kwargs):
+        for index, text in enumerate(partials):
+            on_chunk()
+            if on_partial:
+                on_partial(text)
+            time.sleep(0.05)  # let a lazy start thread attach
+            camera.grabber.push(time.monotonic() + index)
+        final = partials[-1]
+        return SegmentCaptureResult(
+            transcript=final,
+            clean_transcript=final,
+            audio_bytes=b"\x00\x00" * 1600,
+            stop_reason="silence",
+            duration_ms=100,
+            audio_ms=100,
+            partial_events=[],
+            final_event=None,
+        )
+
+    return run_segment
+
+
+@pytest.fixture
+def recorder_factory(monkeypatch):
+    def build(partials, **overrides):
+        camera = FakeCameraManager()
+        monkeypatch.setattr(segment, "MicrophoneStream", FakeMic)
+        monkeypatch.setattr(segment, "camera_manager_for_config", lambda config: camera)
+        monkeypatch.setattr(segment, "run_segment", _fake_run_segment(partials, camera))
+        options = dict(
+            save_segment_video=False,
+            frame_store_jpeg_quality=0,
+            frame_store_dedupe_bits=0,
+            frame_sample_fps=0,
+            vision_intent_stable_ms=0,
+        )
+        options.update(overrides)
+        config = AppConfig(**options)
+        return segment.SegmentRecorder(config, FakeTranscriber()), camera
+
+    return build
+
+
+class TestRecordSegment:
+    """Test suite for SegmentRecorder.record_segment()"""
+
+    def test_eager_camera_records_frames(self, recorder_factory):
+        recorder, camera = recorder_factory(["hello", "hello there"], camera_lazy_start=False)
+        result = recorder.record_segment()
+
+        assert camera.acquired == camera.released == 1
+        assert len(result.frames) >= 2
+        assert len(result.frame_timestamps) == len(result.frames)
+        assert result.loop_stats["audio_chunks"] == 2
+        assert result.loop_stats["camera_started"] is True
+        assert result.video_path is None
+
+    def test_lazy_chat_turn_never_opens_camera(self, recorder_factory):
+        recorder, camera = recorder_factory(["hello", "hello how are you"], camera_lazy_start=True)
+        result = recorder.record_segment()
+
+        assert camera.acquired == 0
+        assert len(result.frames) == 0
+        assert result.loop_stats["camera_started"] is False
+        assert result.loop_stats["audio_chunks"] == 2
+        assert result.audio_path.exists()
+
+    def test_lazy_vision_turn_starts_camera_on_partial(self, recorder_factory):
+        partials = ["what", "what is this", "what is this thing", "what is this thing here"]
+        recorder, camera = recorder_factory(partials, camera_lazy_start=True)
+        result = recorder.record_segment()
+
+        assert camera.acquired == camera.released == 1
+        assert result.loop_stats["camera_started"] is True
+        assert len(result.frames) >= 2
+
+    def test_lazy_late_intent_captures_one_frame(self, recorder_factory, monkeypatch):
+        recorder, camera = recorder_factory(["hmm"], camera_lazy_start=True)
+        # Intent only appears in the final transcript
+        segment_run = segment.run_segment
+
+        def run_segment(**kwargs):
+            result = segment_run(**{**kwargs, "on_partial": None})
+            result.clean_transcript = "read the label"
+            return result
+
+        monkeypatch.setattr(segment, "run_segment", run_segment)
+        result = recorder.record_segment()
+
+        assert result.loop_stats["camera_started"] is False
+        assert len(result.frames) == 1
+
+
+class FakeDevice:
+    """VideoCapture stand-in for a real CameraManager/FrameGrabber (~500 reads/s)."""
+
+    passthrough = False
+    low_latency = False
+
+    def __init__(self, **settings):
+        pass
+
+    def start(self):
+        pass
+
+    def release(self):
+        pass
+
+    def grab(self):
+        time.sleep(0.002)
+        return True
+
+    def retrieve(self):
+        return True, np.zeros((48, 64, 3), dtype=np.uint8)
+
+    def reconnect(self):
+        pass
+
+    def position_ms(self):
+        return 0.0
+
+    def fps(self):
+        return 30.0
+
+    def frame_size(self):
+        return 64, 48
+
+
+class FakeVideoWriter:
+    def __init__(self, path, fps, frame_size, **kwargs):
+        self.path = path
+        self.fps = fps
+        self.frames = 0
+
+    def write(self, frame):
+        self.frames += 1
+
+    def write_jpeg(self, data):
+        self.frames += 1
+
+    def close(self):
+        return {"written": self.frames}
+
+
+class TestSegmentCameraDecimation:
+    """Decode cost of a recorded segment with a real grabber"""
+
+    @pytest.fixture
+    def record(self, monkeypatch):
+        def run(**overrides):
+            monkeypatch.setattr(camera_module, "VideoCapture", FakeDevice)
+            monkeypatch.setattr(camera_module, "_MANAGER", None)
+            monkeypatch.setattr(segment, "MicrophoneStream", FakeMic)
+            monkeypatch.setattr(segment, "AsyncVideoWriter", FakeVideoWriter)
+
+            def run_segment(*, on_chunk=None, on_partial=None, **kwargs):
+                for _ in range(12):
+                    on_chunk()
+                    if on_partial:
+                        on_partial("what is this")
+                    time.sleep(0.1)
+                return SegmentCaptureResult(
+                    transcript="what is this",
+                    clean_transcript="what is this",
+                    audio_bytes=b"\x00\x00" * 1600,
+                    stop_reason="silence",
+                    duration_ms=1200,
+                    audio_ms=1200,
+                    partial_events=[],
+                    final_event=None,
+                )
+
+            monkeypatch.setattr(segment, "run_segment", run_segment)
+            # Defaults apart from a short warm-up for the fake device
+            config = AppConfig(camera_warmup_ms=0, camera_warmup_frames=1, **overrides)
+            try:
+                return segment.SegmentRecorder(config, FakeTranscriber()).record_segment()
+            finally:
+                camera_module._MANAGER.shutdown()
+
+        return run
+
+    def test_default_config_decodes_a_fraction_of_frames(self, record):
+        result = record()
+        camera = result.loop_stats["camera"]
+        assert result.loop_stats["camera_started"] is True
+        assert result.loop_stats["encoder"]["written"] > 0
+        assert camera["decode_ratio"] < 0.2
+
+    def test_full_rate_archive_decodes_every_frame(self, record):
+        result = record(segment_video_fps=0)
+        assert result.loop_stats["camera"]["decode_ratio"] > 0.9
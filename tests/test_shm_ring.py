@@ -0,0 +1,77 @@
+import multiprocessing
+
+import pytest
+
+from app.audio.shm_ring import SharedFrameRing
+
+
+def _frame(value: int, size: int = 8) -> bytes:
+    return bytes([value % 256]) * size
+
+
+def _write_frames(name: str, frame_bytes: int, capacity: int, count: int) -> None:
+    ring = SharedFrameRing(frame_bytes, capacity, name=name)
+    try:
+        for seq in range(count):
+            ring.write(_frame(seq, frame_bytes))
+    finally:
+        ring.close()
+
+
+def test_write_and_read_by_sequence():
+    with SharedFrameRing(frame_bytes=8, capacity=4) as ring:
+        assert ring.write(_frame(1)) == 0
+        assert ring.write(_frame(2)) == 1
+        assert ring.write_seq == 2
+        assert ring.read(0) == _frame(1)
+        assert ring.read(1) == _frame(2)
+        assert ring.read(2) is None
+
+
+def test_overwritten_frames_are_unavailable():
+    with SharedFrameRing(frame_bytes=8, capacity=3) as ring:
+        for value in range(5):
+            ring.write(_frame(value))
+        assert ring.oldest_seq() == 2
+        assert ring.read(1) is None
+        assert ring.frames(0, ring.write_seq) == [_frame(2), _frame(3), _frame(4)]
+
+
+def test_reader_attaches_by_name():
+    with SharedFrameRing(frame_bytes=8, capacity=4) as writer:
+        writer.write(_frame(7))
+        reader = SharedFrameRing(frame_bytes=8, capacity=4, name=writer.name)
+        try:
+            assert reader.write_seq == 1
+            assert reader.read(0) == _frame(7)
+            writer.write(_frame(8))
+            assert reader.frames(0, reader.write_seq) == [_frame(7), _frame(8)]
+        finally:
+            reader.close()
+
+
+def test_rejects_wrong_frame_size():
+    with SharedFrameRing(frame_bytes=8, capacity=2) as ring:
+        with pytest.raises(ValueError):
+            ring.write(b"short")
+
+
+def test_reads_at_oldest_seq_are_never_torn():
+    frame_bytes, capacity, count = 256 * 1024, 4, 3000
+    with SharedFrameRing(frame_bytes, capacity) as ring:
+        writer = multiprocessing.Process(target=_write_frames, args=(ring.name, frame_bytes, capacity, count))
+        writer.start()
+        checked = 0
+        try:
+            while writer.is_alive():
+                seq = ring.oldest_seq()
+                frame = ring.read(seq)
+                if frame is None:
+                    continue
+                # A torn frame mixes bytes of two writes
+                assert frame == _frame(seq, frame_bytes), f"torn frame at seq {seq}"
+                checked += 1
+        finally:
+            writer.join(timeout=30)
+        assert writer.exitcode == 0
+        assert checked > 0
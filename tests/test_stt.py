@@ -0,0 +1,167 @@
+"""
+Unit tests for StreamingTranscriber result handling (app/audio/stt.py)
+
+The Vosk recognizer is replaced with a scripted fake so the JSON shapes Vosk
+returns (plain and n-best) can be fed directly.
+"""
+
+import json
+
+import pytest
+
+import app.audio.stt as stt
+
+
+# Vosk output with SetMaxAlternatives(n > 0): no top-level "result".
+NBEST_RESULT = {
+    "alternatives": [
+        {
+            "text": "read the label",
+            "confidence": 312.5,
+            "result": [
+                {"word": "read", "start": 0.42, "end": 0.66},
+                {"word": "the", "start": 0.66, "end": 0.78},
+                {"word": "label", "start": 0.78, "end": 1.2},
+            ],
+        },
+        {"text": "read the table", "confidence": 298.1, "result": []},
+    ]
+}
+
+PLAIN_RESULT = {
+    "text": "read the label",
+    "result": [
+        {"word": "read", "start": 0.42, "end": 0.66, "conf": 0.95},
+        {"word": "the", "start": 0.66, "end": 0.78, "conf": 1.0},
+        {"word": "label", "start": 0.78, "end": 1.2, "conf": 0.5},
+    ],
+}
+
+
+class FakeRecognizer:
+    final_result = {}
+
+    def __init__(self, model, sample_rate):
+        pass
+
+    def SetWords(self, enabled):
+        pass
+
+    def SetMaxAlternatives(self, count):
+        pass
+
+    def SetGrammar(self, grammar):
+        pass
+
+    def FinalResult(self):
+        return json.dumps(self.final_result)
+
+
+@pytest.fixture
+def transcriber_for(monkeypatch):
+    def build(final_result):
+        monkeypatch.setattr(stt, "KaldiRecognizer", FakeRecognizer)
+        monkeypatch.setattr(FakeRecognizer, "final_result", final_result)
+        return stt.StreamingTranscriber(model=object(), max_alternatives=5)
+
+    return build
+
+
+class TestWordResults:
+    """Test suite for word timings and confidence from Vosk results"""
+
+    def test_nbest_result_records_words(self, transcriber_for):
+        transcriber = transcriber_for(NBEST_RESULT)
+        assert transcriber.finalize() == "read the label"
+        assert [w["word"] for w in transcriber.words] == ["read", "the", "label"]
+        assert transcriber.words[2] == {"word": "label", "start": 0.78, "end": 1.2}
+
+    def test_nbest_result_without_word_conf(self, transcriber_for):
+        transcriber = transcriber_for(NBEST_RESULT)
+        transcriber.finalize()
+        # n-best word entries carry no per-word "conf"
+        assert transcriber.get_average_confidence() is None
+        assert transcriber.get_low_confidence_words() == []
+
+    def test_plain_result_records_words_and_confidence(self, transcriber_for):
+        transcriber = transcriber_for(PLAIN_RESULT)
+        transcriber.finalize()
+        assert len(transcriber.words) == 3
+        assert transcriber.get_average_confidence() == pytest.approx(0.8167, abs=1e-3)
+        assert [w["word"] for w in transcriber.get_low_confidence_words()] == ["label"]
+
+    def test_words_fallback_when_text_missing(self, transcriber_for):
+        result = {"alternatives": [{"text": "", "result": NBEST_RESULT["alternatives"][0]["result"]}]}
+        transcriber = transcriber_for(result)
+        assert transcriber.finalize() == "read the label"
+
+
+class GrammarRecognizer:
+    """Stand-in for KaldiRecognizer built with a grammar; records every call."""
+
+    instances = []
+
+    def __init__(self, model, sample_rate, grammar=None):
+        self.grammar = json.loads(grammar) if grammar is not None else None
+        self.calls = []
+        self.results = []
+        GrammarRecognizer.instances.append(self)
+
+    def __getattr__(self, name):
+        # SetWords, SetMaxAlternatives, SetGrammar, ... are recorded, not applied
+        return lambda *args: self.calls.append(name)
+
+    def Reset(self):
+        self.calls.append("Reset")
+
+    def AcceptWaveform(self, data):
+        return bool(self.results)
+
+    def Result(self):
+        return json.dumps({"text": self.results.pop(0)})
+
+    def PartialResult(self):
+        return json.dumps({"partial": "hey [unk]"})
+
+
+@pytest.fixture
+def wake_recognizer(monkeypatch):
+    GrammarRecognizer.instances = []
+    monkeypatch.setattr(stt, "KaldiRecognizer", GrammarRecognizer)
+    return stt.WakeGrammarRecognizer(object(), 16000, ["Hey Glasses", "hey-glasses", "okay glasses"])
+
+
+class TestWakeGrammarRecognizer:
+    """Test suite for the wake-only grammar recognizer"""
+
+    def test_grammar_is_variants_plus_unknown(self, wake_recognizer):
+        expected = ["hey glasses", "okay glasses", "[unk]"]
+        assert list(wake_recognizer.grammar) == expected
+        assert GrammarRecognizer.instances[0].grammar == expected
+
+    def test_empty_grammar_is_rejected(self, monkeypatch):
+        monkeypatch.setattr(stt, "KaldiRecognizer", GrammarRecognizer)
+        with pytest.raises(ValueError):
+            stt.WakeGrammarRecognizer(object(), 16000, ["", "  "])
+
+    def test_reset_reuses_recognizer(self, wake_recognizer):
+        recognizer = wake_recognizer.recognizer
+        recognizer.results = ["hey glasses"]
+        wake_recognizer.feed(b"\x00" * 640)
+        assert wake_recognizer.transcript == "hey glasses"
+
+        wake_recognizer.reset()
+        wake_recognizer.start()
+        assert wake_recognizer.recognizer is recognizer
+        assert len(GrammarRecognizer.instances) == 1
+        assert recognizer.calls == ["Reset", "Reset"]
+        assert wake_recognizer.combined_text == ""
+
+    def test_no_word_timings_or_alternatives(self, wake_recognizer):
+        wake_recognizer.feed(b"\x00" * 640)
+        assert wake_recognizer.recognizer.calls == []
+        # "[unk]" is stripped from partial and final text
+        assert wake_recognizer.partial == "hey"
+        wake_recognizer.recognizer.results = ["[unk] hey glasses [unk]"]
+        result = wake_recognizer.feed(b"\x00" * 640)
+        assert result.is_final and result.text == "hey glasses"
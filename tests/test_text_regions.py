@@ -0,0 +1,36 @@
+"""
+Unit tests for OCR text-region cropping (app/video/text_regions.py)
+"""
+
+import numpy as np
+import cv2
+
+from app.video.text_regions import crop_text_regions, find_text_regions
+
+
+def _label_frame():
+    frame = np.full((720, 1280, 3), 200, dtype=np.uint8)
+    cv2.rectangle(frame, (700, 400), (1100, 520), (255, 255, 255), -1)
+    cv2.putText(frame, "PRICE 4.99", (720, 480), cv2.FONT_HERSHEY_SIMPLEX, 1.6, (0, 0, 0), 4)
+    return frame
+
+
+class TestTextRegions:
+    """Test suite for find_text_regions() and crop_text_regions()"""
+
+    def test_finds_printed_text(self):
+        boxes = find_text_regions(_label_frame())
+        assert boxes
+        x, y, w, h = boxes[0]
+        # The best box covers the printed line
+        assert x <= 730 and x + w >= 900
+        assert y <= 450 and y + h >= 470
+
+    def test_blank_frame_has_no_regions(self):
+        assert find_text_regions(np.full((480, 640, 3), 128, dtype=np.uint8)) == []
+
+    def test_crops_are_native_resolution_and_small(self):
+        frame = _label_frame()
+        crops = crop_text_regions([frame], max_regions=2)
+        assert 1 <= len(crops) <= 2
+        assert crops[0].shape[0] * crops[0].shape[1] < 0.25 * frame.shape[0] * frame.shape[1]
@@ -0,0 +1,152 @@
+"""
+Unit tests for the shared, warmed camera (app/video/camera.py)
+
+The OpenCV capture is replaced with a fake device that counts how often it is
+opened, so warm-up, idle power-down and manager reuse are observable.
+"""
+
+import time
+
+import numpy as np
+import pytest
+
+import app.video.camera as camera_module
+from app.video.camera import CameraManager, get_camera_manager
+
+
+class FakeDevice:
+    """Stand-in for VideoCapture producing small frames every few ms."""
+
+    opened = []
+
+    def __init__(self, source=0, width=None, mjpeg=False, passthrough=False, low_latency=False):
+        self.source = source
+        self.passthrough = passthrough
+        self.low_latency = low_latency
+        self.released = False
+
+    def start(self):
+        FakeDevice.opened.append(self)
+
+    def release(self):
+        self.released = True
+
+    def grab(self):
+        time.sleep(0.002)
+        return True
+
+    def retrieve(self):
+        return True, np.zeros((4, 4, 3), dtype=np.uint8)
+
+    def reconnect(self):
+        pass
+
+    def position_ms(self):
+        return 0.0
+
+    def fps(self):
+        return 30.0
+
+    def frame_size(self):
+        return 4, 4
+
+
+@pytest.fixture(autouse=True)
+def fake_device(monkeypatch):
+    FakeDevice.opened = []
+    monkeypatch.setattr(camera_module, "VideoCapture", FakeDevice)
+    monkeypatch.setattr(camera_module, "_MANAGER", None)
+    yield FakeDevice
+    if camera_module._MANAGER is not None:
+        camera_module._MANAGER.shutdown()
+
+
+def _manager(**options):
+    options.setdefault("warmup_ms", 100)
+    options.setdefault("warmup_frames", 3)
+    return CameraManager(0, **options)
+
+
+class TestCameraManager:
+    """Test suite for CameraManager"""
+
+    def test_warmup_paid_once(self, fake_device):
+        manager = _manager(idle_timeout_s=30.0)
+        started = time.monotonic()
+        assert manager.capture(timeout=2.0) is not None
+        first_s = time.monotonic() - started
+
+        started = time.monotonic()
+        assert manager.capture(timeout=2.0) is not None
+        second_s = time.monotonic() - started
+
+        assert first_s >= 0.1
+        assert second_s < first_s
+        assert len(fake_device.opened) == 1
+        assert manager.is_open
+        manager.shutdown()
+        assert fake_device.opened[0].released
+
+    def test_idle_watchdog_powers_down(self, fake_device):
+        manager = _manager(idle_timeout_s=0.2)
+        manager.acquire()
+        time.sleep(0.4)
+        assert manager.is_open  # held by a user
+        manager.release()
+        deadline = time.monotonic() + 2.0
+        while manager.is_open and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert not manager.is_open
+        assert fake_device.opened[0].released
+
+        # The next use powers up again
+        manager.capture(timeout=2.0)
+        assert len(fake_device.opened) == 2
+        manager.shutdown()
+
+    def test_zero_idle_timeout_closes_on_release(self, fake_device):
+        manager = _manager(idle_timeout_s=0)
+        manager.acquire()
+        manager.acquire()
+        manager.release()
+        assert manager.is_open
+        manager.release()
+        assert not manager.is_open
+        assert fake_device.opened[0].released
+
+
+class TestGetCameraManager:
+    """Test suite for the shared manager's reuse/recreate rules"""
+
+    def test_same_source_is_reused(self):
+        manager = get_camera_manager(0, 640, idle_timeout_s=5.0)
+        assert get_camera_manager(0) is manager
+        assert get_camera_manager() is manager
+        # Same device settings, new tuning: updated in place
+        assert get_camera_manager("0", 640, idle_timeout_s=9.0) is manager
+        assert manager.idle_timeout_s == 9.0
+
+    def test_source_none_follows_shared_camera(self):
+        manager = get_camera_manager("rtsp://camera.local/stream", 640)
+        assert get_camera_manager(None) is manager
+
+    def test_idle_manager_is_recreated_for_new_settings(self, fake_device):
+        manager = get_camera_manager(0, 640)
+        manager.capture(timeout=2.0)
+        replacement = get_camera_manager(0, 320)
+        assert replacement is not manager
+        assert not manager.is_open
+        assert fake_device.opened[0].released
+
+    def test_manager_in_use_is_not_replaced(self, fake_device):
+        manager = get_camera_manager("rtsp://camera.local/stream", 640)
+        grabber = manager.acquire()
+        seen = []
+        grabber.add_listener(seen.append)
+        with pytest.raises(RuntimeError):
+            get_camera_manager(0)
+        assert get_camera_manager(None) is manager
+        assert manager.is_open and grabber.is_alive()
+        time.sleep(0.05)
+        assert seen
+        manager.release()
@@ -0,0 +1,58 @@
+"""
+Unit tests for the OpenCV capture wrapper (app/video/capture.py)
+"""
+
+import os
+
+import app.video.capture as capture_module
+from app.video.capture import FFMPEG_OPTIONS_ENV, LOW_LATENCY_FFMPEG_OPTIONS, VideoCapture
+
+
+class RecordingCapture:
+    """Stand-in for cv2.VideoCapture that records the FFmpeg options seen at open."""
+
+    opened = []
+
+    def __init__(self, source, *args):
+        RecordingCapture.opened.append((source, os.environ.get(FFMPEG_OPTIONS_ENV)))
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        return True
+
+    def get(self, prop):
+        return 0.0
+
+    def release(self):
+        pass
+
+
+class TestLowLatencyOpen:
+    """Test suite for VideoCapture low-latency opening"""
+
+    def setup_method(self):
+        RecordingCapture.opened = []
+
+    def test_ffmpeg_options_only_during_open(self, monkeypatch):
+        monkeypatch.delenv(FFMPEG_OPTIONS_ENV, raising=False)
+        monkeypatch.setattr(capture_module.cv2, "VideoCapture", RecordingCapture)
+        camera = VideoCapture("rtsp://camera.local/stream", low_latency=True)
+        camera.start()
+        camera.release()
+        VideoCapture("clip.mp4").start()
+
+        assert RecordingCapture.opened == [
+            ("rtsp://camera.local/stream", LOW_LATENCY_FFMPEG_OPTIONS),
+            ("clip.mp4", None),
+        ]
+        assert FFMPEG_OPTIONS_ENV not in os.environ
+
+    def test_user_options_are_kept(self, monkeypatch):
+        monkeypatch.setenv(FFMPEG_OPTIONS_ENV, "rtsp_transport;udp")
+        monkeypatch.setattr(capture_module.cv2, "VideoCapture", RecordingCapture)
+        VideoCapture("rtsp://camera.local/stream", low_latency=True).start()
+
+        assert RecordingCapture.opened == [("rtsp://camera.local/stream", "rtsp_transport;udp")]
+        assert os.environ[FFMPEG_OPTIONS_ENV] == "rtsp_transport;udp"
@@ -0,0 +1,88 @@
+"""
+Unit tests for in-memory candidate frame sampling (app/video/frames.py)
+"""
+
+import numpy as np
+
+from app.video.frames import CandidateFrameBuffer, FrameStore
+from app.video.grabber import GrabbedFrame
+
+
+def _grabbed(seq, timestamp, width=640):
+    return GrabbedFrame(frame=np.zeros((width // 2, width, 3), dtype=np.uint8), seq=seq, timestamp=timestamp)
+
+
+def test_offer_respects_sample_rate():
+    buffer = CandidateFrameBuffer(sample_fps=2, max_candidates=10, max_width=640)
+    kept = [buffer.offer(_grabbed(i, i / 30.0)) for i in range(30)]  # 1 s at 30 fps
+    assert sum(kept) == 2
+    assert len(buffer) == 2
+
+
+def test_buffer_thins_but_spans_whole_segment():
+    buffer = CandidateFrameBuffer(sample_fps=10, max_candidates=8, max_width=640)
+    for i in range(300):  # 10 s at 30 fps
+        buffer.offer(_grabbed(i, i / 30.0))
+    candidates = buffer.candidates()
+    assert len(candidates) <= 8
+    assert candidates[0].seq == 0
+    assert candidates[-1].timestamp > 8.0
+
+
+def test_select_is_evenly_spaced_and_downscaled():
+    buffer = CandidateFrameBuffer(sample_fps=1, max_candidates=20, max_width=320)
+    for i in range(10):
+        buffer.offer(_grabbed(i, float(i)))
+    selected = buffer.select(4)
+    assert [g.seq for g in selected] == [0, 3, 6, 9]
+    assert all(g.frame.shape[1] == 320 for g in selected)
+
+
+def _textured(seq, timestamp, seed):
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 255, size=(240, 320, 3), dtype=np.uint8)
+    return GrabbedFrame(frame=frame, seq=seq, timestamp=timestamp)
+
+
+def test_jpeg_storage_is_compact_and_decodes_on_demand():
+    buffer = CandidateFrameBuffer(sample_fps=1, max_candidates=10, max_width=320, jpeg_quality=90)
+    for i in range(4):
+        buffer.offer(_grabbed(i, float(i), width=320))
+    store = FrameStore(buffer.candidates())
+    assert len(store) == 4
+    assert store.nbytes < 4 * 160 * 320 * 3 // 10
+    assert store[0].shape == (160, 320, 3)
+    assert [f.shape for f in store[1:3]] == [(160, 320, 3)] * 2
+    assert buffer.high_water_bytes >= buffer.memory_bytes > 0
+
+
+def test_near_duplicates_are_skipped():
+    buffer = CandidateFrameBuffer(sample_fps=1, max_candidates=10, max_width=320, dedupe_bits=3)
+    kept = [buffer.offer(_textured(i, float(i), seed=0)) for i in range(3)]
+    kept.append(buffer.offer(_textured(3, 3.0, seed=1)))
+    assert kept == [True, False, False, True]
+    assert buffer.duplicates_skipped == 2
+
+
+def test_sharper_repeat_replaces_blurred_frame():
+    import cv2
+
+    rng = np.random.default_rng(7)
+    scene = cv2.resize(rng.integers(0, 256, (12, 16, 3), dtype=np.uint8), (320, 240), interpolation=cv2.INTER_NEAREST)
+    sharp = GrabbedFrame(frame=scene, seq=1, timestamp=1.0)
+    blurred = GrabbedFrame(frame=cv2.GaussianBlur(sharp.frame, (9, 9), 0), seq=0, timestamp=0.0)
+    buffer = CandidateFrameBuffer(sample_fps=1, max_candidates=10, max_width=320, dedupe_bits=3)
+    kept = [buffer.offer(blurred), buffer.offer(sharp), buffer.offer(GrabbedFrame(frame=blurred.frame, seq=2, timestamp=2.0))]
+    assert kept == [True, True, False]
+    assert [g.seq for g in buffer.candidates()] == [1]
+    assert buffer.duplicates_replaced == 1
+    assert buffer.duplicates_skipped == 2
+
+
+def test_byte_cap_thins_pool():
+    buffer = CandidateFrameBuffer(sample_fps=1, max_candidates=50, max_width=320, max_bytes=4 * 240 * 320 * 3)
+    for i in range(20):
+        buffer.offer(_textured(i, float(i), seed=i))
+    assert buffer.memory_bytes <= 4 * 240 * 320 * 3
+    assert buffer.candidates()[0].seq == 0
+    assert buffer.high_water_bytes > buffer.memory_bytes
@@ -0,0 +1,109 @@
+"""
+Unit tests for the background frame grabber (app/video/grabber.py)
+"""
+
+import threading
+import time
+
+import numpy as np
+
+from app.video.grabber import FrameGrabber
+
+
+class FakeCamera:
+    """Scripted stand-in for VideoCapture: yields frames, can drop out and come back."""
+
+    source = "rtsp://camera.local/stream"
+
+    def __init__(self, fail_reads=0, fail_reconnects=0):
+        self.fail_reads = fail_reads
+        self.fail_reconnects = fail_reconnects
+        self.reconnects = 0
+        self.reads = 0
+        self.decoded = 0
+
+    def grab(self):
+        self.reads += 1
+        time.sleep(0.002)
+        if self.fail_reads > 0:
+            self.fail_reads -= 1
+            return False
+        return True
+
+    def retrieve(self):
+        self.decoded += 1
+        return True, np.zeros((4, 4, 3), dtype=np.uint8)
+
+    def reconnect(self):
+        if self.fail_reconnects > 0:
+            self.fail_reconnects -= 1
+            raise RuntimeError("connection refused")
+        self.reconnects += 1
+
+    def position_ms(self):
+        return 0.0
+
+
+def _run(grabber, seconds):
+    grabber.start()
+    time.sleep(seconds)
+    grabber.stop()
+
+
+class TestFrameGrabber:
+    """Test suite for FrameGrabber"""
+
+    def test_reconnects_after_consecutive_failures(self):
+        camera = FakeCamera(fail_reads=5, fail_reconnects=1)
+        grabber = FrameGrabber(camera, low_latency=True, reconnect_after=5, max_backoff_s=0.05)
+        _run(grabber, 0.8)
+        assert camera.reconnects == 1
+        assert grabber.reconnect_count == 1
+        assert grabber.frame_count > 0
+        assert grabber.stats()["reconnects"] == 1
+
+    def test_low_latency_dispatch_skips_to_newest(self):
+        seen = []
+        release = threading.Event()
+
+        def slow_listener(grabbed):
+            seen.append(grabbed.seq)
+            release.wait(0.1)
+
+        grabber = FrameGrabber(FakeCamera(), [slow_listener], low_latency=True)
+        _run(grabber, 0.5)
+        # The read loop kept going while the listener was busy.
+        assert grabber.frame_count > 3 * len(seen)
+        assert grabber.stats()["skipped_dispatch"] > 0
+        assert seen == sorted(seen)
+
+    def test_frame_age_is_reported(self):
+        grabber = FrameGrabber(FakeCamera())
+        grabber.start()
+        assert grabber.wait_for_frame(timeout=1.0) is not None
+        time.sleep(0.05)
+        grabber.latest()
+        grabber.stop()
+        age = grabber.stats()["frame_age_ms"]
+        assert age["samples"] == 2
+        assert age["max"] >= age["p50"] >= 0.0
+
+    def test_decimation_decodes_only_what_listeners_need(self):
+        kept = []
+        camera = FakeCamera()
+        grabber = FrameGrabber(camera, decimate=True, min_decode_fps=0)
+        grabber.add_listener(kept.append, fps=10)
+        _run(grabber, 0.5)
+        assert camera.reads > 50
+        # ~10 fps of decodes over 0.5 s, every one delivered, timestamps spaced by the interval
+        assert 3 <= camera.decoded <= 7
+        assert len(kept) == camera.decoded == grabber.decoded_count
+        assert all(b.timestamp - a.timestamp >= 0.1 for a, b in zip(kept, kept[1:]))
+        assert grabber.stats()["decode_ratio"] < 0.2
+
+    def test_full_rate_listener_disables_decimation(self):
+        camera = FakeCamera()
+        grabber = FrameGrabber(camera, decimate=True)
+        grabber.add_listener(lambda grabbed: None)
+        _run(grabber, 0.2)
+        assert camera.decoded == camera.reads
@@ -0,0 +1,33 @@
+"""
+Unit tests for the pre-wake video ring (app/video/preroll.py)
+"""
+
+import numpy as np
+
+from app.video.grabber import GrabbedFrame
+from app.video.preroll import VideoPreRollRing
+
+
+def _grabbed(seq, timestamp):
+    frame = np.random.randint(0, 256, (720, 1280, 3), dtype=np.uint8)
+    return GrabbedFrame(frame=frame, seq=seq, timestamp=timestamp)
+
+
+def test_ring_is_bounded_and_stores_small_jpegs():
+    ring = VideoPreRollRing(seconds=3.0, fps=2.0, max_width=320)
+    for i in range(300):  # 10 s at 30 fps
+        ring.offer(_grabbed(i, i / 30.0))
+
+    frames = ring.snapshot()
+    assert len(frames) == ring.capacity == 6
+    assert all(f.jpeg for f in frames)
+    assert frames[0].frame.shape[1] == 320
+
+
+def test_snapshot_only_returns_recent_frames_before_cutoff():
+    ring = VideoPreRollRing(seconds=2.0, fps=2.0, max_width=320)
+    for i in range(20):
+        ring.offer(_grabbed(i, i * 0.5))
+
+    frames = ring.snapshot(before=9.0)
+    assert [f.timestamp for f in frames] == [8.0, 8.5]
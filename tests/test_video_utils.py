@@ -162,6 +162,15 @@ class TestFrameToJpegB64:
         # Check that the image is predominantly red (allow for JPEG compression)
         assert img[:, :, 2].mean() > 200  # R channel
 
+    def test_encoded_header_check_without_decode(self):
+        from app.video.validation import encoded_image_info, validate_encoded_image
+
+        jpg_bytes = base64.b64decode(frame_to_jpeg_b64(np.zeros((120, 200, 3), dtype=np.uint8)))
+        assert encoded_image_info(jpg_bytes) == ("JPEG", 200, 120)
+        assert validate_encoded_image(jpg_bytes)[0] is True
+        assert validate_encoded_image(jpg_bytes[: len(jpg_bytes) // 2])[0] is False
+        assert validate_encoded_image(b"not an image")[0] is False
+
 
 class TestSampleFrames:
     """Test suite for sample_frames() function"""
@@ -286,3 +295,120 @@ class TestProcessFramesForVision:
             assert img is not None
             # Width should be <= 960 after processing
             assert img.shape[1] <= 960
+
+
+class TestParallelProcessing:
+    """Test suite for the worker pool and deadline in process_frames_for_vision()"""
+
+    def test_workers_preserve_frame_order(self):
+        frames = [np.full((200, 200, 3), value, dtype=np.uint8) for value in (0, 60, 120, 180, 240)]
+        serial = process_frames_for_vision(frames, max_count=5, workers=1)
+        parallel = process_frames_for_vision(frames, max_count=5, workers=3)
+        assert parallel == serial
+
+    def test_expired_deadline_drops_frames(self):
+        import time
+
+        frames = [np.zeros((200, 200, 3), dtype=np.uint8) for _ in range(4)]
+        stats = {}
+        processed = process_frames_for_vision(
+            frames, max_count=4, workers=1, deadline=time.monotonic() - 1.0, stats=stats
+        )
+        assert processed == []
+        assert stats["dropped"] == 4
+
+
+class TestEncodedFrameCache:
+    """Test suite for the cross-turn encoded-frame cache"""
+
+    def test_repeat_frame_skips_encoding(self):
+        from app.video.frame_cache import EncodedFrameCache
+
+        cache = EncodedFrameCache(max_bytes=1024 * 1024)
+        frame = cv2.resize(np.random.default_rng(5).integers(0, 256, (12, 16, 3), dtype=np.uint8), (640, 480))
+        first_stats, second_stats = {}, {}
+        first = process_frames_for_vision([frame], max_count=1, cache=cache, stats=first_stats)
+        second = process_frames_for_vision([frame.copy()], max_count=1, cache=cache, stats=second_stats)
+        assert second == first
+        assert first_stats["cache_hits"] == 0
+        assert second_stats["cache_hits"] == 1
+
+    @staticmethod
+    def _label(text):
+        frame = np.full((480, 640, 3), 235, dtype=np.uint8)
+        cv2.putText(frame, text, (250, 250), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (20, 20, 20), 2)
+        return frame
+
+    def test_different_label_text_is_not_reused(self):
+        from app.video.frame_cache import EncodedFrameCache
+        from app.video.keyframes import hamming, perceptual_hash
+
+        old, new = self._label("PRICE 4.99"), self._label("PRICE 7.49")
+        # The hash alone cannot tell the labels apart
+        assert hamming(perceptual_hash(center_crop(old, 0.38)), perceptual_hash(center_crop(new, 0.38))) <= 4
+        cache = EncodedFrameCache(max_bytes=1024 * 1024)
+        stats = {}
+        first = process_frames_for_vision([old], max_count=1, cache=cache)
+        second = process_frames_for_vision([new], max_count=1, cache=cache, stats=stats)
+        assert second != first
+        assert stats["cache_hits"] == 0
+
+    def test_sensor_noise_still_hits(self):
+        from app.video.frame_cache import EncodedFrameCache
+
+        frame = self._label("PRICE 4.99")
+        noise = np.random.default_rng(3).integers(-4, 5, frame.shape)
+        noisy = np.clip(frame.astype(np.int16) + noise, 0, 255).astype(np.uint8)
+        cache = EncodedFrameCache(max_bytes=1024 * 1024)
+        stats = {}
+        first = process_frames_for_vision([frame], max_count=1, cache=cache)
+        second = process_frames_for_vision([noisy], max_count=1, cache=cache, stats=stats)
+        assert second == first
+        assert stats["cache_hits"] == 1
+
+    def test_eviction_by_bytes(self):
+        from app.video.frame_cache import EncodedFrameCache
+
+        cache = EncodedFrameCache(max_bytes=10)
+        cache.put(0x0F, "p", "aaaa", 3)
+        cache.put(0xF0, "p", "bbbb", 3)
+        assert cache.get(0x0F, "p") == ("aaaa", 3)
+        cache.put(0xFF00, "p", "cccc", 3)
+        assert cache.get(0xF0, "p") is None
+        assert cache.size_bytes == 8
+
+
+class TestKeyframeSelection:
+    """Test suite for keyframe selection in process_frames_for_vision()"""
+
+    @staticmethod
+    def _scene(seed):
+        rng = np.random.default_rng(seed)
+        frame = cv2.resize(rng.integers(0, 256, (12, 16, 3), dtype=np.uint8), (640, 480), interpolation=cv2.INTER_NEAREST)
+        return frame
+
+    def test_duplicates_collapse_to_one_frame_per_scene(self):
+        scene_a, scene_b = self._scene(1), self._scene(2)
+        frames = [scene_a.copy() for _ in range(4)] + [scene_b.copy() for _ in range(4)]
+        processed = process_frames_for_vision(frames, max_count=6, selector="keyframes")
+        assert len(processed) == 2
+
+    def test_prefers_sharp_frame_within_scene(self):
+        from app.video.keyframes import select_keyframes
+
+        sharp = self._scene(3)
+        blurry = cv2.GaussianBlur(sharp, (15, 15), 0)
+        indices = select_keyframes([blurry, sharp, blurry], max_count=1)
+        assert indices == [1]
+
+    def test_uniform_selector_unchanged(self):
+        frames = [np.zeros((1000, 1000, 3), dtype=np.uint8) for _ in range(10)]
+        assert len(process_frames_for_vision(frames, max_count=6, selector="uniform")) == 6
+
+    def test_select_frames_near_instants(self):
+        from app.video.keyframes import select_frames_near
+
+        timestamps = [0.0, 0.5, 1.0, 1.5, 2.0]
+        assert select_frames_near(timestamps, [1.1]) == [2]
+        assert select_frames_near(timestamps, [1.9, 0.4, 1.2], max_count=2) == [1, 2]
+        assert select_frames_near(timestamps, []) == []
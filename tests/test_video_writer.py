@@ -0,0 +1,214 @@
+"""
+Unit tests for the background segment encoder (app/video/writer.py)
+
+OpenCV's VideoWriter and the ffmpeg subprocess are replaced with fakes that
+record what they are given; the OpenCV fake can hold the encoder thread so
+the bounded queue fills up.
+"""
+
+import threading
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+import app.video.writer as writer_module
+from app.video.writer import AsyncVideoWriter
+
+
+class FakeCvWriter:
+    """Stand-in for cv2.VideoWriter; ``gate`` holds each write until set."""
+
+    instances = []
+
+    def __init__(self, path, fourcc, fps, frame_size):
+        self.path = path
+        self.fourcc = fourcc
+        self.frames = []
+        self.released = False
+        self.gate = threading.Event()
+        self.gate.set()
+        FakeCvWriter.instances.append(self)
+
+    def isOpened(self):
+        return True
+
+    def write(self, frame):
+        self.gate.wait(5.0)
+        if not isinstance(frame, np.ndarray):
+            raise TypeError("frame is not an image")
+        self.frames.append(frame)
+
+    def release(self):
+        self.released = True
+
+
+class FakeStdin:
+    def __init__(self):
+        self.chunks = []
+        self.closed = False
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+
+    def close(self):
+        self.closed = True
+
+
+class FakeProcess:
+    instances = []
+
+    def __init__(self, args, **kwargs):
+        self.args = args
+        self.stdin = FakeStdin()
+        FakeProcess.instances.append(self)
+
+    def wait(self, timeout=None):
+        return 0
+
+    def kill(self):
+        pass
+
+
+@pytest.fixture
+def opencv_backend(monkeypatch):
+    FakeCvWriter.instances = []
+    monkeypatch.setattr(writer_module.shutil, "which", lambda name: None)
+    monkeypatch.setattr(writer_module.cv2, "VideoWriter", FakeCvWriter)
+    return FakeCvWriter
+
+
+@pytest.fixture
+def ffmpeg_backend(monkeypatch):
+    FakeProcess.instances = []
+    monkeypatch.setattr(writer_module.shutil, "which", lambda name: "/usr/bin/ffmpeg")
+    monkeypatch.setattr(writer_module.subprocess, "Popen", FakeProcess)
+    return FakeProcess
+
+
+def _frame(value):
+    return np.full((24, 32, 3), value, dtype=np.uint8)
+
+
+def _hold_encoder(writer, backend):
+    """Block the encoder thread on one frame so later writes stay queued."""
+    fake = backend.instances[-1]
+    fake.gate.clear()
+    writer.write(_frame(0))
+    deadline = time.monotonic() + 2.0
+    while writer._queue.qsize() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return fake
+
+
+def _values(frames):
+    return [int(frame[0, 0, 0]) for frame in frames]
+
+
+class TestAsyncVideoWriter:
+    """Test suite for AsyncVideoWriter"""
+
+    def test_rejects_unknown_drop_policy(self, tmp_path, opencv_backend):
+        with pytest.raises(ValueError):
+            AsyncVideoWriter(tmp_path / "seg.mp4", 15.0, (32, 24), drop_policy="drop_all")
+
+    def test_close_flushes_queue_and_reports_stats(self, tmp_path, opencv_backend):
+        writer = AsyncVideoWriter(tmp_path / "seg.mp4", 15.0, (32, 24), queue_size=10)
+        assert writer.backend == "opencv"
+        for value in range(5):
+            assert writer.write(_frame(value))
+        stats = writer.close()
+
+        fake = opencv_backend.instances[-1]
+        assert _values(fake.frames) == [0, 1, 2, 3, 4]
+        assert fake.released
+        assert stats["enqueued"] == stats["written"] == 5
+        assert stats["dropped"] == stats["errors"] == 0
+        assert stats["encode_ms_avg"] >= 0.0
+        # Closing again is a no-op and writes after close are refused
+        assert writer.close() == stats
+        assert writer.write(_frame(9)) is False
+
+    def test_drop_oldest_keeps_newest_frames(self, tmp_path, opencv_backend):
+        writer = AsyncVideoWriter(tmp_path / "seg.mp4", 15.0, (32, 24), queue_size=2, drop_policy="drop_oldest")
+        fake = _hold_encoder(writer, opencv_backend)
+        accepted = [writer.write(_frame(value)) for value in (1, 2, 3, 4)]
+        assert accepted == [True, True, False, False]
+        assert writer.stats.max_queue_depth == 2
+        fake.gate.set()
+        stats = writer.close()
+
+        assert _values(fake.frames) == [0, 3, 4]
+        assert stats["dropped"] == 2
+        assert stats["written"] == 3
+
+    def test_drop_newest_keeps_queued_frames(self, tmp_path, opencv_backend):
+        writer = AsyncVideoWriter(tmp_path / "seg.mp4", 15.0, (32, 24), queue_size=2, drop_policy="drop_newest")
+        fake = _hold_encoder(writer, opencv_backend)
+        accepted = [writer.write(_frame(value)) for value in (1, 2, 3, 4)]
+        assert accepted == [True, True, False, False]
+        fake.gate.set()
+        stats = writer.close()
+
+        assert _values(fake.frames) == [0, 1, 2]
+        assert stats["dropped"] == 2
+
+    def test_block_waits_then_drops(self, tmp_path, opencv_backend):
+        writer = AsyncVideoWriter(tmp_path / "seg.mp4", 15.0, (32, 24), queue_size=1, drop_policy="block")
+        fake = _hold_encoder(writer, opencv_backend)
+        assert writer.write(_frame(1))
+        started = time.monotonic()
+        assert writer.write(_frame(2)) is False
+        assert time.monotonic() - started >= 0.09
+
+        # Space freed while blocked: the frame is accepted
+        threading.Timer(0.03, fake.gate.set).start()
+        assert writer.write(_frame(3))
+        stats = writer.close()
+        assert _values(fake.frames) == [0, 1, 3]
+        assert stats["dropped"] == 1
+
+    def test_mjpeg_passthrough_stores_jpeg_bytes_unchanged(self, tmp_path, ffmpeg_backend):
+        jpegs = [cv2.imencode(".jpg", _frame(value))[1].tobytes() for value in (10, 200)]
+        writer = AsyncVideoWriter(tmp_path / "seg.mp4", 15.0, (32, 24), mjpeg_passthrough=True)
+        assert writer.path.suffix == ".avi"
+        for data in jpegs:
+            assert writer.write_jpeg(data)
+        stats = writer.close()
+
+        process = ffmpeg_backend.instances[-1]
+        assert process.args[process.args.index("-c:v") + 1] == "copy"
+        assert process.stdin.chunks == jpegs
+        assert process.stdin.closed
+        assert stats["written"] == 2
+
+    def test_mjpeg_passthrough_without_ffmpeg_decodes_to_mjpg(self, tmp_path, opencv_backend):
+        data = cv2.imencode(".jpg", _frame(128))[1].tobytes()
+        writer = AsyncVideoWriter(tmp_path / "seg.mp4", 15.0, (32, 24), mjpeg_passthrough=True)
+        writer.write_jpeg(data)
+        writer.close()
+
+        fake = opencv_backend.instances[-1]
+        assert fake.fourcc == cv2.VideoWriter_fourcc(*"MJPG")
+        assert fake.frames[0].shape == (24, 32, 3)
+        assert abs(int(fake.frames[0][0, 0, 0]) - 128) <= 2
+
+    def test_encoder_errors_are_counted(self, tmp_path, opencv_backend):
+        writer = AsyncVideoWriter(tmp_path / "seg.mp4", 15.0, (32, 24))
+        writer.write_jpeg(b"not a jpeg")
+        writer.write(_frame(1))
+        stats = writer.close()
+        assert stats["errors"] == 1
+        assert stats["written"] == 1
+
+    def test_close_does_not_hang_behind_stalled_encoder(self, tmp_path, opencv_backend):
+        writer = AsyncVideoWriter(tmp_path / "seg.mp4", 15.0, (32, 24), queue_size=1, drop_policy="block")
+        fake = _hold_encoder(writer, opencv_backend)
+        assert writer.write(_frame(1))  # queue is now full
+
+        started = time.monotonic()
+        stats = writer.close(timeout=0.2)
+        assert time.monotonic() - started < 1.0
+        assert stats["dropped"] == 1
+        fake.gate.set()
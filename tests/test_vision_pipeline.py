@@ -0,0 +1,90 @@
+"""
+Unit tests for the in-memory VisionPipeline (app/video/pipeline.py)
+"""
+
+import base64
+
+import cv2
+import numpy as np
+
+from app.video.pipeline import VisionPipeline
+
+
+def _frame(width=1600, height=1200):
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    cv2.rectangle(frame, (100, 100), (width - 100, height - 100), (0, 128, 255), -1)
+    return frame
+
+
+class TestProcessImage:
+    """Test suite for VisionPipeline.process_image()"""
+
+    def setup_method(self):
+        self.pipeline = VisionPipeline()
+
+    def test_ndarray_is_encoded_without_decode(self):
+        result = self.pipeline.process_image(_frame())
+        assert result["success"] is True
+        timings = result["meta"]["timings_ms"]
+        assert "decode" not in timings
+        assert {"resize", "encode", "base64", "total"} <= set(timings)
+        assert max(result["meta"]["width"], result["meta"]["height"]) <= 1024
+        jpg = base64.b64decode(result["base64_image"])
+        assert jpg[:2] == b"\xff\xd8"
+
+    def test_png_bytes_decoded_once(self):
+        ok, png = cv2.imencode(".png", _frame(800, 600))
+        assert ok
+        result = self.pipeline.process_image(png.tobytes())
+        assert result["success"] is True
+        assert "decode" in result["meta"]["timings_ms"]
+        assert (result["meta"]["width"], result["meta"]["height"]) == (800, 600)
+        assert result["meta"]["mime_type"] == "image/jpeg"
+
+    def test_path_input(self, tmp_path):
+        path = tmp_path / "sample.jpg"
+        cv2.imwrite(str(path), _frame(640, 480))
+        result = self.pipeline.process_image(str(path))
+        assert result["success"] is True
+        assert result["meta"]["image_path"] == str(path)
+        assert "read" in result["meta"]["timings_ms"]
+
+    def test_invalid_inputs(self):
+        assert self.pipeline.process_image(b"not an image")["success"] is False
+        assert self.pipeline.process_image("/nonexistent/image.jpg")["success"] is False
+
+
+class TestProcessImages:
+    """Test suite for VisionPipeline.process_images()"""
+
+    def test_results_in_input_order_with_throughput(self, tmp_path):
+        paths = []
+        for index in range(6):
+            path = tmp_path / f"img{index}.jpg"
+            cv2.imwrite(str(path), _frame(320 + 16 * index, 240))
+            paths.append(str(path))
+        paths.insert(3, str(tmp_path / "missing.jpg"))
+
+        pipeline = VisionPipeline()
+        results = list(pipeline.process_images(iter(paths), workers=3, max_pending=2))
+
+        assert [r.get("meta", {}).get("image_path") for r in results if r["success"]] == [
+            p for p in paths if "missing" not in p
+        ]
+        assert results[3]["success"] is False
+        assert pipeline.batch_stats["images"] == 7
+        assert pipeline.batch_stats["failed"] == 1
+        assert pipeline.batch_stats["images_per_s"] > 0
+
+    def test_is_lazy(self):
+        consumed = []
+
+        def frames():
+            for index in range(100):
+                consumed.append(index)
+                yield _frame(64, 48)
+
+        first = next(VisionPipeline().process_images(frames(), workers=2))
+        assert first["success"] is True
+        # Only the bounded window has been pulled from the source.
+        assert len(consumed) <= 4
@@ -23,3 +23,22 @@ def test_tokens_match_handles_minor_phonetic_difference():
 
 def test_tokens_match_rejects_different_phrase():
     assert not WakeWordListener._tokens_match(["hey", "google"], ["hey", "glasses"])
+
+
+class FakeWakeRecognizer:
+    """Stand-in for WakeGrammarRecognizer counting resets."""
+
+    def __init__(self):
+        self.resets = 0
+        self.combined_text = ""
+
+    def reset(self):
+        self.resets += 1
+
+
+def test_listener_uses_given_wake_recognizer():
+    recognizer = FakeWakeRecognizer()
+    listener = WakeWordListener(wake_variants=["hey glasses"], on_detect=lambda buffer: None, transcriber=recognizer)
+    assert listener._transcriber is recognizer
+    listener.reset_stream_state()
+    assert recognizer.resets == 1
@@ -0,0 +1,213 @@
+"""
+Unit tests for out-of-process wake detection (app/audio/wake_process.py)
+
+The Vosk worker is replaced with small scripted worker functions run in a
+forked child (so no model is loaded), and the microphone with a fake stream
+that yields constant frames. This covers the detection handoff through the
+shared ring, worker errors, and a worker that dies while listening.
+"""
+
+import multiprocessing
+import threading
+import time
+
+import numpy as np
+import pytest
+
+import app.audio.wake_process as wake_process
+from app.audio.shm_ring import SharedFrameRing
+from app.audio.wake_process import ProcessWakeWordListener, WakeProcessHost
+
+CHUNK_SAMPLES = 320
+PRE_ROLL_GAINS = [2.0, 1.0, 3.0]
+
+
+def _frame(value):
+    return np.full(CHUNK_SAMPLES, value, dtype=np.int16).tobytes()
+
+
+def _values(frames):
+    return [int(np.frombuffer(frame, dtype=np.int16)[0]) for frame in frames]
+
+
+def _detecting_worker(ring_name, frame_bytes, capacity, settings, armed, shutdown, events):
+    """Report a detection once five frames have been written while armed."""
+    ring = SharedFrameRing(frame_bytes, capacity, name=ring_name)
+    events.put(("ready", {}))
+    try:
+        while not shutdown.is_set():
+            if not armed.wait(timeout=0.05) or ring.write_seq < 5:
+                time.sleep(0.005)
+                continue
+            armed.clear()
+            events.put(
+                (
+                    "detected",
+                    {
+                        "seq": ring.write_seq - 1,
+                        "pre_roll_frames": len(PRE_ROLL_GAINS),
+                        "gains": PRE_ROLL_GAINS,
+                        "gain": 4.0,
+                        "dropped_frames": 0,
+                    },
+                )
+            )
+    finally:
+        ring.close()
+
+
+def _failing_worker(ring_name, frame_bytes, capacity, settings, armed, shutdown, events):
+    events.put(("error", {"error": "model not found"}))
+
+
+def _exiting_worker(ring_name, frame_bytes, capacity, settings, armed, shutdown, events):
+    """Become ready, then die without reporting anything."""
+    events.put(("ready", {}))
+
+
+class FakeMicrophone:
+    """Stand-in for MicrophoneStream yielding frames whose samples are 100."""
+
+    def __init__(self, rate, chunk_samples, input_device_name=None):
+        self.chunk_samples = chunk_samples
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def read(self, chunk_samples):
+        time.sleep(0.002)
+        return _frame(100)
+
+    def stop(self):
+        pass
+
+
+class FallbackListener:
+    """Stand-in for the in-process WakeWordListener built on fallback."""
+
+    def __init__(self):
+        self.ran = threading.Event()
+
+    def run(self):
+        self.ran.set()
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def host_with(monkeypatch):
+    """Build a WakeProcessHost whose worker is one of the scripted functions."""
+    real_get_context = multiprocessing.get_context
+    monkeypatch.setattr(wake_process.multiprocessing, "get_context", lambda method=None: real_get_context("fork"))
+    monkeypatch.setattr(wake_process, "MicrophoneStream", FakeMicrophone)
+    hosts = []
+
+    def build(worker):
+        monkeypatch.setattr(wake_process, "_wake_worker_main", worker)
+        host = WakeProcessHost(model_path="model", wake_variants=["hey glasses"], chunk_samples=CHUNK_SAMPLES)
+        hosts.append(host)
+        return host
+
+    yield build
+    for host in hosts:
+        host.shutdown()
+
+
+class TestWakeProcessHost:
+    """Test suite for WakeProcessHost"""
+
+    def test_detection_is_reported_through_poll(self, host_with):
+        host = host_with(_detecting_worker)
+        host.start(timeout=5.0)
+        assert host.is_alive()
+        host.arm()
+        for _ in range(5):
+            host.ring.write(_frame(1))
+
+        detection = None
+        deadline = time.monotonic() + 5.0
+        while detection is None and time.monotonic() < deadline:
+            detection = host.poll()
+            time.sleep(0.01)
+        assert detection["seq"] == 4
+        assert detection["gains"] == PRE_ROLL_GAINS
+        # Starting again while the worker is alive is a no-op
+        pid = host._process.pid
+        host.start()
+        assert host._process.pid == pid
+
+    def test_worker_error_fails_start(self, host_with):
+        host = host_with(_failing_worker)
+        with pytest.raises(RuntimeError, match="model not found"):
+            host.start(timeout=5.0)
+        assert not host.is_alive()
+
+
+class TestProcessWakeWordListener:
+    """Test suite for ProcessWakeWordListener"""
+
+    def test_detection_hands_over_gained_pre_roll(self, host_with):
+        host = host_with(_detecting_worker)
+        handed_over = []
+        listener = ProcessWakeWordListener(host, on_detect=handed_over.append)
+        listener.start()
+        listener.join(timeout=5.0)
+
+        assert not listener.is_alive()
+        pre_roll = handed_over[0]
+        # Each pre-roll frame carries the gain the worker applied to it;
+        # frames captured after the detection take the current gain.
+        values = _values(pre_roll)
+        assert values[:3] == [200, 100, 300]
+        assert set(values[3:]) <= {400}
+        assert not host._armed.is_set()
+
+    def test_dead_worker_is_restarted_then_falls_back(self, host_with):
+        host = host_with(_exiting_worker)
+        starts = []
+        real_start = host.start
+        host.start = lambda timeout=30.0: (starts.append(1), real_start(timeout))
+        fallback = FallbackListener()
+        listener = ProcessWakeWordListener(
+            host, on_detect=lambda frames: None, fallback=lambda: fallback, max_restarts=2
+        )
+        listener.LIVENESS_INTERVAL_S = 0.05
+        listener.start()
+        listener.join(timeout=10.0)
+
+        assert not listener.is_alive()
+        assert len(starts) == 3  # initial start plus two restarts
+        assert fallback.ran.is_set()
+
+    def test_worker_error_without_fallback_stops_listening(self, host_with):
+        host = host_with(_failing_worker)
+        listener = ProcessWakeWordListener(host, on_detect=lambda frames: None)
+        listener.start()
+        listener.join(timeout=5.0)
+        assert not listener.is_alive()
+        assert not host.is_alive()
+
+
+class TestCollectPreRoll:
+    """Test suite for slicing the gained pre-roll out of the ring"""
+
+    def test_gains_follow_sequence_numbers(self):
+        with SharedFrameRing(CHUNK_SAMPLES * 2, 8) as ring:
+            for _ in range(6):
+                ring.write(_frame(10))
+            detection = {"seq": 4, "pre_roll_frames": 3, "gains": [1.0, 2.0, 1.5], "gain": 5.0}
+            frames = ProcessWakeWordListener._collect_pre_roll(ring, detection)
+        assert _values(frames) == [10, 20, 15, 50]
+
+    def test_overwritten_frames_keep_their_own_gain(self):
+        with SharedFrameRing(CHUNK_SAMPLES * 2, 4) as ring:
+            for _ in range(9):
+                ring.write(_frame(10))
+            # Pre-roll started at seq 2, but the ring only holds seqs 5..8
+            detection = {"seq": 6, "pre_roll_frames": 5, "gains": [1.0, 1.0, 1.0, 2.0, 3.0], "gain": 1.0}
+            frames = ProcessWakeWordListener._collect_pre_roll(ring, detection)
+        assert _values(frames) == [20, 30, 10, 10]
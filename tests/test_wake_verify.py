@@ -0,0 +1,112 @@
+"""
+Unit tests for second-stage wake verification (app/audio/wake_verify.py)
+
+The Vosk recognizer is replaced with a scripted fake that returns fixed
+results (and can be made slow) so accept, reject and budget overrun are
+deterministic.
+"""
+
+import json
+import time
+
+import pytest
+
+import app.audio.wake_verify as wake_verify
+from app.audio.wake_verify import WakeVerifier
+
+SAMPLE_RATE = 16000
+
+
+class ScriptedRecognizer:
+    """Stand-in for KaldiRecognizer returning ``final_text`` from FinalResult()."""
+
+    final_text = ""
+    chunk_delay_s = 0.0
+
+    def __init__(self, model, sample_rate):
+        self.accepted = 0
+        self.resets = 0
+
+    def Reset(self):
+        self.resets += 1
+        self.accepted = 0
+
+    def AcceptWaveform(self, data):
+        self.accepted += 1
+        time.sleep(self.chunk_delay_s)
+        return False
+
+    def Result(self):
+        return json.dumps({"text": ""})
+
+    def FinalResult(self):
+        return json.dumps({"text": self.final_text})
+
+
+@pytest.fixture
+def verifier_for(monkeypatch):
+    def build(final_text, chunk_delay_s=0.0, budget_ms=250):
+        monkeypatch.setattr(ScriptedRecognizer, "final_text", final_text)
+        monkeypatch.setattr(ScriptedRecognizer, "chunk_delay_s", chunk_delay_s)
+        monkeypatch.setattr(wake_verify, "KaldiRecognizer", ScriptedRecognizer)
+        return WakeVerifier(
+            model=object(),
+            sample_rate=SAMPLE_RATE,
+            phrases=["hey glasses", "hey-glasses"],
+            budget_ms=budget_ms,
+        )
+
+    return build
+
+
+def _audio(ms):
+    """Silent 16-bit PCM split into 20 ms frames."""
+    frame = b"\x00\x00" * (SAMPLE_RATE // 50)
+    return [frame] * (ms // 20)
+
+
+class TestWakeVerifier:
+    """Test suite for WakeVerifier"""
+
+    def test_accepts_wake_phrase(self, verifier_for):
+        verifier = verifier_for("hey glasses")
+        assert verifier.verify(_audio(1000)) is True
+        assert verifier.stats.triggers == verifier.stats.confirmed == 1
+        assert verifier.stats.rejected == verifier.stats.budget_exceeded == 0
+
+    def test_rejects_other_speech(self, verifier_for):
+        verifier = verifier_for("what time is it")
+        assert verifier.verify(_audio(1000)) is False
+        assert verifier.stats.rejected == 1
+        assert verifier.stats.false_trigger_rate == 1.0
+
+    def test_rejects_silence(self, verifier_for):
+        verifier = verifier_for("")
+        assert verifier.verify(_audio(1000)) is False
+        assert verifier.stats.rejected == 1
+
+    def test_overrun_accepts_and_counts(self, verifier_for):
+        # Each 200 ms chunk takes 30 ms to decode against a 50 ms budget
+        verifier = verifier_for("what time is it", chunk_delay_s=0.03, budget_ms=50)
+        assert verifier.verify(_audio(1000)) is True
+        assert verifier._recognizer.accepted < 5  # stopped decoding early
+        stats = verifier.stats.as_dict()
+        assert stats["budget_exceeded"] == 1
+        assert stats["confirmed"] == 1
+        assert stats["max_ms"] >= 50
+
+    def test_decodes_only_trailing_window(self, verifier_for):
+        verifier = verifier_for("hey glasses")
+        verifier.verify(_audio(5000))
+        # 1500 ms window in 200 ms chunks
+        assert verifier._recognizer.accepted == 8
+        assert verifier._recognizer.resets == 1
+
+    def test_stats_accumulate_across_triggers(self, verifier_for):
+        verifier = verifier_for("hey glasses")
+        verifier.verify(_audio(600))
+        ScriptedRecognizer.final_text = "hello there"
+        verifier.verify(_audio(600))
+        stats = verifier.stats.as_dict()
+        assert (stats["triggers"], stats["confirmed"], stats["rejected"]) == (2, 1, 1)
+        assert stats["false_trigger_rate"] == 0.5